@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Microbenchmark of LaTeXFormatter against the previous regex implementation.
+
+Times clean_integral_setup and _format_exact_solution on every integral
+setup and exact solution found in the intermediate JSON files, and lists
+the strings whose rendering changed.
+
+Usage:
+    python benchmarks/bench_latex_formatter.py [--repeat 200] [files ...]
+"""
+import argparse
+import glob
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from utils.file_handler import FileHandler
+from generators.latex_formatter import LaTeXFormatter
+from legacy_latex_formatter import LaTeXFormatter as LegacyLaTeXFormatter
+
+# Nested expressions the regex implementation could not handle
+EXTRA_EXACT = [
+    'sqrt(x + sqrt(y + 1))/2',
+    'exp(sin(x)*cos(y))',
+    '(x + 1)**2/(2*y)',
+    '-pi/4 + 3*pi**2/8',
+    '40*sqrt(5)/3'
+]
+
+# Inputs both implementations got wrong, with the expected rendering
+REGRESSION_CASES = {
+    'x/2/3': '\\dfrac{x}{2 \\cdot 3}',
+    'a/(x + 1)/2': '\\dfrac{a}{(x + 1) \\cdot 2}',
+    'theta*r': '\\theta r',
+    'pi*x': '\\pi x',
+    '(x + 1)*(y + 2)': '(x + 1)(y + 2)',
+    '2*(x + 1)': '2(x + 1)',
+    'sqrt(2)*pi/4': '\\dfrac{\\sqrt{2}\\pi}{4}',
+    '2*3': '2 \\cdot 3'
+}
+
+def collect_strings(paths):
+    setups, exacts = [], []
+    for path in paths:
+        for exercise in FileHandler.load_json(path).get('exercises', []):
+            setup = (exercise.get('latex') or {}).get('integral_setup')
+            exact = (exercise.get('solution') or {}).get('exact')
+            if setup:
+                setups.append(setup)
+            if exact:
+                exacts.append(exact)
+    return setups, exacts + EXTRA_EXACT + list(REGRESSION_CASES)
+
+def time_formatter(formatter, setups, exacts, repeat: int) -> float:
+    """Best-of-5 time per call in microseconds"""
+    calls = repeat * (len(setups) + len(exacts))
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in setups:
+                formatter.clean_integral_setup(text)
+            for text in exacts:
+                formatter._format_exact_solution(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='LaTeXFormatter: tokenizer vs regex pipeline')
+    parser.add_argument('files', nargs='*', help='Intermediate JSON files (default: data/temp/*.json)')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(str(ROOT / 'data' / 'temp' / '*.json')))
+    setups, exacts = collect_strings(paths)
+    if not setups and not exacts:
+        print("No formatted strings found; run the solver first to create intermediate JSON files")
+        sys.exit(1)
+
+    current, legacy = LaTeXFormatter(), LegacyLaTeXFormatter()
+    legacy_us = time_formatter(legacy, setups, exacts, args.repeat)
+    current_us = time_formatter(current, setups, exacts, args.repeat)
+
+    print(f"{len(setups)} integral setups, {len(exacts)} exact solutions, {args.repeat} repetitions")
+    print(f"  regex pipeline:  {legacy_us:8.1f} us/call")
+    print(f"  tokenizer:       {current_us:8.1f} us/call  ({legacy_us / current_us:.1f}x)")
+
+    changed = []
+    for text in dict.fromkeys(setups):
+        old, new = legacy.clean_integral_setup(text), current.clean_integral_setup(text)
+        if old != new:
+            changed.append((text, old, new))
+    for text in dict.fromkeys(exacts):
+        old, new = legacy._format_exact_solution(text), current._format_exact_solution(text)
+        if old != new:
+            changed.append((text, old, new))
+
+    if changed:
+        print(f"\n{len(changed)} strings render differently:")
+        for text, old, new in changed:
+            print(f"  {text}\n    regex:     {old}\n    tokenizer: {new}")
+
+    failures = [(text, expected, current._format_exact_solution(text))
+                for text, expected in REGRESSION_CASES.items()
+                if current._format_exact_solution(text) != expected]
+    for text, expected, got in failures:
+        print(f"\nRegression: {text}\n    expected:  {expected}\n    tokenizer: {got}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Memory and serialization cost of an exercise bank in three representations.
+
+    dicts    the processed JSON entries as plain dicts
+    legacy   the dict-backed dataclasses (benchmarks/legacy_exercise_model.py)
+    slotted  the current models in src/models/exercise.py
+
+Each bank is built from synthetic exercises (benchmarks/synthetic_assignments.py)
+with solution, LaTeX and computation details filled in, as in an intermediate
+JSON. Memory is the tracemalloc delta of building the bank, per exercise
+(model banks are built from the parsed dicts and share their strings);
+to_dict/from_dict are timed over the whole bank.
+
+Usage:
+    python benchmarks/bench_model_memory.py [--size 100000]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import legacy_exercise_model
+from models import exercise as slotted_model
+from synthetic_assignments import generate_exercises
+
+def processed_entries(size: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthetic exercises with the fields process_assignment adds"""
+    entries = generate_exercises(size, seed)
+    for index, entry in enumerate(entries):
+        entry['coordinate_system'] = 'cartesian'
+        entry['solution'] = {
+            'exact': f'{index % 97}/3', 'decimal': (index % 97) / 3,
+            'quantity_type': 'area', 'units': 'u^{2}'
+        }
+        entry['latex'] = {
+            'integral_setup': f'\\int_{{0}}^{{1}} {entry["function"]} \\, dx',
+            'solution_steps': None,
+            'final_result': f'\\dfrac{{{index % 97}}}{{3}}'
+        }
+        entry['computation_details'] = {
+            'intermediate_steps': None, 'substitutions': None,
+            'integration_method': 'symbolic', 'timings': {'solve': 1.5, 'latex': 0.2}
+        }
+    return entries
+
+def measure_bytes(build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Bytes allocated (and kept) by build()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    bank = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'bank': bank, 'bytes': after - before}
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory footprint of the exercise models')
+    parser.add_argument('--size', type=int, default=100000, help='Exercises in the bank (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions of the timings (best is kept)')
+    args = parser.parse_args()
+
+    # Serialize once so every representation starts from freshly parsed JSON
+    payload = json.dumps(processed_entries(args.size, args.seed))
+
+    rows = []
+    dicts = measure_bytes(lambda: json.loads(payload))
+    rows.append(('dicts', dicts['bytes'], None, None))
+    entries = dicts['bank']
+
+    for name, model in (('legacy', legacy_exercise_model), ('slotted', slotted_model)):
+        # The legacy from_dict only loads the input fields; fill the rest the way the solver does
+        def build(model=model):
+            bank = []
+            for entry in entries:
+                exercise = model.Exercise.from_dict(entry)
+                if exercise.latex is None:
+                    exercise.latex = model.LaTeXContent(**entry['latex'])
+                    exercise.computation_details = model.ComputationDetails(**entry['computation_details'])
+                bank.append(exercise)
+            return bank
+
+        built = measure_bytes(build)
+        bank = built['bank']
+        to_dict_s = best_time(lambda: [exercise.to_dict() for exercise in bank], args.repeat)
+        from_dict_s = best_time(build, args.repeat)
+        rows.append((name, built['bytes'], to_dict_s, from_dict_s))
+        del bank, built
+
+    print(f"Python {sys.version.split()[0]}, {args.size} exercises")
+    print(f"{'model':<10} {'bytes/exercise':>15} {'bank MiB':>10} {'to_dict ms':>11} {'from_dict ms':>13}")
+    for name, size_bytes, to_dict_s, from_dict_s in rows:
+        to_dict = f"{to_dict_s * 1000:>11.1f}" if to_dict_s is not None else f"{'-':>11}"
+        from_dict = f"{from_dict_s * 1000:>13.1f}" if from_dict_s is not None else f"{'-':>13}"
+        print(f"{name:<10} {size_bytes / args.size:>15.0f} {size_bytes / 2**20:>10.1f} {to_dict} {from_dict}")
+
+if __name__ == '__main__':
+    main()
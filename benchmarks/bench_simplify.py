@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare simplification policies on the bundled assignments.
+
+Usage:
+    python benchmarks/bench_simplify.py [--repeat 3] [files ...]
+"""
+import argparse
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from utils.file_handler import FileHandler
+from models.exercise import Exercise
+from solvers.integral_solver import IntegralSolver
+from solvers.simplification import SimplificationPolicy
+from sympy.core.cache import clear_cache
+
+def load_unique_assignments(paths):
+    """Load input files, skipping duplicates with identical content"""
+    seen = set()
+    assignments = []
+    for path in paths:
+        data = FileHandler.load_json(path)
+        content = json.dumps(data, sort_keys=True)
+        if content in seen:
+            continue
+        seen.add(content)
+        assignments.append((Path(path).name, data))
+    return assignments
+
+def time_policy(policy: str, exercises, repeat: int):
+    """Best-of-N total solve time and the exact results for one policy"""
+    solver = IntegralSolver(simplify_policy=policy)
+    best = None
+    results = []
+    for _ in range(repeat):
+        results = []
+        # SymPy's global cache would otherwise favour whichever policy runs later
+        clear_cache()
+        start = time.perf_counter()
+        for exercise in exercises:
+            results.append(solver.solve_symbolic(exercise)[0])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark simplification policies')
+    parser.add_argument('files', nargs='*', help='Input JSON files (default: data/input/*.json)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per policy (best time is kept)')
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(str(ROOT / 'data' / 'input' / '*.json')))
+    assignments = load_unique_assignments(paths)
+
+    # Warm up SymPy so the first policy does not pay import costs
+    IntegralSolver().solve_symbolic(Exercise.from_dict(assignments[0][1]['exercises'][0]))
+
+    policies = SimplificationPolicy.POLICIES
+    print(f"{'assignment':<40}" + ''.join(f"{p:>12}" for p in policies) + f"{'same result':>14}")
+
+    totals = {p: 0.0 for p in policies}
+    for name, data in assignments:
+        exercises = [Exercise.from_dict(e) for e in data['exercises']]
+        timings = {}
+        outputs = {}
+        for policy in policies:
+            timings[policy], outputs[policy] = time_policy(policy, exercises, args.repeat)
+            totals[policy] += timings[policy]
+
+        same = all(outputs[p] == outputs['full'] for p in policies)
+        print(f"{name:<40}" + ''.join(f"{timings[p]:>11.3f}s" for p in policies) + f"{str(same):>14}")
+
+    print(f"{'total':<40}" + ''.join(f"{totals[p]:>11.3f}s" for p in policies))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Compare peak memory of the in-memory and streaming pipelines on a generated exercise bank.
+
+Each run is a separate `src/main.py` process working in a scratch directory;
+peak RSS comes from the child's rusage. Exercises are solved with
+--numeric-only so the benchmark measures the pipeline, not SymPy.
+
+Usage:
+    python benchmarks/bench_streaming.py [--sizes 1000 5000 20000]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / 'src' / 'main.py'
+
+FUNCTIONS = ['x**2 + 3*y**2', '6 - 2*x - 3*y', 'x*y', 'exp(x + y)', 'sin(x)*cos(y)', 'x**2*y + y**3']
+
+def generate_bank(path: Path, size: int, seed: int = 0) -> None:
+    """Write an assignment with `size` double integrals over rectangles"""
+    rng = random.Random(seed)
+    metadata = {
+        'course': {'name': 'Calculo 3', 'subject_area': 'calculo', 'level': 3},
+        'assignment': {'type': 'BANCO', 'number': size, 'year': 2025, 'month': 1, 'iteration': 1},
+        'output_settings': {
+            'units': 'u', 'decimal_precision': 4, 'show_steps': False,
+            'equation_format': {'show_quantity_label': True, 'show_equation': True}
+        }
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"metadata": ' + json.dumps(metadata) + ', "exercises": [\n')
+        for i in range(size):
+            exercise = {
+                'id': str(i + 1), 'id_letter': None, 'id_part': None, 'type': 'integral',
+                'function': rng.choice(FUNCTIONS),
+                'integrals': [
+                    {'var': 'y', 'limits': {'lower': '0', 'upper': str(rng.randint(1, 5))}, 'order': 1},
+                    {'var': 'x', 'limits': {'lower': '0', 'upper': str(rng.randint(1, 5))}, 'order': 2}
+                ]
+            }
+            f.write(('' if i == 0 else ',\n') + json.dumps(exercise))
+        f.write('\n]}')
+
+def run(input_path: Path, workdir: Path, stream: bool):
+    """Run the CLI once and return (seconds, peak RSS in MB)"""
+    command = [sys.executable, str(MAIN), '--input', str(input_path), '--numeric-only', '--no-cache']
+    if stream:
+        command.append('--stream')
+    start = time.time()
+    process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.time() - start
+    if status != 0:
+        raise RuntimeError(f"{' '.join(command)} failed with status {status}")
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, usage.ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak memory of in-memory vs streaming processing')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'exercises':>10} {'full MB':>9} {'stream MB':>10} {'full s':>8} {'stream s':>9}")
+    with tempfile.TemporaryDirectory() as scratch:
+        workdir = Path(scratch)
+        for size in args.sizes:
+            input_path = workdir / f'bank_{size}.json'
+            generate_bank(input_path, size)
+            full_time, full_rss = run(input_path, workdir, stream=False)
+            stream_time, stream_rss = run(input_path, workdir, stream=True)
+            print(f"{size:>10} {full_rss:>9.1f} {stream_rss:>10.1f} {full_time:>8.1f} {stream_time:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Benchmark suite with stored baselines and a latency regression gate.
+
+For each size, a synthetic assignment (benchmarks/synthetic_assignments.py)
+is measured three ways:
+
+    solve_integral      per-exercise latency by coordinate shape (median, p90)
+    process_assignment  end-to-end run of the CLI pipeline, exercises/s
+    generate_latex      LaTeX document generation from the intermediate JSON
+
+Every run uses a fresh solver with the solution cache disabled, in a
+scratch directory; the best of --repeat runs is kept. The results are
+compared with the stored baseline and the script exits with status 1 when
+a latency metric is more than --threshold slower.
+
+Usage:
+    python benchmarks/bench_suite.py --save-baseline       # record benchmarks/baseline.json
+    python benchmarks/bench_suite.py [--threshold 0.25]    # compare and gate
+    python benchmarks/bench_suite.py --sizes 24 96 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import sympy as sp
+from sympy.core.cache import clear_cache
+
+from main import MathSolverOrchestrator
+from models.exercise import Exercise
+from solvers.antiderivative_memo import AntiderivativeMemo
+from solvers.integral_solver import IntegralSolver
+from generators.latex_generator import LaTeXGenerator
+from utils.file_handler import FileHandler
+from synthetic_assignments import generate_assignment
+
+DEFAULT_BASELINE = ROOT / 'benchmarks' / 'baseline.json'
+
+# Sub-millisecond differences are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 1.0
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def bench_solve_integral(assignment: Dict, repeat: int) -> Dict[str, float]:
+    """Median and p90 solve latency per shape, best of `repeat` cold solvers per exercise"""
+    exercises = [Exercise.from_dict(data) for data in assignment['exercises']]
+
+    # Untimed pass, so SymPy code paths loaded on first use are not charged to a shape
+    warm_solver = IntegralSolver(memo=AntiderivativeMemo())
+    for exercise in exercises:
+        warm_solver.solve_integral(exercise)
+
+    best = [float('inf')] * len(exercises)
+    for _ in range(repeat):
+        # Start every repetition without SymPy's or the solver's memoized results
+        clear_cache()
+        solver = IntegralSolver(memo=AntiderivativeMemo())
+        for index, exercise in enumerate(exercises):
+            start = time.perf_counter()
+            solver.solve_integral(exercise)
+            best[index] = min(best[index], (time.perf_counter() - start) * 1000)
+
+    by_shape: Dict[str, List[float]] = {}
+    for exercise, elapsed in zip(exercises, best):
+        shape = solver.detect_coordinate_system([integral.var for integral in exercise.integrals])
+        by_shape.setdefault(shape, []).append(elapsed)
+    by_shape['all'] = best
+
+    metrics = {}
+    for shape, values in sorted(by_shape.items()):
+        metrics[f'solve_integral.{shape}.median_ms'] = statistics.median(values)
+        metrics[f'solve_integral.{shape}.p90_ms'] = percentile(values, 0.9)
+    return metrics
+
+def bench_process_assignment(assignment: Dict, repeat: int, workdir: Path) -> Dict[str, float]:
+    """End-to-end process_assignment time; leaves the intermediate JSON in workdir/data/temp"""
+    input_path = workdir / 'synthetic.json'
+    FileHandler.save_json(assignment, str(input_path))
+    best = float('inf')
+    for _ in range(repeat):
+        clear_cache()
+        shutil.rmtree(workdir / 'data', ignore_errors=True)
+        orchestrator = MathSolverOrchestrator(use_cache=False, incremental=False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrator.process_assignment(str(input_path))
+        best = min(best, time.perf_counter() - start)
+        orchestrator.close()
+
+    count = len(assignment['exercises'])
+    return {
+        'process_assignment.total_ms': best * 1000,
+        'process_assignment.per_exercise_ms': best * 1000 / count,
+        'process_assignment.exercises_per_s': count / best
+    }
+
+def bench_generate_latex(workdir: Path, repeat: int) -> Dict[str, float]:
+    """generate_latex on the intermediate JSON of the last process_assignment run"""
+    intermediate_path = next((workdir / 'data' / 'temp').glob('*.json'))
+    data = FileHandler.load_json(str(intermediate_path))
+    tex_path = workdir / 'bench.tex'
+    best = float('inf')
+    for _ in range(repeat):
+        # A new generator has an empty fragment cache; a missing file is always written
+        generator = LaTeXGenerator()
+        if tex_path.exists():
+            tex_path.unlink()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_latex(data, str(tex_path))
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'generate_latex.total_ms': best * 1000,
+        'generate_latex.per_exercise_ms': best * 1000 / len(data['exercises'])
+    }
+
+def run_suite(sizes: List[int], repeat: int, seed: int) -> Dict[str, float]:
+    metrics = {}
+    original_cwd = os.getcwd()
+    for size in sizes:
+        assignment = generate_assignment(size, seed)
+        with tempfile.TemporaryDirectory(prefix='math-solver-bench-') as scratch:
+            workdir = Path(scratch)
+            # The orchestrator writes to data/ relative to the working directory
+            os.chdir(workdir)
+            try:
+                results = bench_solve_integral(assignment, repeat)
+                results.update(bench_process_assignment(assignment, repeat, workdir))
+                results.update(bench_generate_latex(workdir, repeat))
+            finally:
+                os.chdir(original_cwd)
+        metrics.update({f'n{size}.{name}': value for name, value in results.items()})
+    return metrics
+
+def environment() -> Dict[str, str]:
+    """Facts that make timings comparable; a mismatch with the baseline is reported"""
+    return {
+        'python': platform.python_version(),
+        'sympy': sp.__version__,
+        'machine': platform.machine(),
+        'cpu_count': str(os.cpu_count()),
+        'pdflatex': 'yes' if shutil.which('pdflatex') else 'no'
+    }
+
+def is_latency(name: str) -> bool:
+    return name.endswith('_ms')
+
+def compare(metrics: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Print current vs baseline values and return the regressed latency metrics"""
+    regressions = []
+    print(f"{'metric':<52} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name in sorted(metrics):
+        current = metrics[name]
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<52} {'-':>11} {current:>11.2f} {'new':>8}")
+            continue
+
+        change = (current - previous) / previous if previous else 0.0
+        flag = ''
+        if (is_latency(name) and current > previous * (1 + threshold)
+                and current - previous > MIN_REGRESSION_MS):
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<52} {previous:>11.2f} {current:>11.2f} {change:>+7.0%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite with a latency regression gate')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[24, 96],
+                        help='Synthetic assignment sizes (default: 24 96)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic assignments')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                        help='Baseline file (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store the results as the new baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed latency increase over the baseline (default: 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    # SymPy's integration paths depend on set iteration order; fix string hashing
+    # so every run (and the baseline) takes the same paths
+    if os.environ.get('PYTHONHASHSEED') != '0':
+        os.execve(sys.executable, [sys.executable] + sys.argv, {**os.environ, 'PYTHONHASHSEED': '0'})
+
+    # Load SymPy's integration machinery before anything is timed; the orchestrator
+    # creates its data/ directories in the working directory, so it runs in a scratch one
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='math-solver-warmup-') as scratch:
+        os.chdir(scratch)
+        try:
+            orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None)
+            orchestrator.warm_up()
+            orchestrator.close()
+        finally:
+            os.chdir(original_cwd)
+
+    metrics = run_suite(args.sizes, args.repeat, args.seed)
+    record = {
+        'environment': environment(),
+        'settings': {'sizes': args.sizes, 'repeat': args.repeat, 'seed': args.seed},
+        'metrics': metrics
+    }
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        FileHandler.save_json(record, str(baseline_path))
+        for name in sorted(metrics):
+            print(f"{name:<52} {metrics[name]:>11.2f}")
+        print(f"\nBaseline saved to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        for name in sorted(metrics):
+            print(f"{name:<52} {metrics[name]:>11.2f}")
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one")
+        return
+
+    baseline = FileHandler.load_json(str(baseline_path))
+    if baseline.get('environment') != record['environment']:
+        print(f"Warning: baseline was recorded on a different environment: {baseline.get('environment')}")
+    if baseline.get('settings') != record['settings']:
+        print(f"Warning: baseline was recorded with different settings: {baseline.get('settings')}")
+
+    regressions = compare(metrics, baseline.get('metrics', {}), args.threshold)
+    if regressions:
+        print(f"\nFAILED: {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nOK: no latency regression beyond {args.threshold:.0%}")
+
+if __name__ == '__main__':
+    main()
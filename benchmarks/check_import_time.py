@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Check that importing the CLI stays within the startup budget.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, reports
+the slowest top-level imports and fails if the total exceeds the budget or
+if a heavy module (SymPy, NumPy, mpmath) is loaded at import time.
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 300] [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be imported when an exercise is actually solved (asyncio: by async callers)
+HEAVY_MODULES = ('sympy', 'numpy', 'mpmath', 'asyncio')
+
+# Cumulative import time of main, also enforced by tests/test_import_time.py
+BUDGET_MS = 300.0
+
+def measure_imports(module: str = 'main'):
+    """Return {module: cumulative microseconds} parsed from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT / 'src', capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        timings[name.strip()] = int(cumulative_us)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time budget check for src/main.py')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS,
+                        help=f'Maximum cumulative import time of main (default: {BUDGET_MS:g})')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to show')
+    args = parser.parse_args()
+
+    timings = measure_imports()
+    total_ms = timings.get('main', 0) / 1000
+
+    print(f"{'module':<40} {'cumulative':>12}")
+    for name, micros in sorted(timings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<40} {micros / 1000:>10.1f}ms")
+
+    failures = []
+    heavy = sorted(name for name in timings if name.split('.')[0] in HEAVY_MODULES)
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy[:5])}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import main took {total_ms:.1f}ms (budget {args.budget_ms:g}ms)")
+
+    print(f"\nimport main: {total_ms:.1f}ms (budget {args.budget_ms:g}ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
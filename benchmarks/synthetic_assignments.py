@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Generate synthetic assignments in the data/input schema.
+
+Exercises cycle through cartesian, polar, cylindrical and spherical shapes
+with random coefficients; a share of them are grouped into parts (id_part)
+or lettered sub-exercises (id_letter), like the bundled assignments.
+
+Usage:
+    python benchmarks/synthetic_assignments.py --size 200 --output bank.json [--seed 0]
+"""
+import argparse
+import json
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+SHAPES = ('cartesian', 'polar', 'cylindrical', 'spherical')
+
+def _integrals(*levels: Tuple[str, str, str]) -> List[Dict[str, Any]]:
+    """Integrals from (var, lower, upper) triples, innermost first"""
+    return [
+        {'var': var, 'limits': {'lower': lower, 'upper': upper}, 'order': order}
+        for order, (var, lower, upper) in enumerate(levels, start=1)
+    ]
+
+def _cartesian(rng: random.Random) -> Tuple[str, List[Dict[str, Any]]]:
+    a, b, c, d = (rng.randint(1, 5) for _ in range(4))
+    return rng.choice([
+        (f"{a}*x**2 + {b}*y", _integrals(('y', '0', str(c)), ('x', '0', str(d)))),
+        (f"x*y + {a}", _integrals(('y', '0', 'x'), ('x', '0', str(c)))),
+        (f"exp({a}*x + y)", _integrals(('y', '0', '1'), ('x', '0', str(c)))),
+        (f"sin(x)*cos(y)", _integrals(('y', '0', f"pi/{b + 1}"), ('x', '0', 'pi'))),
+        (f"x + y*z", _integrals(('z', '0', str(a)), ('y', '0', str(b)), ('x', '0', str(c)))),
+        (f"{a}*x*cos(y)", _integrals(('y', '0', 'x**2'), ('x', '0', '1')))
+    ])
+
+def _polar(rng: random.Random) -> Tuple[str, List[Dict[str, Any]]]:
+    a, k = rng.randint(1, 5), rng.randint(2, 6)
+    return rng.choice([
+        (f"{a}*r", _integrals(('r', '0', f"{a}*cos(theta)"), ('theta', '0', f"pi/{k}"))),
+        ("r**3", _integrals(('r', '0', str(a)), ('theta', '0', '2*pi'))),
+        (f"r*sin(theta)", _integrals(('r', '0', str(a)), ('theta', '0', f"pi/{k}")))
+    ])
+
+def _cylindrical(rng: random.Random) -> Tuple[str, List[Dict[str, Any]]]:
+    a, h = rng.randint(1, 4), rng.randint(3, 8)
+    return rng.choice([
+        ("r", _integrals(('z', '0', f"{h} - r*cos(theta)"), ('r', '0', '1'), ('theta', '0', '2*pi'))),
+        ("z*r", _integrals(('z', '0', str(h)), ('r', '0', str(a)), ('theta', '0', '2*pi'))),
+        ("r", _integrals(('z', 'r**2', str(h)), ('r', '0', '1'), ('theta', '0', 'pi')))
+    ])
+
+def _spherical(rng: random.Random) -> Tuple[str, List[Dict[str, Any]]]:
+    a, k = rng.randint(1, 4), rng.randint(2, 6)
+    return rng.choice([
+        ("rho**2*sin(phi)", _integrals(('rho', '0', str(a)), ('phi', '0', f"pi/{k}"), ('theta', '0', '2*pi'))),
+        ("rho**3*sin(phi)*cos(phi)", _integrals(('rho', '0', str(a)), ('phi', '0', 'pi/2'), ('theta', '0', '2*pi')))
+    ])
+
+SHAPE_GENERATORS: Dict[str, Callable[[random.Random], Tuple[str, List[Dict[str, Any]]]]] = {
+    'cartesian': _cartesian,
+    'polar': _polar,
+    'cylindrical': _cylindrical,
+    'spherical': _spherical
+}
+
+def _exercise(exercise_id: int, id_letter, id_part, function: str, integrals) -> Dict[str, Any]:
+    return {
+        'id': str(exercise_id), 'id_letter': id_letter, 'id_part': id_part, 'type': 'integral',
+        'function': function, 'integrals': integrals
+    }
+
+def generate_exercises(size: int, seed: int = 0, grouped_ratio: float = 0.25) -> List[Dict[str, Any]]:
+    """`size` exercises cycling through SHAPES; about grouped_ratio of them belong to groups"""
+    rng = random.Random(seed)
+    exercises: List[Dict[str, Any]] = []
+    exercise_id = 0
+    while len(exercises) < size:
+        exercise_id += 1
+        shape = SHAPES[exercise_id % len(SHAPES)]
+        generate = SHAPE_GENERATORS[shape]
+        parts = min(rng.randint(2, 3), size - len(exercises)) if rng.random() < grouped_ratio else 1
+
+        if parts == 1:
+            exercises.append(_exercise(exercise_id, None, None, *generate(rng)))
+        elif rng.random() < 0.5:
+            # Parts of one exercise, summed in the document
+            for part in range(1, parts + 1):
+                exercises.append(_exercise(exercise_id, None, part, *generate(rng)))
+        else:
+            # Lettered sub-exercises
+            for index in range(parts):
+                exercises.append(_exercise(exercise_id, chr(ord('a') + index), None, *generate(rng)))
+    return exercises
+
+def generate_assignment(size: int, seed: int = 0, grouped_ratio: float = 0.25) -> Dict[str, Any]:
+    """Complete input assignment (metadata + exercises) with `size` exercises"""
+    return {
+        'metadata': {
+            'course': {'name': 'Calculo 3', 'subject_area': 'calculo', 'level': 3},
+            'assignment': {'type': 'SINTETICO', 'number': size, 'year': 2025, 'month': 1, 'iteration': seed + 1},
+            'output_settings': {
+                'units': 'u', 'decimal_precision': 4, 'show_steps': False,
+                'equation_format': {'show_quantity_label': True, 'show_equation': True}
+            }
+        },
+        'exercises': generate_exercises(size, seed, grouped_ratio)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic input assignment')
+    parser.add_argument('--size', type=int, default=100, help='Number of exercises (default: 100)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--grouped-ratio', type=float, default=0.25,
+                        help='Share of exercises that start a group of parts (default: 0.25)')
+    parser.add_argument('--output', required=True, help='Path of the JSON file to write')
+    args = parser.parse_args()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(generate_assignment(args.size, args.seed, args.grouped_ratio), f, indent=2, ensure_ascii=False)
+    print(f"Wrote {args.size} exercises to {args.output}")
+
+if __name__ == '__main__':
+    main()
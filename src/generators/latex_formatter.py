@@ -1,6 +1,20 @@
 #!/usr/bin/env python3
 import re
-from typing import Optional
+from typing import List, Optional, Tuple
+
+# One token per match: whitespace, LaTeX command, number, name, '**' or any single character
+TOKEN_PATTERN = re.compile(
+    r'(?P<space>\s+)|(?P<command>\\[A-Za-z]+|\\.)|(?P<number>\d+(?:\.\d+)?)|'
+    r'(?P<name>[A-Za-z][A-Za-z0-9]*)|(?P<power>\*\*)|(?P<char>.)',
+    re.S
+)
+
+# A LaTeX command at the end of a rendered piece, e.g. \theta
+COMMAND_WORD = re.compile(r'\\[A-Za-z]+$')
+
+# A parsed expression is a list of (kind, value) items; a parenthesized
+# group is ('group', [items]) so nesting is handled structurally
+Item = Tuple[str, object]
 
 class LaTeXFormatter:
     """Formatter class for cleaning and formatting mathematical LaTeX content"""
@@ -8,73 +22,41 @@ class LaTeXFormatter:
     def __init__(self):
         # Mathematical function mappings for LaTeX
         self.math_functions = {
-            'sin': r'\\sin',
-            'cos': r'\\cos',
-            'tan': r'\\tan',
-            'sec': r'\\sec',
-            'csc': r'\\csc',
-            'cot': r'\\cot',
-            'arcsin': r'\\arcsin',
-            'arccos': r'\\arccos',
-            'arctan': r'\\arctan',
-            'sinh': r'\\sinh',
-            'cosh': r'\\cosh',
-            'tanh': r'\\tanh',
-            'sqrt': r'\\sqrt',
-            'log': r'\\log',
-            'ln': r'\\ln',
-            'lim': r'\\lim',
-            'max': r'\\max',
-            'min': r'\\min'
+            'sin': '\\sin',
+            'cos': '\\cos',
+            'tan': '\\tan',
+            'sec': '\\sec',
+            'csc': '\\csc',
+            'cot': '\\cot',
+            'arcsin': '\\arcsin',
+            'arccos': '\\arccos',
+            'arctan': '\\arctan',
+            'sinh': '\\sinh',
+            'cosh': '\\cosh',
+            'tanh': '\\tanh',
+            'sqrt': '\\sqrt',
+            'log': '\\log',
+            'ln': '\\ln',
+            'lim': '\\lim',
+            'max': '\\max',
+            'min': '\\min'
         }
         
         # Greek letters and special symbols
         self.greek_symbols = {
-            'alpha': r'\\alpha',
-            'beta': r'\\beta',
-            'gamma': r'\\gamma',
-            'Gamma': r'\\Gamma',
-            'delta': r'\\delta',
-            'Delta': r'\\Delta',
-            'epsilon': r'\\epsilon',
-            'varepsilon': r'\\varepsilon',
-            'zeta': r'\\zeta',
-            'eta': r'\\eta',
-            'theta': r'\\theta',
-            'Theta': r'\\Theta',
-            'vartheta': r'\\vartheta',
-            'iota': r'\\iota',
-            'kappa': r'\\kappa',
-            'lambda': r'\\lambda',
-            'Lambda': r'\\Lambda',
-            'mu': r'\\mu',
-            'nu': r'\\nu',
-            'xi': r'\\xi',
-            'Xi': r'\\Xi',
-            'pi': r'\\pi',
-            'Pi': r'\\Pi',
-            'rho': r'\\rho',
-            'varrho': r'\\varrho',
-            'sigma': r'\\sigma',
-            'Sigma': r'\\Sigma',
-            'tau': r'\\tau',
-            'upsilon': r'\\upsilon',
-            'Upsilon': r'\\Upsilon',
-            'phi': r'\\phi',
-            'Phi': r'\\Phi',
-            'varphi': r'\\varphi',
-            'chi': r'\\chi',
-            'psi': r'\\psi',
-            'Psi': r'\\Psi',
-            'omega': r'\\omega',
-            'Omega': r'\\Omega'
+            name: '\\' + name for name in (
+                'alpha', 'beta', 'gamma', 'Gamma', 'delta', 'Delta', 'epsilon', 'varepsilon',
+                'zeta', 'eta', 'theta', 'Theta', 'vartheta', 'iota', 'kappa', 'lambda', 'Lambda',
+                'mu', 'nu', 'xi', 'Xi', 'pi', 'Pi', 'rho', 'varrho', 'sigma', 'Sigma', 'tau',
+                'upsilon', 'Upsilon', 'phi', 'Phi', 'varphi', 'chi', 'psi', 'Psi', 'omega', 'Omega'
+            )
         }
         
         # Constants mappings
         self.constants = {
-            'E': r'e',  # SymPy uses E for Euler's number
-            'oo': r'\\infty',  # SymPy infinity
-            'I': r'i'   # SymPy imaginary unit
+            'E': 'e',  # SymPy uses E for Euler's number
+            'oo': '\\infty',  # SymPy infinity
+            'I': 'i'   # SymPy imaginary unit
         }
     
     def clean_integral_setup(self, integral_setup_str: str) -> str:
@@ -82,127 +64,172 @@ class LaTeXFormatter:
         if not integral_setup_str:
             return ""
         
-        result = integral_setup_str
-        
-        # Fix Greek symbols FIRST (before other operations)
-        result = self._fix_greek_symbols(result)
-        
-        # Fix exponentials: ** → ^
-        result = self._fix_exponentials(result)
-        
-        # Fix exp() function specially
-        result = self._fix_exp_function(result)
-        
-        # Fix mathematical functions
-        result = self._fix_math_functions(result)
-        
-        # Fix constants
-        result = self._fix_constants(result)
-        
-        # Remove unnecessary multiplication symbols
-        result = self._remove_multiplication_symbols(result)
-        
-        # Fix differentials - SIMPLE VERSION
-        result = self._fix_differentials(result)
+        result = self._render(self._parse(integral_setup_str), fractions=False)
         
         # Clean extra spaces
-        result = self._clean_spacing(result)
-        
-        return result
+        return self._clean_spacing(result)
     
-    def _fix_greek_symbols(self, text: str) -> str:
-        """Convert Greek letter names to LaTeX symbols"""
-        result = text
-        
-        for symbol, latex_symbol in self.greek_symbols.items():
-            # Use word boundaries to avoid partial matches
-            result = re.sub(rf'\b{symbol}\b', latex_symbol, result)
-        
-        return result
+    def _parse(self, text: str) -> List[Item]:
+        """Tokenize in one scan and nest parenthesized groups"""
+        stack: List[List[Item]] = [[]]
+        for match in TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            value = match.group()
+            if value == '(':
+                stack.append([])
+            elif value == ')' and len(stack) > 1:
+                group = stack.pop()
+                stack[-1].append(('group', group))
+            else:
+                stack[-1].append((kind, value))
+        
+        # Unbalanced '(' are kept as plain characters
+        while len(stack) > 1:
+            group = stack.pop()
+            stack[-1].extend([('char', '(')] + group)
+        return stack[0]
     
-    def _fix_exponentials(self, text: str) -> str:
-        """Convert ** to ^ for LaTeX exponents with proper braces"""
-        result = text
-        
-        # Handle complex exponents: x**(y + z) → x^{y + z}
-        result = re.sub(r'(\w+|\))\*\*\(([^)]+)\)', r'\1^{\2}', result)
-        
-        # Handle simple exponents: x**2 → x^{2}
-        result = re.sub(r'(\w+|\))\*\*(\w+|\d+)', r'\1^{\2}', result)
-        
-        return result
+    def _render(self, items: List[Item], fractions: bool) -> str:
+        """Render an item list to LaTeX; with fractions, a/b terms become \\dfrac{a}{b}"""
+        if fractions and any(item == ('char', '/') for item in items):
+            return self._render_terms(items)
+        
+        pieces: List[str] = []
+        i = 0
+        while i < len(items):
+            kind, value = items[i]
+            next_item = items[i + 1] if i + 1 < len(items) else None
+            
+            if kind == 'name' and next_item is not None and next_item[0] == 'group':
+                pieces.append(self._render_call(value, next_item[1], fractions))
+                i += 2
+                continue
+            if kind == 'power':
+                exponent, i = self._take_operand(items, i + 1)
+                pieces.append('^{' + self._render(exponent, fractions) + '}')
+                continue
+            
+            if kind == 'name':
+                pieces.append(self._render_name(value))
+            elif kind == 'group':
+                pieces.append('(' + self._render(value, fractions) + ')')
+            else:
+                pieces.append(value)
+            i += 1
+        
+        return self._join_products(pieces)
     
-    def _fix_exp_function(self, text: str) -> str:
-        """Convert exp() functions to e^{} format"""
-        result = text
-        
-        # Handle nested parentheses in exp functions
-        # exp(complex_expression) → e^{complex_expression}
-        
-        def replace_exp(match):
-            content = match.group(1)
-            return f'e^{{{content}}}'
-        
-        # Match exp with balanced parentheses
-        # This handles exp(x + y), exp(2), exp(x*y), etc.
-        result = re.sub(r'exp\(([^)]+(?:\([^)]*\)[^)]*)*)\)', replace_exp, result)
-        
-        return result
+    def _render_call(self, name: str, arguments: List[Item], fractions: bool) -> str:
+        inner = self._render(arguments, fractions)
+        if name == 'exp':
+            return f'e^{{{inner}}}'
+        if name == 'sqrt':
+            return f'\\sqrt{{{inner}}}'
+        return f'{self._render_name(name)}({inner})'
     
-    def _fix_math_functions(self, text: str) -> str:
-        """Fix mathematical functions for proper LaTeX rendering"""
-        result = text
-        
-        for func, latex_func in self.math_functions.items():
-            # For standard functions: sin(x) → \sin(x)
-            result = re.sub(rf'\b{func}\b', latex_func, result)
-        
-        return result
+    def _render_name(self, name: str) -> str:
+        if name in self.greek_symbols:
+            return self.greek_symbols[name]
+        if name in self.math_functions:
+            return self.math_functions[name]
+        if name in self.constants:
+            return self.constants[name]
+        # Differentials of Greek variables: dtheta -> d\theta
+        if name.startswith('d') and name[1:] in self.greek_symbols:
+            return 'd' + self.greek_symbols[name[1:]]
+        return name
     
-    def _fix_constants(self, text: str) -> str:
-        """Fix mathematical constants"""
-        result = text
-        
-        for const, latex_const in self.constants.items():
-            # Only replace if it's a standalone constant (word boundary)
-            result = re.sub(rf'\b{const}\b', latex_const, result)
-        
-        return result
+    @staticmethod
+    def _take_operand(items: List[Item], start: int) -> Tuple[List[Item], int]:
+        """The operand of '**': a signed number, name, call or parenthesized group"""
+        end = start
+        if end < len(items) and items[end] == ('char', '-'):
+            end += 1
+        if end < len(items):
+            end += 1
+            if items[end - 1][0] == 'name' and end < len(items) and items[end][0] == 'group':
+                end += 1
+        
+        operand = items[start:end]
+        # x**(y + z) -> x^{y + z}: the braces replace the parentheses
+        if len(operand) == 1 and operand[0][0] == 'group':
+            operand = operand[0][1]
+        return operand, end
     
-    def _remove_multiplication_symbols(self, text: str) -> str:
-        """Remove unnecessary multiplication symbols"""
-        result = text
-        
-        # Remove * between number and variable: 2*x → 2x
-        result = re.sub(r'(\d+)\*([a-zA-Z\\])', r'\1\2', result)
-        
-        # Remove * between variables: x*y → xy (but be careful with functions)
-        result = re.sub(r'([a-zA-Z])\*([a-zA-Z])', r'\1\2', result)
-        
-        # Remove * between variable and function: r*\sin → r\sin
-        result = re.sub(r'([a-zA-Z])\*(\\[a-zA-Z]+)', r'\1\2', result)
-        
-        # Remove * between number and function: 2*\sin → 2\sin
-        result = re.sub(r'(\d+)\*(\\[a-zA-Z]+)', r'\1\2', result)
-        
-        # Remove * between closing brace and variable: }*x → }x
-        result = re.sub(r'\}\*([a-zA-Z])', r'}\1', result)
-        
-        # Remove * between variable and opening brace: x*{ → x{
-        result = re.sub(r'([a-zA-Z])\*\{', r'\1{', result)
-        
-        return result
+    @staticmethod
+    def _join_products(pieces: List[str]) -> str:
+        """Drop '*' where juxtaposition reads as a product (2x, xy, r\\sin, }x, (x + 1)(y + 2)), else use \\cdot"""
+        result = []
+        for index, piece in enumerate(pieces):
+            if piece == '*' and 0 < index < len(pieces) - 1 and result:
+                left = result[-1]
+                right = pieces[index + 1][:1]
+                if COMMAND_WORD.search(left) and right.isalpha():
+                    # \theta r: without the space it would read as the command \thetar
+                    result.append(' ')
+                elif (left[-1:].isalnum() or left[-1:] in ')}') and (right.isalpha() or right in '\\('):
+                    pass
+                elif left[-1:].isalpha() and right == '{':
+                    pass
+                else:
+                    result.append(' \\cdot ')
+                continue
+            result.append(piece)
+        return ''.join(result)
     
-    def _fix_differentials(self, text: str) -> str:
-        """Fix differentials: dtheta → d\theta, etc."""
-        result = text
-        
-        # SIMPLE AND DIRECT - only the most common ones
-        result = re.sub(r'\bdtheta\b', r'd\\theta', result)
-        result = re.sub(r'\bdphi\b', r'd\\phi', result)
-        result = re.sub(r'\bdrho\b', r'd\\rho', result)
-        
-        return result
+    def _render_terms(self, items: List[Item]) -> str:
+        """Render a sum whose terms may be quotients, e.g. 1/2 - cos(1)/2"""
+        output = []
+        term: List[Item] = []
+        for index, item in enumerate(items):
+            previous = items[index - 1] if index else None
+            # '+'/'-' split terms unless they are the sign of an exponent (x**-1)
+            if item in (('char', '+'), ('char', '-')) and (previous is None or previous[0] != 'power'):
+                output.append(self._render_term(term))
+                output.append(item[1])
+                term = []
+            else:
+                term.append(item)
+        output.append(self._render_term(term))
+        return ''.join(output)
+    
+    def _render_term(self, term: List[Item]) -> str:
+        # Keep the spaces around the term outside the fraction
+        start, end = 0, len(term)
+        while start < end and term[start][0] == 'space':
+            start += 1
+        while end > start and term[end - 1][0] == 'space':
+            end -= 1
+        leading = ''.join(value for _, value in term[:start])
+        trailing = ''.join(value for _, value in term[end:])
+        core = term[start:end]
+        
+        parts: List[List[Item]] = [[]]
+        for item in core:
+            if item == ('char', '/'):
+                parts.append([])
+            else:
+                parts[-1].append(item)
+        
+        if len(parts) == 1:
+            return leading + self._render(core, fractions=True) + trailing
+        if not all(parts):
+            # A dangling '/' is rendered literally
+            return leading + self._render(core, fractions=False) + trailing
+        
+        numerator = self._render_fraction_part(parts[0])
+        if len(parts) == 2:
+            denominator = self._render_fraction_part(parts[1])
+        else:
+            # x/2/3 -> \\dfrac{x}{2 \\cdot 3}; sums keep their parentheses in the product
+            denominator = ' \\cdot '.join(self._render(part, fractions=True) for part in parts[1:])
+        return f'{leading}\\dfrac{{{numerator}}}{{{denominator}}}{trailing}'
+    
+    def _render_fraction_part(self, part: List[Item]) -> str:
+        # (x + 1)/2 -> \\dfrac{x + 1}{2}
+        if len(part) == 1 and part[0][0] == 'group':
+            part = part[0][1]
+        return self._render(part, fractions=True)
     
     def _clean_spacing(self, text: str) -> str:
         """Clean up extra spaces while preserving LaTeX structure"""
@@ -212,20 +239,25 @@ class LaTeXFormatter:
         
         return result
     
-    def format_solution_display(self, exact: str, decimal: float, units: str, precision: int) -> str:
-        """Format the solution part: exact = decimal units"""
-        if not exact or decimal is None:
+    def format_solution_display(self, exact: str, decimal: float, units: str, precision: int,
+                                exact_latex: Optional[str] = None) -> str:
+        """Format the solution part: exact = decimal units (exact_latex, if given, is used as is)"""
+        if decimal is None:
             return "N/A"
         
-        # Clean the exact solution
-        exact_clean = self._format_exact_solution(exact)
-        
         # Format decimal with specified precision
         decimal_str = f"{decimal:.{precision}f}"
         
         # Format units
         units_formatted = self._format_units(units)
         
+        # Numeric-only results (e.g. budget fallbacks) have no exact form
+        if not exact:
+            return f"{decimal_str} \\ {units_formatted}"
+        
+        # Clean the exact solution
+        exact_clean = exact_latex or self._format_exact_solution(exact)
+        
         return f"{exact_clean} = {decimal_str} \\ {units_formatted}"
     
     def _format_exact_solution(self, exact: str) -> str:
@@ -233,56 +265,7 @@ class LaTeXFormatter:
         if not exact:
             return ""
         
-        result = exact
-        
-        # ESTRATEGIA: Procesar fracciones ANTES de transformar funciones
-        # para evitar que \cos(1)/2 se convierta en \cos\dfrac{1}{2}
-        
-        # 1. Handle fractions FIRST (while functions are still in original form)
-        result = self._fix_fractions_early(result)
-        
-        # 2. THEN fix Greek symbols
-        result = self._fix_greek_symbols(result)
-        
-        # 3. Handle mathematical constants
-        result = self._fix_constants(result)
-        
-        # 4. Handle square roots: sqrt(x) → \sqrt{x}
-        result = re.sub(r'sqrt\(([^)]+)\)', r'\\sqrt{\1}', result)
-        
-        # 5. Handle exp functions
-        result = self._fix_exp_function(result)
-        
-        # 6. Handle exponentials
-        result = self._fix_exponentials(result)
-        
-        # 7. Fix math functions
-        result = self._fix_math_functions(result)
-        
-        # 8. Remove unnecessary multiplications
-        result = self._remove_multiplication_symbols(result)
-        
-        return result
-    
-    def _fix_fractions_early(self, text: str) -> str:
-        """Fix fractions BEFORE other transformations to avoid conflicts"""
-        result = text
-        
-        # Handle function calls with division: cos(1)/2 → dfrac{cos(1)}{2}
-        # (BEFORE cos becomes \cos)
-        result = re.sub(r'([a-zA-Z]+\([^)]+\))/(\d+)', r'\\dfrac{\1}{\2}', result)
-        
-        # Handle expressions in parentheses: (expression)/denominator
-        result = re.sub(r'\(([^)]+)\)/(\d+)', r'\\dfrac{\1}{\2}', result)
-        
-        # Handle exp() specifically: exp(x)/2 → dfrac{exp(x)}{2}
-        result = re.sub(r'(exp\([^)]+\))/(\d+)', r'\\dfrac{\1}{\2}', result)
-        
-        # Handle simple cases: variable/number, number/number
-        result = re.sub(r'([a-zA-Z]+)/(\d+)', r'\\dfrac{\1}{\2}', result)
-        result = re.sub(r'(\d+)/(\d+)', r'\\dfrac{\1}{\2}', result)
-        
-        return result
+        return self._render(self._parse(exact), fractions=True)
     
     def _format_units(self, units: str) -> str:
         """Format units for LaTeX display"""
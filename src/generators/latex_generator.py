@@ -1,34 +1,83 @@
 #!/usr/bin/env python3
-import subprocess
+import hashlib
+import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from collections import defaultdict, OrderedDict
 from .latex_formatter import LaTeXFormatter
+from .pdf_compiler import CompileReport, compile_tex, file_hash
 
 class LaTeXGenerator:
     """Generates LaTeX documents from processed exercise data"""
     
-    def __init__(self):
+    def __init__(self, fragment_cache_size: int = 4096):
         self.formatter = LaTeXFormatter()
+        
+        # Rendered \item fragments keyed by the hash of their exercise group
+        self.fragment_cache_size = fragment_cache_size
+        self._fragments: 'OrderedDict[str, str]' = OrderedDict()
+        self.fragment_stats = {'hits': 0, 'misses': 0}
     
-    def generate_latex(self, data: Dict[str, Any], output_path: str) -> None:
-        """Generate complete LaTeX document"""
-        print(f"  Generating LaTeX file: {output_path}")
+    def generate_latex(self, data: Dict[str, Any], output_path: str,
+                       log: Callable[[str], None] = print) -> None:
+        """Generate complete LaTeX document, reporting progress through log"""
+        log(f"  Generating LaTeX file: {output_path}")
         
         try:
             # Generate document content
-            latex_content = self._generate_document(data)
+            latex_content = self.render(data)
             
-            # Write to file
+            # Only touch the file when the content changed
+            if self._read_text(output_path) == latex_content:
+                log(f"  LaTeX file unchanged: {output_path}")
+                return
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(latex_content)
             
-            print(f"  LaTeX file generated successfully: {output_path}")
+            log(f"  LaTeX file generated successfully: {output_path}")
             
         except Exception as e:
-            print(f"  Error generating LaTeX: {e}")
+            log(f"  Error generating LaTeX: {e}")
             raise
     
+    def generate_latex_streaming(self, metadata: Dict[str, Any], exercises: Iterable[Dict[str, Any]],
+                                 output_path: str, log: Callable[[str], None] = print) -> None:
+        """Write the LaTeX document while reading exercises one group at a time.
+        
+        Parts of the same exercise must be contiguous, as they are in every
+        input file; the output is then identical to generate_latex.
+        """
+        log(f"  Generating LaTeX file: {output_path}")
+        
+        partial_path = f"{output_path}.part"
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                f.write(self._generate_header(metadata) + "\n")
+                for index, group_data in enumerate(self._iter_contiguous_groups(exercises)):
+                    if index:
+                        f.write("\n")
+                    f.write(self._render_item(group_data))
+                f.write("\n" + self._generate_footer())
+            
+            # Only touch the file when the content changed
+            if file_hash(partial_path) == file_hash(output_path):
+                os.remove(partial_path)
+                log(f"  LaTeX file unchanged: {output_path}")
+                return
+            os.replace(partial_path, output_path)
+            
+            log(f"  LaTeX file generated successfully: {output_path}")
+            
+        except Exception as e:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            log(f"  Error generating LaTeX: {e}")
+            raise
+    
+    def render(self, data: Dict[str, Any]) -> str:
+        """Return the LaTeX document for processed data without writing it"""
+        return self._generate_document(data)
+    
     def _generate_document(self, data: Dict[str, Any]) -> str:
         """Generate the complete LaTeX document"""
         metadata = data['metadata']
@@ -114,16 +163,55 @@ class LaTeXGenerator:
         
         return grouped
     
+    def _iter_contiguous_groups(self, exercises: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Streaming counterpart of _group_exercises for inputs with contiguous parts"""
+        group = None
+        for exercise in exercises:
+            if group is not None and group['base_id'] != exercise['id']:
+                yield group
+                group = None
+            if group is None:
+                group = {'base_id': exercise['id'], 'parts': []}
+            group['parts'].append(exercise)
+        
+        if group is not None:
+            yield group
+    
     def _generate_exercises_section(self, grouped_exercises: OrderedDict) -> str:
         """Generate the exercises section"""
         items = []
         
         for group_key, group_data in grouped_exercises.items():
-            item_content = self._generate_exercise_item(group_data)
+            item_content = self._render_item(group_data)
             items.append(item_content)
         
         return "\n".join(items)
     
+    def _render_item(self, group_data: Dict[str, Any]) -> str:
+        """Render one \\item, reusing the fragment of an identical exercise group"""
+        # computation_details (method, stage timings) never reach the document
+        rendered_fields = [
+            {field: value for field, value in part.items() if field != 'computation_details'}
+            for part in group_data['parts']
+        ]
+        key = hashlib.sha256(
+            json.dumps([group_data['base_id'], rendered_fields], sort_keys=True, ensure_ascii=True,
+                       default=str).encode('utf-8')
+        ).hexdigest()
+        
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            self.fragment_stats['hits'] += 1
+            return fragment
+        
+        self.fragment_stats['misses'] += 1
+        fragment = self._generate_exercise_item(group_data)
+        self._fragments[key] = fragment
+        if len(self._fragments) > self.fragment_cache_size:
+            self._fragments.popitem(last=False)
+        return fragment
+    
     def _generate_exercise_item(self, group_data: Dict[str, Any]) -> str:
         """Generate a single exercise item"""
         base_id = group_data['base_id']
@@ -221,18 +309,10 @@ class LaTeXGenerator:
         quantity_label = self.formatter.get_quantity_label(quantity_type)
         
         integral_setup = latex_data.get('integral_setup', '')
-        integral_clean = self.formatter.clean_integral_setup(integral_setup)
-        
-        exact = solution.get('exact')
         decimal = solution.get('decimal')
-        units = solution.get('units')
-        precision = exercise.get('display_settings', {}).get('decimal_precision', 4)
+        integral_clean, solution_display = self._format_setup_and_solution(exercise)
         
-        solution_display = self.formatter.format_solution_display(
-            exact, decimal, units, precision
-        )
-        
-        if integral_setup and exact and decimal is not None:
+        if integral_setup and decimal is not None:
             content = f"{quantity_label} = ${integral_clean} = {solution_display}$"
         else:
             content = f"{quantity_label} = {solution_display}"
@@ -313,50 +393,46 @@ class LaTeXGenerator:
         quantity_label = self.formatter.get_quantity_label(quantity_type)
         
         integral_setup = latex_data.get('integral_setup', '')
-        integral_clean = self.formatter.clean_integral_setup(integral_setup)
-        
-        exact = solution.get('exact')
         decimal = solution.get('decimal')
-        units = solution.get('units')
-        precision = exercise.get('display_settings', {}).get('decimal_precision', 4)
-        
-        solution_display = self.formatter.format_solution_display(
-            exact, decimal, units, precision
-        )
+        integral_clean, solution_display = self._format_setup_and_solution(exercise)
         
-        if integral_setup and exact and decimal is not None:
+        if integral_setup and decimal is not None:
             return f"{quantity_label} = ${integral_clean} = {solution_display}$"
         else:
             return f"{quantity_label} = {solution_display}"
     
-    def compile_pdf(self, tex_path: str) -> None:
-        """Attempt to compile LaTeX to PDF"""
-        try:
-            print(f"  Attempting to compile PDF from: {tex_path}")
-            
-            # Change to output directory
-            output_dir = os.path.dirname(tex_path)
-            tex_filename = os.path.basename(tex_path)
-            
-            # Run pdflatex
-            result = subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', tex_filename],
-                cwd=output_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
+    def _format_setup_and_solution(self, exercise: Dict[str, Any]) -> Tuple[str, str]:
+        """Integral setup and 'exact = decimal units' display of one exercise"""
+        solution = exercise.get('solution', {})
+        latex_data = exercise.get('latex', {})
+        precision = exercise.get('display_settings', {}).get('decimal_precision', 4)
+        
+        integral_setup = latex_data.get('integral_setup', '')
+        if latex_data.get('renderer') == 'sympy':
+            # Rendered from the SymPy trees by the solver: already final LaTeX
+            return integral_setup or '', self.formatter.format_solution_display(
+                solution.get('exact'), solution.get('decimal'), solution.get('units'), precision,
+                exact_latex=latex_data.get('final_result')
             )
-            
-            if result.returncode == 0:
-                pdf_path = tex_path.replace('.tex', '.pdf')
-                print(f"  PDF compiled successfully: {pdf_path}")
-            else:
-                print(f"  PDF compilation failed. LaTeX errors:")
-                print(result.stdout[-500:])  # Show last 500 chars of output
-                
-        except subprocess.TimeoutExpired:
-            print("  PDF compilation timed out")
-        except FileNotFoundError:
-            print("  pdflatex not found. Please install LaTeX to compile PDFs")
-        except Exception as e:
-            print(f"  PDF compilation error: {e}")
\ No newline at end of file
+        
+        integral_clean = self.formatter.clean_integral_setup(integral_setup)
+        solution_display = self.formatter.format_solution_display(
+            solution.get('exact'), solution.get('decimal'), solution.get('units'), precision
+        )
+        return integral_clean, solution_display
+    
+    def compile_pdf(self, tex_path: str, timeout: float = 30,
+                    log: Callable[[str], None] = print) -> CompileReport:
+        """Compile LaTeX to PDF, skipping the run when the PDF is up to date"""
+        log(f"  Attempting to compile PDF from: {tex_path}")
+        report = compile_tex(tex_path, timeout=timeout)
+        log(f"  {report.describe()}")
+        return report
+    
+    @staticmethod
+    def _read_text(path: str) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
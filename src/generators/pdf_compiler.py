@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+# pdflatex log messages asking for another run to resolve references
+RERUN_PATTERN = re.compile(
+    r'Rerun to get|There were undefined references|Label\(s\) may have changed|'
+    r'No file .*\.aux|Rerun LaTeX'
+)
+
+@dataclass
+class CompileReport:
+    """Outcome of compiling one .tex file"""
+    tex_path: str
+    pdf_path: str
+    status: str                 # 'compiled', 'up_to_date', 'failed', 'timeout' or 'unavailable'
+    runs: int = 0
+    elapsed: float = 0.0
+    message: Optional[str] = None
+    started: Optional[float] = None     # wall-clock start of the job, for traces
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('compiled', 'up_to_date')
+
+    def describe(self) -> str:
+        if self.status == 'compiled':
+            return f"PDF compiled successfully: {self.pdf_path} ({self.runs} run(s), {self.elapsed:.1f}s)"
+        if self.status == 'up_to_date':
+            return f"PDF is up to date: {self.pdf_path}"
+        if self.status == 'unavailable':
+            return "pdflatex not found. Please install LaTeX to compile PDFs"
+        if self.status == 'timeout':
+            return f"PDF compilation timed out: {self.tex_path}"
+        return f"PDF compilation failed: {self.tex_path}\n{self.message or ''}"
+
+def file_hash(path: str) -> Optional[str]:
+    """sha256 of a file's content, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def compile_stamp_path(tex_path: str) -> str:
+    """Hidden file next to the PDF holding the hash of the .tex it was compiled from"""
+    directory, filename = os.path.split(tex_path)
+    return os.path.join(directory, f".{filename}.compiled")
+
+def needs_rerun(log_text: str) -> bool:
+    """True when the pdflatex log reports unresolved references or changed labels"""
+    return bool(RERUN_PATTERN.search(log_text))
+
+def compile_tex(tex_path: str, timeout: float = 30, max_runs: int = 3) -> CompileReport:
+    """Compile one .tex file in an isolated temporary directory.
+
+    pdflatex is re-run only while the log asks for it (up to max_runs). The
+    PDF is copied next to the .tex, and the .tex hash is recorded so an
+    identical file is not compiled again.
+    """
+    start = time.time()
+    pdf_path = os.path.splitext(tex_path)[0] + '.pdf'
+    tex_hash = file_hash(tex_path)
+    stamp_path = compile_stamp_path(tex_path)
+
+    if tex_hash is not None and os.path.exists(pdf_path) and _read_text(stamp_path) == tex_hash:
+        return CompileReport(tex_path, pdf_path, 'up_to_date')
+    if shutil.which('pdflatex') is None:
+        return CompileReport(tex_path, pdf_path, 'unavailable')
+
+    tex_filename = os.path.basename(tex_path)
+    base_name = os.path.splitext(tex_filename)[0]
+    runs = 0
+    with tempfile.TemporaryDirectory(prefix='math-solver-tex-') as workdir:
+        shutil.copyfile(tex_path, os.path.join(workdir, tex_filename))
+        try:
+            while True:
+                runs += 1
+                result = subprocess.run(
+                    ['pdflatex', '-interaction=nonstopmode', tex_filename],
+                    cwd=workdir,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
+                if result.returncode != 0:
+                    # Show last 500 chars of output
+                    return CompileReport(tex_path, pdf_path, 'failed', runs, time.time() - start,
+                                         result.stdout[-500:])
+
+                log_text = _read_text(os.path.join(workdir, f"{base_name}.log")) or result.stdout
+                if runs >= max_runs or not needs_rerun(log_text):
+                    break
+        except subprocess.TimeoutExpired:
+            return CompileReport(tex_path, pdf_path, 'timeout', runs, time.time() - start)
+        except OSError as e:
+            return CompileReport(tex_path, pdf_path, 'failed', runs, time.time() - start, str(e))
+
+        built_pdf = os.path.join(workdir, f"{base_name}.pdf")
+        if not os.path.exists(built_pdf):
+            return CompileReport(tex_path, pdf_path, 'failed', runs, time.time() - start,
+                                 "pdflatex produced no PDF")
+        shutil.copyfile(built_pdf, pdf_path)
+
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        f.write(tex_hash)
+    return CompileReport(tex_path, pdf_path, 'compiled', runs, time.time() - start)
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return None
+
+class PDFCompiler:
+    """Runs several pdflatex jobs concurrently and collects their reports.
+
+    Jobs are submitted as soon as a .tex is written, so solving the next
+    assignment overlaps with compiling the previous one.
+    """
+
+    def __init__(self, max_jobs: Optional[int] = None, timeout: float = 30, max_runs: int = 3):
+        self.max_jobs = max_jobs or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.max_runs = max_runs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix='pdflatex')
+        self._jobs: List[Future] = []
+
+    def submit(self, tex_path: str) -> 'Future[CompileReport]':
+        future = self._executor.submit(self._compile, tex_path)
+        self._jobs.append(future)
+        return future
+
+    def _compile(self, tex_path: str) -> CompileReport:
+        started = time.time()
+        report = compile_tex(tex_path, self.timeout, self.max_runs)
+        report.started = started
+        return report
+
+    def wait(self) -> List[CompileReport]:
+        """Block until every submitted job finished; reports are in submission order"""
+        reports = [job.result() for job in self._jobs]
+        self._jobs = []
+        return reports
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -1,99 +1,834 @@
 #!/usr/bin/env python3
 import argparse
+import glob
+import hashlib
+import json
+import shutil
 import sys
 import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 # Import project modules
 from utils.file_handler import FileHandler
-from models.exercise import Exercise
-from solvers.integral_solver import IntegralSolver
-from generators.latex_generator import LaTeXGenerator
+from utils.solution_cache import SolutionCache
+from utils.result_store import ResultStore
+from utils.budget import run_with_budget
+from utils.json_stream import JSONObjectStream, assignment_content_hash
+from utils.intermediate_format import convert_intermediate, get_intermediate_format
+from utils.tracing import SpanRecorder, TraceWriter, recording, span
+from models.exercise import ComputationDetails, Exercise, LaTeXContent, Solution
+from solvers import SOLVER_VERSION
+
+# The solver and generator modules pull in SymPy; they are imported on first
+# use so that operations like --help, --clear-cache or an up-to-date --build
+# start without paying for it
+
+# progress(completed, total, message), called from the event loop by the async API
+ProgressCallback = Callable[[int, int, str], None]
 
 class MathSolverOrchestrator:
     """Main orchestrator for the Math Solver system"""
     
-    def __init__(self):
+    # Exercises per result store transaction in streaming mode
+    STORE_BATCH_SIZE = 500
+    
+    def __init__(self, use_cache: bool = True, workers: int = 1,
+                 time_limit: Optional[float] = None, memory_limit: Optional[float] = None,
+                 fallback_time_limit: float = 30, integration_method: str = 'symbolic', simplify_policy: str = 'tiered',
+                 strategies: Optional[List[str]] = None, strategy_mode: str = 'sequential',
+                 strategy_timeout: Optional[float] = None, incremental: bool = True,
+                 pdf_jobs: Optional[int] = None, pdf_timeout: float = 30, latex_renderer: str = 'text',
+                 trace: bool = False, intermediate_format: str = 'json',
+                 result_store: Optional[str] = ResultStore.DEFAULT_PATH, deduplicate: bool = True):
+        # Solver settings, also used to build the orchestrators of pool workers
+        self.options = {
+            'use_cache': use_cache,
+            'time_limit': time_limit,
+            'memory_limit': memory_limit,
+            'fallback_time_limit': fallback_time_limit,
+            'integration_method': integration_method,
+            'simplify_policy': simplify_policy,
+            'strategies': strategies,
+            'strategy_mode': strategy_mode,
+            'strategy_timeout': strategy_timeout,
+            'latex_renderer': latex_renderer,
+            'trace': trace,
+            'result_store': result_store,
+            # Scaled results of shared integrals can differ in form from direct solves
+            'deduplicate': deduplicate
+        }
+        self.integration_method = integration_method
+        self.workers = max(1, workers)
+        
+        # 'text' cleans the solver's strings with LaTeXFormatter, 'sympy' renders the parsed trees
+        if latex_renderer not in ('text', 'sympy'):
+            raise ValueError(f"Unknown LaTeX renderer '{latex_renderer}'")
+        self.latex_renderer = latex_renderer
+        
+        # Per-exercise budgets (seconds / MB); None disables the limit
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        
+        # The numeric fallback gets its own limit: the symbolic solve already used up time_limit
+        self.fallback_time_limit = fallback_time_limit
+        self._executor = None
+        self._async_executor = None
+        
+        # Carry over unchanged exercises from the previous intermediate JSON
+        self.incremental = incremental
+        
+        # Solve identical and scaled integrals of an assignment once (see IntegralPlanner)
+        self.deduplicate = deduplicate
+        self._integral_planner = None
+        
+        # 'json' (pretty-printed) or 'binary' (indexed records) files in data/temp
+        self.intermediate_format = get_intermediate_format(intermediate_format)
+        
+        # pdflatex settings; during builds PDFs are compiled on a pool of jobs
+        self.pdf_jobs = pdf_jobs
+        self.pdf_timeout = pdf_timeout
+        self._pdf_compiler = None
+        
+        # Stage spans of every exercise and assignment, exported with write_trace()
+        self.trace = TraceWriter() if trace else None
+        
         self.file_handler = FileHandler()
-        self.integral_solver = IntegralSolver()
-        self.latex_generator = LaTeXGenerator()
+        self.solution_cache = SolutionCache() if use_cache else None
+        
+        # SQLite record of solved exercises (None disables it); consulted before
+        # solving unless the cache is bypassed, written by the collecting process
+        self.result_store = ResultStore(result_store, SOLVER_VERSION) if result_store else None
+        self._integral_solver = None
+        self._latex_generator = None
         
         # Create necessary directories
         self.file_handler.create_directories()
     
+    @property
+    def integral_solver(self):
+        """Integral solver, created on first use"""
+        if self._integral_solver is None:
+            from solvers.integral_solver import IntegralSolver
+            from solvers.integration_strategies import IntegrationStrategyEngine
+            
+            self._integral_solver = IntegralSolver(
+                cache=self.solution_cache,
+                integration_method=self.integration_method,
+                simplify_policy=self.options['simplify_policy'],
+                strategy_engine=IntegrationStrategyEngine(
+                    strategies=self.options['strategies'],
+                    mode=self.options['strategy_mode'],
+                    timeout=self.options['strategy_timeout']
+                )
+            )
+        return self._integral_solver
+    
+    @property
+    def integral_planner(self):
+        """Within-assignment deduplication planner, created on first use"""
+        if self._integral_planner is None:
+            from solvers.integral_planner import IntegralPlanner
+            self._integral_planner = IntegralPlanner(self.integral_solver)
+        return self._integral_planner
+    
+    @property
+    def latex_generator(self):
+        """LaTeX generator, created on first use"""
+        if self._latex_generator is None:
+            from generators.latex_generator import LaTeXGenerator
+            self._latex_generator = LaTeXGenerator()
+        return self._latex_generator
+    
     def process_assignment(self, input_path: str) -> None:
         """Process a complete assignment from input JSON"""
+        try:
+            self._run_assignment(input_path)
+        except Exception as e:
+            print(f"Fatal error: {e}")
+            sys.exit(1)
+    
+    def _run_assignment(self, input_path: str, input_data: Optional[Dict[str, Any]] = None) -> None:
+        """Solve, save and render one assignment, raising on fatal errors"""
         print(f"Processing: {input_path}")
         start_time = time.time()
+        recorder = SpanRecorder()
         
-        try:
+        with recording(recorder), span('assignment', source=Path(input_path).name):
             # Load input JSON
-            input_data = self.file_handler.load_json(input_path)
+            with span('load'):
+                if input_data is None:
+                    input_data = self.file_handler.load_json(input_path)
+                previous = self._load_previous_intermediate(input_data) if self.incremental else None
             
-            # Check if it's already an intermediate JSON
-            if self.file_handler.is_intermediate_json(input_data):
-                print("Warning: Input appears to be an intermediate JSON")
+            with span('solve'):
+                intermediate_data = self.solve_assignment(input_data, input_path, previous)
+            errors = intermediate_data['metadata']['processing_info']['errors']
+            intermediate_data['metadata']['processing_info']['timings']['load'] = recorder.timings()['load']
             
-            # Create intermediate JSON structure
-            intermediate_data = self._create_intermediate_structure(input_data, input_path)
-            
-            # Process each exercise
-            errors = []
-            for i, exercise_data in enumerate(input_data['exercises']):
-                try:
-                    print(f"  Processing exercise {i+1}/{len(input_data['exercises'])}...")
-                    processed_exercise = self._process_exercise(
-                        exercise_data,
-                        input_data['metadata']['output_settings']
-                    )
-                    intermediate_data['exercises'].append(processed_exercise)
-                except Exception as e:
-                    error_msg = f"Error in exercise {exercise_data.get('id', 'unknown')}: {str(e)}"
-                    print(f"    {error_msg}")
-                    errors.append(error_msg)
-                    # Add exercise with null solutions
-                    intermediate_data['exercises'].append(
-                        self._create_empty_exercise(exercise_data, input_data['metadata']['output_settings'])
-                    )
-            
-            # Update processing info
-            processing_time = time.time() - start_time
-            intermediate_data['metadata']['processing_info']['processing_time'] = f"{processing_time:.2f}s"
-            intermediate_data['metadata']['processing_info']['errors'] = errors
-            intermediate_data['metadata']['file_info']['processed_date'] = datetime.now().strftime('%Y-%m-%d')
-            
-            # Calculate exercise statistics
-            self._update_exercise_statistics(intermediate_data)
+            intermediate_path, tex_path = self._write_outputs(intermediate_data)
+        self._collect_spans(recorder.spans)
+        
+        processing_time = time.time() - start_time
+        print(f"\nIntermediate {self.intermediate_format.label} saved: {intermediate_path}")
+        print(f"\nProcessing completed in {processing_time:.2f} seconds")
+        if self.solution_cache and self.workers == 1 and self.solution_cache.lookups:
+            print(f"Solution cache: {self.solution_cache.summary()}")
+        if self.workers == 1 and self._integral_solver and self._integral_solver.memo.lookups:
+            print(f"Antiderivative memo: {self.integral_solver.memo.summary()}")
+        if self.result_store and self.workers == 1:
+            print(f"Result store: {self.result_store.summary()}")
+        if errors:
+            print(f"Encountered {len(errors)} errors during processing")
+    
+    def stream_assignment(self, input_path: str) -> None:
+        """Process an assignment with constant memory.
+        
+        Exercises are read from the input one at a time, solved, appended to
+        the intermediate JSON and dropped; the LaTeX document is then written
+        while streaming them back from the intermediate JSON.
+        """
+        print(f"Processing (streaming): {input_path}")
+        start_time = time.time()
+        recorder = SpanRecorder()
+        with recording(recorder), span('assignment', source=Path(input_path).name):
+            self._stream_assignment(input_path, start_time)
+        self._collect_spans(recorder.spans)
+    
+    def _stream_assignment(self, input_path: str, start_time: float) -> None:
+        reader = JSONObjectStream(input_path)
+        metadata = reader.read_members('exercises')['metadata']
+        global_settings = metadata['output_settings']
+        
+        intermediate_data = self._create_intermediate_structure({'metadata': metadata, 'exercises': []}, input_path)
+        intermediate_path, tex_path = self._output_paths(metadata)
+        content_hash = assignment_content_hash(metadata)
+        # One short digest per exercise, so a later incremental build can diff against this run
+        exercise_hashes = []
+        
+        def hashed_exercises():
+            for exercise_data in reader.iter_array('exercises'):
+                content_hash.update(exercise_data)
+                exercise_hashes.append(self._exercise_hash(exercise_data, global_settings))
+                yield exercise_data
+        
+        writer = self.intermediate_format.writer(intermediate_path)
+        errors = []
+        id_counts = {}
+        stage_totals = {}
+        
+        # Results are recorded in batches; the first one replaces the assignment's previous rows
+        batch = []
+        recorded_batches = 0
+        try:
+            for processed_exercise, error in self._iter_processed_exercises(hashed_exercises(), global_settings):
+                writer.add_exercise(processed_exercise)
+                batch.append(processed_exercise)
+                if len(batch) == self.STORE_BATCH_SIZE:
+                    self._record_results(intermediate_data['metadata'], batch, writer.count - len(batch),
+                                         replace=not recorded_batches)
+                    batch = []
+                    recorded_batches += 1
+                self._count_exercise_id(id_counts, processed_exercise)
+                self._add_stage_timings(stage_totals, processed_exercise)
+                if error:
+                    errors.append(error)
+            self._record_results(intermediate_data['metadata'], batch, writer.count - len(batch),
+                                 replace=not recorded_batches)
             
-            # Save intermediate JSON
-            intermediate_filename = self.file_handler.generate_filename(
+            self._finalize_intermediate(intermediate_data, [], errors, start_time, id_counts, stage_totals)
+            processing_info = intermediate_data['metadata']['processing_info']
+            processing_info['total_exercises'] = writer.count
+            intermediate_data['metadata']['file_info']['build'] = self._build_stamp(content_hash.hexdigest())
+            intermediate_data['metadata']['file_info']['exercise_hashes'] = exercise_hashes
+            with span('write_json'):
+                writer.close(intermediate_data['metadata'])
+        except BaseException:
+            writer.discard()
+            raise
+        print(f"\nIntermediate {self.intermediate_format.label} saved: {intermediate_path}")
+        
+        with span('latex_document'):
+            self.latex_generator.generate_latex_streaming(
                 intermediate_data['metadata'],
-                'json'
+                self.intermediate_format.iter_exercises(intermediate_path),
+                tex_path
             )
-            intermediate_path = f"data/temp/{intermediate_filename}"
-            self.file_handler.save_json(intermediate_data, intermediate_path)
-            print(f"\nIntermediate JSON saved: {intermediate_path}")
+        with span('pdflatex'):
+            self.latex_generator.compile_pdf(tex_path, timeout=self.pdf_timeout)
+        
+        processing_time = time.time() - start_time
+        print(f"\nProcessing completed in {processing_time:.2f} seconds")
+        if errors:
+            print(f"Encountered {len(errors)} errors during processing")
+    
+    def solve_assignment(self, input_data: Dict[str, Any], input_path: str = 'assignment.json',
+                         previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Solve every exercise of an assignment and return the intermediate JSON without writing files.
+        
+        When the intermediate JSON of a previous run is given, exercises whose
+        content hash is unchanged are carried over from it instead of re-solved.
+        """
+        start_time = time.time()
+        
+        # Check if it's already an intermediate JSON
+        if self.file_handler.is_intermediate_json(input_data):
+            print("Warning: Input appears to be an intermediate JSON")
+        
+        # Create intermediate JSON structure
+        intermediate_data = self._create_intermediate_structure(input_data, input_path)
+        exercises = input_data['exercises']
+        global_settings = input_data['metadata']['output_settings']
+        
+        # Diff against the previous run by per-exercise content hash
+        hashes = [self._exercise_hash(exercise_data, global_settings) for exercise_data in exercises]
+        reusable = self._reusable_exercises(previous) if previous else {}
+        processed_exercises = [reusable.get(exercise_hash) for exercise_hash in hashes]
+        errors = [None if processed is None else self._budget_error_message(processed)
+                  for processed in processed_exercises]
+        
+        changed = [i for i, processed in enumerate(processed_exercises) if processed is None]
+        if previous:
+            print(f"  Reusing {len(exercises) - len(changed)} unchanged exercises, solving {len(changed)}")
+        
+        # Process each added or changed exercise
+        solved = self._iter_planned_exercises([exercises[i] for i in changed], global_settings)
+        for i, (processed_exercise, error) in zip(changed, solved):
+            processed_exercises[i] = processed_exercise
+            errors[i] = error
+        
+        intermediate_data['metadata']['file_info']['exercise_hashes'] = hashes
+        intermediate_data['metadata']['processing_info']['reused_exercises'] = len(exercises) - len(changed)
+        self._record_results(intermediate_data['metadata'], processed_exercises)
+        
+        # Stage timings cover only the exercises solved in this run
+        stage_totals = {}
+        for i in changed:
+            self._add_stage_timings(stage_totals, processed_exercises[i])
+        self._finalize_intermediate(intermediate_data, processed_exercises,
+                                    [error for error in errors if error], start_time, stage_totals=stage_totals)
+        return intermediate_data
+    
+    def _exercise_hash(self, exercise_data: Dict[str, Any], global_settings: Dict[str, Any]) -> str:
+        """Hash of everything one processed exercise depends on"""
+        return self._hash_json({
+            'exercise': exercise_data,
+            'output_settings': global_settings,
+            'solver_version': SOLVER_VERSION,
+            'settings_hash': self._settings_hash()
+        })
+    
+    def _solution_hash(self, exercise_data: Dict[str, Any]) -> Optional[str]:
+        """Canonical hash of what an exercise's solution depends on: integrand, limits, solver version and settings.
+        
+        None for malformed exercises (missing keys, non-string expressions), which are never stored.
+        """
+        try:
+            integrals = sorted(exercise_data['integrals'], key=lambda integral: integral['order'])
+            function = ''.join(exercise_data['function'].split())
+            integrals = [
+                [integral['var'], ''.join(integral['limits']['lower'].split()), ''.join(integral['limits']['upper'].split())]
+                for integral in integrals
+            ]
+        except (KeyError, TypeError, AttributeError):
+            return None
+        return self._hash_json({
+            'function': function,
+            'integrals': integrals,
+            'solver_version': SOLVER_VERSION,
+            # Options that change how an integral is solved (not how it is typeset)
+            'settings': {key: value for key, value in self.options.items()
+                         if key not in ('use_cache', 'trace', 'result_store', 'latex_renderer')}
+        })
+    
+    def _record_results(self, metadata: Dict[str, Any], processed_exercises: List[Dict[str, Any]],
+                        first_position: int = 0, replace: bool = True) -> None:
+        """Record processed exercises in the result store, by position in the assignment"""
+        if self.result_store is None:
+            return
+        recorded = []
+        for offset, processed in enumerate(processed_exercises):
+            # Failed exercises are not recorded, and malformed ones cannot be hashed
+            if (processed.get('computation_details') or {}).get('integration_method') is None:
+                continue
+            exercise_hash = self._solution_hash(processed)
+            if exercise_hash is not None:
+                recorded.append((first_position + offset, exercise_hash, processed))
+        self.result_store.record(metadata, recorded, replace=replace)
+    
+    def _load_previous_intermediate(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Intermediate JSON written by the last run for this assignment, if any"""
+        intermediate_path, _ = self._output_paths(input_data['metadata'])
+        if not Path(intermediate_path).exists():
+            return None
+        try:
+            return self.intermediate_format.load(intermediate_path)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    @staticmethod
+    def _reusable_exercises(previous: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Map exercise hash -> processed exercise for the successful results of a previous run"""
+        hashes = previous.get('metadata', {}).get('file_info', {}).get('exercise_hashes') or []
+        exercises = previous.get('exercises', [])
+        if len(hashes) != len(exercises):
+            return {}
+        
+        reusable = {}
+        for exercise_hash, processed in zip(hashes, exercises):
+            # Same rule as ResultStore.get_solution: failed solves and budget
+            # fallbacks without an exact result are retried
+            method = (processed.get('computation_details') or {}).get('integration_method')
+            solution = processed.get('solution') or {}
+            if solution.get('exact') is None and not (method == 'numeric' and solution.get('decimal') is not None):
+                continue
+            reusable.setdefault(exercise_hash, processed)
+        return reusable
+    
+    async def process_assignment_async(self, input_path: str,
+                                       progress: Optional[ProgressCallback] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Async counterpart of process_assignment.
+        
+        Yields each processed exercise dict as soon as it is solved (completion
+        order; use 'id'/'id_letter' to place it), then writes the intermediate
+        JSON, the .tex and the PDF exactly like the synchronous path. Solving
+        and file I/O run in an executor, so the event loop is never blocked.
+        Progress is reported through progress(completed, total, message)
+        instead of being printed.
+        """
+        # Imported here: asyncio adds noticeably to CLI startup and only async callers need it
+        import asyncio
+        loop = asyncio.get_running_loop()
+        report = progress or (lambda completed, total, message: None)
+        start_time = time.time()
+        
+        input_data = await loop.run_in_executor(None, self.file_handler.load_json, input_path)
+        intermediate_data = self._create_intermediate_structure(input_data, input_path)
+        exercises = input_data['exercises']
+        total = len(exercises)
+        
+        processed: List[Optional[Dict[str, Any]]] = [None] * total
+        errors: List[Optional[str]] = [None] * total
+        completed = 0
+        async for index, processed_exercise, error in self._solve_exercises_async(
+                exercises, input_data['metadata']['output_settings']):
+            processed[index] = processed_exercise
+            errors[index] = error
+            completed += 1
+            label = f"{processed_exercise['id']}{processed_exercise.get('id_letter') or ''}"
+            report(completed, total, error or f"Exercise {label} solved")
+            yield processed_exercise
+        
+        await loop.run_in_executor(self._get_async_executor(), self._record_results,
+                                   intermediate_data['metadata'], processed)
+        
+        # Errors are listed in input order, as in the synchronous path
+        self._finalize_intermediate(intermediate_data, processed,
+                                    [error for error in errors if error], start_time)
+        # Messages of the shared output helpers go to the callback, never to stdout
+        log = lambda message: report(total, total, message.strip())
+        intermediate_path, tex_path = await loop.run_in_executor(None, self._write_outputs, intermediate_data, log)
+        report(total, total, f"Intermediate {self.intermediate_format.label} saved: {intermediate_path}")
+        report(total, total, f"LaTeX written: {tex_path}")
+    
+    async def _solve_exercises_async(self, exercises: List[Dict[str, Any]],
+                                     global_settings: Dict[str, Any]) -> AsyncIterator[Tuple[int, Dict[str, Any], Optional[str]]]:
+        """Solve exercises in an executor and yield (index, exercise, error) as each one finishes"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if self.workers > 1:
+            executor, process = self._get_executor(), _process_exercise_in_worker
+        else:
+            executor, process = self._get_async_executor(), self._process_exercise
+        
+        async def solve_one(index: int, exercise_data: Dict[str, Any]):
+            try:
+                processed_exercise = await loop.run_in_executor(executor, process, exercise_data, global_settings)
+            except Exception as e:
+                error_msg = f"Error in exercise {exercise_data.get('id', 'unknown')}: {str(e)}"
+                return index, self._create_empty_exercise(exercise_data, global_settings), error_msg
+            self._collect_spans(processed_exercise.pop('_spans', None))
+            return index, processed_exercise, self._budget_error_message(processed_exercise)
+        
+        # Tasks are created in input order so the executor receives exercises in that order
+        tasks = [asyncio.ensure_future(solve_one(i, data)) for i, data in enumerate(exercises)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _finalize_intermediate(self, intermediate_data: Dict[str, Any], processed_exercises: List[Dict[str, Any]],
+                               errors: List[str], start_time: float,
+                               id_counts: Optional[Dict[str, int]] = None,
+                               stage_totals: Optional[Dict[str, float]] = None) -> None:
+        """Attach processed exercises and fill in processing info and statistics"""
+        intermediate_data['exercises'].extend(processed_exercises)
+        
+        if stage_totals is None:
+            stage_totals = {}
+            for processed_exercise in processed_exercises:
+                self._add_stage_timings(stage_totals, processed_exercise)
+        
+        # Update processing info
+        processing_time = time.time() - start_time
+        intermediate_data['metadata']['processing_info']['processing_time'] = f"{processing_time:.2f}s"
+        intermediate_data['metadata']['processing_info']['timings'] = {
+            'solve': round(processing_time * 1000, 3),
+            'exercises': {stage: round(total, 3) for stage, total in stage_totals.items()}
+        }
+        intermediate_data['metadata']['processing_info']['errors'] = errors
+        intermediate_data['metadata']['file_info']['processed_date'] = datetime.now().strftime('%Y-%m-%d')
+        
+        # Calculate exercise statistics
+        self._update_exercise_statistics(intermediate_data, id_counts)
+    
+    @staticmethod
+    def _add_stage_timings(stage_totals: Dict[str, float], processed_exercise: Dict[str, Any]) -> None:
+        """Add one exercise's per-stage milliseconds to the assignment totals"""
+        timings = (processed_exercise.get('computation_details') or {}).get('timings') or {}
+        for stage, milliseconds in timings.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + milliseconds
+    
+    def _collect_spans(self, spans: Optional[List[Dict[str, Any]]]) -> None:
+        """Hand recorded spans to the trace, when one is being collected"""
+        if self.trace is not None and spans:
+            self.trace.add(spans)
+    
+    def write_trace(self, path: str) -> None:
+        """Write the collected spans as Chrome/Perfetto trace-event JSON"""
+        if self.trace is None:
+            return
+        self.trace.write(path)
+        print(f"Trace written: {path} ({len(self.trace)} spans)")
+    
+    def _write_outputs(self, intermediate_data: Dict[str, Any],
+                       log: Callable[[str], None] = print) -> Tuple[str, str]:
+        """Save the intermediate file, generate the .tex and try to compile the PDF, reporting through log"""
+        intermediate_path, tex_path = self._output_paths(intermediate_data['metadata'])
+        with span('write_json'):
+            self.intermediate_format.save(intermediate_data, intermediate_path)
+        
+        # Generate LaTeX
+        with span('latex_document'):
+            self.latex_generator.generate_latex(intermediate_data, tex_path, log=log)
+        
+        # Try to compile PDF, in the background when a compile pool is active
+        if self._pdf_compiler is not None:
+            self._pdf_compiler.submit(tex_path)
+            log(f"  PDF compilation queued: {tex_path}")
+        else:
+            with span('pdflatex'):
+                self.latex_generator.compile_pdf(tex_path, timeout=self.pdf_timeout, log=log)
+        return intermediate_path, tex_path
+    
+    def warm_up(self) -> None:
+        """Create the solver and load SymPy's integration machinery ahead of the first request"""
+        import sympy as sp
+        
+        self.integral_solver
+        x = sp.Symbol('x')
+        sp.simplify(sp.integrate(x * sp.sin(x), x))
+    
+    def build(self, sources: List[str], force: bool = False) -> Dict[str, int]:
+        """Process every assignment found in files, directories or globs, skipping up-to-date ones"""
+        from generators.pdf_compiler import PDFCompiler
+        
+        summary = {'built': 0, 'up_to_date': 0, 'failed': 0, 'pdf_failed': 0}
+        
+        # PDFs compile concurrently while the next assignments are solved
+        self._pdf_compiler = PDFCompiler(max_jobs=self.pdf_jobs, timeout=self.pdf_timeout)
+        try:
+            self._build_assignments(sources, force, summary)
+            reports = self._pdf_compiler.wait()
+        finally:
+            self._pdf_compiler.close()
+            self._pdf_compiler = None
+        
+        if reports:
+            print("\nPDF compilation:")
+        for report in reports:
+            print(f"  {report.describe()}")
+            if self.trace is not None and report.started is not None:
+                self.trace.add_span('pdflatex', report.started, report.elapsed, 'pdflatex jobs',
+                                    tex=report.tex_path, status=report.status, runs=report.runs)
+            if not report.ok and report.status != 'unavailable':
+                summary['pdf_failed'] += 1
+        
+        print(f"\nBuild finished: {summary['built']} built, {summary['up_to_date']} up to date, "
+              f"{summary['failed']} failed, {summary['pdf_failed']} PDF failures")
+        return summary
+    
+    def _build_assignments(self, sources: List[str], force: bool, summary: Dict[str, int]) -> None:
+        targets = {}
+        for input_path in self._expand_build_sources(sources):
+            try:
+                input_data = self.file_handler.load_json(input_path)
+                intermediate_path, _ = self._output_paths(input_data['metadata'])
+            except Exception as e:
+                print(f"Skipping {input_path}: {e}")
+                summary['failed'] += 1
+                continue
             
-            # Generate LaTeX
-            tex_filename = self.file_handler.generate_filename(
-                intermediate_data['metadata'],
-                'tex'
-            )
-            tex_path = f"data/output/{tex_filename}"
-            self.latex_generator.generate_latex(intermediate_data, tex_path)
+            # Two inputs writing the same outputs would rebuild each other forever
+            if intermediate_path in targets:
+                print(f"Skipping {input_path}: same outputs as {targets[intermediate_path]}")
+                continue
+            targets[intermediate_path] = input_path
             
-            # Try to compile PDF
-            self.latex_generator.compile_pdf(tex_path)
+            if not force and self._is_up_to_date(input_data):
+                print(f"Up to date: {input_path}")
+                summary['up_to_date'] += 1
+                continue
+            
+            try:
+                self._run_assignment(input_path, input_data)
+                summary['built'] += 1
+            except Exception as e:
+                print(f"Error building {input_path}: {e}")
+                summary['failed'] += 1
+    
+    @staticmethod
+    def _expand_build_sources(sources: List[str]) -> List[str]:
+        """Resolve directories and glob patterns into a sorted list of JSON files"""
+        paths = []
+        for source in sources:
+            if Path(source).is_dir():
+                paths.extend(str(p) for p in Path(source).glob('*.json'))
+            elif any(ch in source for ch in '*?['):
+                paths.extend(glob.glob(source, recursive=True))
+            else:
+                paths.append(source)
+        
+        # Keep the first occurrence of each file, in a stable order
+        return sorted(dict.fromkeys(paths))
+    
+    def _output_paths(self, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Paths of the intermediate file and the .tex file for an assignment"""
+        intermediate_path = f"data/temp/{self.file_handler.generate_filename(metadata, self.intermediate_format.extension)}"
+        tex_path = f"data/output/{self.file_handler.generate_filename(metadata, 'tex')}"
+        return intermediate_path, tex_path
+    
+    def _build_stamp(self, input_hash: str) -> Dict[str, str]:
+        """Fingerprint of everything that determines an assignment's outputs"""
+        return {
+            'input_hash': input_hash,
+            'solver_version': SOLVER_VERSION,
+            'settings_hash': self._settings_hash()
+        }
+    
+    def _settings_hash(self) -> str:
+        """Hash of the options that can change solver output"""
+        settings = {key: value for key, value in self.options.items()
+                    if key not in ('use_cache', 'trace', 'result_store')}
+        return self._hash_json(settings)
+    
+    @staticmethod
+    def _input_hash(input_data: Dict[str, Any]) -> str:
+        """Content hash of an assignment; streaming mode computes the same value incrementally"""
+        return assignment_content_hash(input_data['metadata'], input_data['exercises']).hexdigest()
+    
+    @staticmethod
+    def _hash_json(data: Any) -> str:
+        canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _is_up_to_date(self, input_data: Dict[str, Any]) -> bool:
+        """Check that the intermediate JSON was built from this input and settings and outputs exist"""
+        intermediate_path, tex_path = self._output_paths(input_data['metadata'])
+        if not Path(intermediate_path).exists() or not Path(tex_path).exists():
+            return False
+        
+        # The PDF is only expected when LaTeX is installed
+        pdf_path = tex_path.replace('.tex', '.pdf')
+        if shutil.which('pdflatex') and not Path(pdf_path).exists():
+            return False
+        
+        try:
+            previous_metadata = self.intermediate_format.load_metadata(intermediate_path)
+        except (FileNotFoundError, ValueError):
+            return False
+        
+        previous_stamp = previous_metadata.get('file_info', {}).get('build')
+        return previous_stamp == self._build_stamp(self._input_hash(input_data))
+    
+    def close(self) -> None:
+        """Shut down the worker pools, if they were started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._async_executor is not None:
+            self._async_executor.shutdown()
+            self._async_executor = None
+        if self.result_store is not None:
+            self.result_store.close()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use and keep it for later assignments"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.options,)
+            )
+        return self._executor
+    
+    def _get_async_executor(self) -> Executor:
+        """Single solver thread for the async API, sharing this process's solver and caches"""
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='solver')
+        return self._async_executor
+    
+    def _iter_processed_exercises(self, exercises: Iterable[Dict[str, Any]], global_settings: Dict[str, Any],
+                                  total: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """Process exercises in input order, yielding (processed exercise, error message or None)"""
+        executor = self._get_executor() if self.workers > 1 else None
+        
+        # Only a bounded number of exercises is in flight, so a lazily read
+        # input is never fully materialized
+        in_flight = 4 * self.workers if executor else 1
+        source = iter(exercises)
+        pending = deque()
+        done = 0
+        
+        while True:
+            while len(pending) < in_flight:
+                exercise_data = next(source, None)
+                if exercise_data is None:
+                    break
+                future = None
+                if executor is not None:
+                    future = executor.submit(_process_exercise_in_worker, exercise_data, global_settings)
+                pending.append((exercise_data, future))
+            if not pending:
+                return
             
-            print(f"\nProcessing completed in {processing_time:.2f} seconds")
-            if errors:
-                print(f"Encountered {len(errors)} errors during processing")
+            exercise_data, future = pending.popleft()
+            done += 1
+            try:
+                print(f"  Processing exercise {done}/{total}..." if total else f"  Processing exercise {done}...")
+                if future is not None:
+                    processed_exercise = future.result()
+                else:
+                    processed_exercise = self._process_exercise(exercise_data, global_settings)
+                self._collect_spans(processed_exercise.pop('_spans', None))
+                
+                error = self._budget_error_message(processed_exercise)
+                if error:
+                    print(f"    {error}")
+            except Exception as e:
+                error = f"Error in exercise {exercise_data.get('id', 'unknown')}: {str(e)}"
+                print(f"    {error}")
+                # Add exercise with null solutions
+                processed_exercise = self._create_empty_exercise(exercise_data, global_settings)
             
+            yield processed_exercise, error
+    
+    def _stored_solution(self, exercise_data: Dict[str, Any]) -> Optional[Tuple[Optional[str], Optional[float], str]]:
+        """(exact, decimal, method) from the result store; bypassed with the solution cache"""
+        if self.result_store is None or not self.options['use_cache']:
+            return None
+        exercise_hash = self._solution_hash(exercise_data)
+        if exercise_hash is None:
+            return None
+        with span('store_lookup'):
+            return self.result_store.get_solution(exercise_hash)
+    
+    def _iter_planned_exercises(self, exercises: List[Dict[str, Any]],
+                                global_settings: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """Like _iter_processed_exercises, but each distinct integral is solved only once.
+        
+        Exercises equal to an earlier one up to variable names and a constant
+        factor take its solution, scaled; results are yielded in input order.
+        """
+        plan = self.integral_planner.plan(exercises) if self.deduplicate and len(exercises) > 1 else None
+        if not plan or len(plan) == len(exercises):
+            yield from self._iter_processed_exercises(exercises, global_settings, len(exercises))
+            return
+        
+        print(f"  {len(exercises)} exercises share {len(plan)} distinct integrals")
+        results: List[Optional[Tuple[Dict[str, Any], Optional[str]]]] = [None] * len(exercises)
+        solved = self._iter_processed_exercises(
+            (exercises[entry.representative] for entry in plan), global_settings, len(plan)
+        )
+        for entry, outcome in zip(plan, solved):
+            results[entry.representative] = outcome
+            for index, factor in entry.duplicates:
+                results[index] = self._process_duplicate(exercises[index], outcome[0], factor, global_settings)
+        yield from results
+    
+    def _process_duplicate(self, exercise_data: Dict[str, Any], representative: Dict[str, Any], factor: Any,
+                           global_settings: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Process an exercise with the representative's solution scaled by factor"""
+        solution = representative.get('solution') or {}
+        method = (representative.get('computation_details') or {}).get('integration_method')
+        try:
+            # A representative that failed outright gives nothing to reuse; solve this one itself
+            scaled = None
+            if method is not None:
+                scaled = self.integral_planner.scale((solution.get('exact'), solution.get('decimal'), method), factor)
+            processed_exercise = self._process_exercise(exercise_data, global_settings, scaled)
+            self._collect_spans(processed_exercise.pop('_spans', None))
+            error = self._budget_error_message(processed_exercise)
+            if error:
+                print(f"    {error}")
         except Exception as e:
-            print(f"Fatal error: {e}")
-            sys.exit(1)
+            error = f"Error in exercise {exercise_data.get('id', 'unknown')}: {str(e)}"
+            print(f"    {error}")
+            processed_exercise = self._create_empty_exercise(exercise_data, global_settings)
+        return processed_exercise, error
+    
+    def _solve_exercise(self, exercise: Exercise) -> Tuple[Optional[str], Optional[float], str]:
+        """Solve one exercise, enforcing the configured time and memory budget"""
+        if self.integration_method == 'numeric' or (self.time_limit is None and self.memory_limit is None):
+            # No budget to enforce (numeric cubature is bounded by construction)
+            return self.integral_solver.solve(exercise)
+        
+        cached = self.integral_solver.cached_solution(exercise)
+        if cached is not None:
+            return cached
+        
+        outcome = run_with_budget(
+            self.integral_solver.solve_symbolic,
+            (exercise,),
+            time_limit=self.time_limit,
+            memory_limit_mb=self.memory_limit
+        )
+        if outcome.ok:
+            exact_solution, decimal_solution, method = outcome.value
+            self.integral_solver.store_solution(exercise, exact_solution, decimal_solution, method)
+            return exact_solution, decimal_solution, method
+        
+        # Budget exceeded: fall back to a numeric approximation under its own time
+        # limit; cubature memory is bounded by construction, but NumPy itself may
+        # not load within a memory limit sized for the symbolic solve
+        fallback = run_with_budget(
+            self.integral_solver.solve_numeric,
+            (exercise,),
+            time_limit=self.fallback_time_limit
+        )
+        decimal_solution = fallback.value if fallback.ok else None
+        return None, decimal_solution, f"numeric_fallback:{outcome.status}"
+    
+    def _budget_error_message(self, processed_exercise: Dict[str, Any]) -> Optional[str]:
+        """Describe a budget violation recorded in computation_details, if any"""
+        method = (processed_exercise.get('computation_details') or {}).get('integration_method') or ''
+        if not method.startswith('numeric_fallback:'):
+            return None
+        
+        reason = method.split(':', 1)[1]
+        if reason == 'timeout':
+            detail = f"time limit of {self.time_limit:g}s exceeded"
+        elif reason == 'memory':
+            detail = f"memory limit of {self.memory_limit:g} MB exceeded"
+        else:
+            detail = "symbolic solve failed in isolated worker"
+        
+        return f"Budget in exercise {processed_exercise.get('id', 'unknown')}: {detail}, numeric fallback used"
     
     def _create_intermediate_structure(self, input_data: Dict[str, Any], input_path: str) -> Dict[str, Any]:
         """Create the intermediate JSON structure"""
@@ -105,7 +840,8 @@ class MathSolverOrchestrator:
             'source_file': Path(input_path).name,
             'generated_date': datetime.now().strftime('%Y-%m-%d'),
             'processed_date': None,
-            'version': '1.0'
+            'version': '1.0',
+            'build': self._build_stamp(self._input_hash(input_data))
         }
         
         # Add processing_info
@@ -113,6 +849,7 @@ class MathSolverOrchestrator:
             'total_exercises': len(input_data['exercises']),
             'individual_exercises': 0,
             'grouped_exercises': 0,
+            'reused_exercises': 0,
             'exercise_types': ['integral'],
             'processing_time': None,
             'errors': []
@@ -123,61 +860,101 @@ class MathSolverOrchestrator:
             'exercises': []
         }
     
-    def _process_exercise(self, exercise_data: Dict[str, Any], global_settings: Dict[str, Any]) -> Dict[str, Any]:
-            """Process a single exercise"""
-            # Create Exercise object
-            exercise = Exercise.from_dict(exercise_data)
-            
-            # Detect coordinate system
-            variables = [integral.var for integral in exercise.integrals]
-            exercise.coordinate_system = self.integral_solver.detect_coordinate_system(variables)
+    def _process_exercise(self, exercise_data: Dict[str, Any], global_settings: Dict[str, Any],
+                          solution: Optional[Tuple[Optional[str], Optional[float], str]] = None) -> Dict[str, Any]:
+            """Process a single exercise, recording the time spent in each stage.
             
-            # Solve integral
-            exact_solution, decimal_solution = self.integral_solver.solve_integral(exercise)
+            solution, when given, is the already known (exact, decimal, method)
+            of the integral, e.g. scaled from an identical exercise.
+            """
+            recorder = SpanRecorder()
+            label = f"{exercise_data.get('id')}{exercise_data.get('id_letter') or ''}"
+            if exercise_data.get('id_part'):
+                label += f".{exercise_data['id_part']}"
             
-            # Get base unit from global settings
-            base_unit = global_settings.get('units', 'u')
+            with recording(recorder), span('exercise', exercise=label):
+                # Create Exercise object
+                exercise = Exercise.from_dict(exercise_data)
+                
+                # Detect coordinate system
+                variables = [integral.var for integral in exercise.integrals]
+                exercise.coordinate_system = self.integral_solver.detect_coordinate_system(variables)
+                
+                # Solve integral, unless the result store already holds this exercise's solution
+                with span('solve'):
+                    stored = solution if solution is not None else self._stored_solution(exercise_data)
+                    if stored is not None:
+                        exact_solution, decimal_solution, integration_method = stored
+                    else:
+                        exact_solution, decimal_solution, integration_method = self._solve_exercise(exercise)
+                
+                # Get base unit from global settings
+                base_unit = global_settings.get('units', 'u')
+                
+                # Get both quantity type and units
+                with span('quantity'):
+                    quantity_type, units = self.integral_solver.get_quantity_and_units(exercise, base_unit)
+                
+                # Create solution object
+                exercise.solution = Solution(
+                    exact=exact_solution,
+                    decimal=decimal_solution,
+                    quantity_type=quantity_type,
+                    units=units  # Ahora se llena correctamente
+                )
+                
+                # Generate LaTeX
+                with span('latex'):
+                    exercise.latex = self._render_exercise_latex(exercise)
+                
+                # Copy display settings
+                exercise.display_settings = self.file_handler.copy_display_settings(
+                    global_settings,
+                    exercise_data
+                )
             
-            # Get both quantity type and units
-            quantity_type, units = self.integral_solver.get_quantity_and_units(exercise, base_unit)
-            
-            # Create solution object
-            from models.exercise import Solution, LaTeXContent, ComputationDetails
-            
-            exercise.solution = Solution(
-                exact=exact_solution,
-                decimal=decimal_solution,
-                quantity_type=quantity_type,
-                units=units  # Ahora se llena correctamente
-            )
-            
-            # Generate LaTeX
-            exercise.latex = LaTeXContent(
-                integral_setup=self.integral_solver.generate_latex_integral(exercise),
-                solution_steps=None,  # TODO: Implement step-by-step solution
-                final_result=None
-            )
-            
-            # Add computation details (placeholder)
+            # Add computation details, with milliseconds per stage
             exercise.computation_details = ComputationDetails(
                 intermediate_steps=None,
                 substitutions=None,
-                integration_method="symbolic"
+                integration_method=integration_method,
+                timings=recorder.timings()
             )
             
-            # Copy display settings
-            exercise.display_settings = self.file_handler.copy_display_settings(
-                global_settings,
-                exercise_data
-            )
+            result = exercise.to_dict()
+            if self.options['trace']:
+                # Handed to the trace by the process that collects results
+                result['_spans'] = recorder.spans
+            return result
+    
+    def _render_exercise_latex(self, exercise: Exercise) -> LaTeXContent:
+            """LaTeX of the integral setup, from the SymPy trees when that renderer is selected"""
+            if self.latex_renderer == 'sympy':
+                try:
+                    integral_setup, final_result = self.integral_solver.render_latex_from_trees(exercise)
+                    return LaTeXContent(
+                        integral_setup=integral_setup,
+                        solution_steps=None,
+                        final_result=final_result,
+                        renderer='sympy'
+                    )
+                except ValueError:
+                    # Unparseable input: fall back to the string-based setup
+                    pass
             
-            return exercise.to_dict()
+            return LaTeXContent(
+                integral_setup=self.integral_solver.generate_latex_integral(exercise),
+                solution_steps=None,  # TODO: Implement step-by-step solution
+                final_result=None
+            )
     
     def _create_empty_exercise(self, exercise_data: Dict[str, Any], global_settings: Dict[str, Any]) -> Dict[str, Any]:
             """Create exercise with null solutions for failed processing"""
             result = exercise_data.copy()
             
-            # Add null fields
+            # Add null fields; id_letter and id_part are optional in the input
+            result.setdefault('id_letter', None)
+            result.setdefault('id_part', None)
             result['coordinate_system'] = None
             result['solution'] = {
                 'exact': None,
@@ -193,7 +970,8 @@ class MathSolverOrchestrator:
             result['computation_details'] = {
                 'intermediate_steps': None,
                 'substitutions': None,
-                'integration_method': None
+                'integration_method': None,
+                'timings': None
             }
             result['display_settings'] = self.file_handler.copy_display_settings(
                 global_settings,
@@ -202,23 +980,39 @@ class MathSolverOrchestrator:
             
             return result
     
-    def _update_exercise_statistics(self, data: Dict[str, Any]) -> None:
+    def _update_exercise_statistics(self, data: Dict[str, Any], id_counts: Optional[Dict[str, int]] = None) -> None:
         """Update exercise statistics in processing_info"""
-        exercises = data['exercises']
-        
         # Count individual vs grouped
-        id_counts = {}
-        for ex in exercises:
-            base_id = ex['id']
-            if ex['id_letter']:
-                base_id += ex['id_letter']
-            id_counts[base_id] = id_counts.get(base_id, 0) + 1
+        if id_counts is None:
+            id_counts = {}
+            for ex in data['exercises']:
+                self._count_exercise_id(id_counts, ex)
         
         individual = sum(1 for count in id_counts.values() if count == 1)
         grouped = sum(1 for count in id_counts.values() if count > 1)
         
         data['metadata']['processing_info']['individual_exercises'] = individual
         data['metadata']['processing_info']['grouped_exercises'] = grouped
+    
+    @staticmethod
+    def _count_exercise_id(id_counts: Dict[str, int], exercise: Dict[str, Any]) -> None:
+        base_id = exercise['id']
+        if exercise['id_letter']:
+            base_id += exercise['id_letter']
+        id_counts[base_id] = id_counts.get(base_id, 0) + 1
+
+# Orchestrator owned by each pool worker process
+_worker_orchestrator = None
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """Preload SymPy's integration machinery once per worker process"""
+    global _worker_orchestrator
+    _worker_orchestrator = MathSolverOrchestrator(**options)
+    _worker_orchestrator.warm_up()
+
+def _process_exercise_in_worker(exercise_data: Dict[str, Any], global_settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Process one exercise inside a pool worker"""
+    return _worker_orchestrator._process_exercise(exercise_data, global_settings)
 
 def main():
     """Main entry point"""
@@ -227,20 +1021,212 @@ def main():
     )
     parser.add_argument(
         '--input',
-        required=True,
         help='Path to input JSON file'
     )
+    parser.add_argument(
+        '--build',
+        nargs='+',
+        metavar='SOURCE',
+        help='Build every assignment in the given files, directories or globs, skipping up-to-date ones'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='With --build, rebuild assignments even when they are up to date'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a warm solver daemon answering HTTP requests (POST /solve, GET /health)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Localhost TCP port for --serve (default: 8765)'
+    )
+    parser.add_argument(
+        '--socket',
+        help='Serve on this Unix socket path instead of a TCP port'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Read, solve and write exercises one at a time with constant memory (large exercise banks)'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-solve every exercise instead of reusing unchanged ones from the previous run'
+    )
+    parser.add_argument(
+        '--pdf-jobs',
+        type=int,
+        help='Concurrent pdflatex jobs during --build (default: up to 4)'
+    )
+    parser.add_argument(
+        '--pdf-timeout',
+        type=float,
+        default=30,
+        help='Seconds allowed per pdflatex run (default: 30)'
+    )
+    parser.add_argument(
+        '--latex-renderer',
+        choices=['text', 'sympy'],
+        default='text',
+        help='Build LaTeX from the solver strings (text) or directly from the SymPy trees (default: text)'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='PATH',
+        help='Write a Chrome/Perfetto trace-event JSON with the time of every stage of every exercise'
+    )
+    parser.add_argument(
+        '--intermediate-format',
+        choices=['json', 'binary'],
+        default='json',
+        help='Write intermediate files in data/temp as pretty-printed JSON or indexed binary records '
+             '(.msr, read lazily or by index) (default: json)'
+    )
+    parser.add_argument(
+        '--convert',
+        nargs=2,
+        metavar=('SOURCE', 'TARGET'),
+        help='Convert an intermediate file between JSON (.json) and binary (.msr), following TARGET\'s extension'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the persistent solution cache'
+    )
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Solve every exercise separately, even when it repeats an earlier integral up to a constant factor'
+    )
+    parser.add_argument(
+        '--no-store',
+        action='store_true',
+        help='Do not consult or update the SQLite result store (data/results.sqlite)'
+    )
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Delete all cached solutions before processing'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes used to solve exercises (default: 1)'
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Wall-clock limit in seconds for solving each exercise'
+    )
+    parser.add_argument(
+        '--memory-limit',
+        type=float,
+        help='Memory limit in MB for solving each exercise'
+    )
+    parser.add_argument(
+        '--fallback-time-limit',
+        type=float,
+        default=30,
+        help='Wall-clock limit in seconds for the numeric fallback after a budget violation (default: 30)'
+    )
+    parser.add_argument(
+        '--numeric-only',
+        action='store_true',
+        help='Skip symbolic integration and compute only decimal solutions'
+    )
+    parser.add_argument(
+        '--simplify',
+        choices=['full', 'tiered', 'final'],
+        default='tiered',
+        help='Simplification policy between integration stages (default: tiered)'
+    )
+    parser.add_argument(
+        '--strategies',
+        help='Comma-separated integration strategies to try per stage: antiderivative, '
+             'definite, manual, risch, meijerg, heurisch (default: all, in this order)'
+    )
+    parser.add_argument(
+        '--strategy-mode',
+        choices=['sequential', 'race'],
+        default='sequential',
+        help='Try strategies in order or race them in parallel (default: sequential)'
+    )
+    parser.add_argument(
+        '--strategy-timeout',
+        type=float,
+        help='Seconds allowed per strategy (sequential) or per stage (race)'
+    )
     
     args = parser.parse_args()
     
+    if args.convert:
+        source, target = args.convert
+        try:
+            count = convert_intermediate(source, target)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Converted {count} exercises: {source} -> {target}")
+        return
+    
+    if args.clear_cache:
+        removed = SolutionCache().clear()
+        print(f"Solution cache cleared ({removed} entries removed)")
+        if not args.input and not args.build and not args.serve:
+            return
+    
+    if not args.input and not args.build and not args.serve:
+        parser.error('--input, --build or --serve is required')
+    
     # Verify input file exists
-    if not Path(args.input).exists():
+    if args.input and not Path(args.input).exists():
         print(f"Error: Input file '{args.input}' does not exist")
         sys.exit(1)
     
     # Create orchestrator and process
-    orchestrator = MathSolverOrchestrator()
-    orchestrator.process_assignment(args.input)
+    orchestrator = MathSolverOrchestrator(
+        use_cache=not args.no_cache,
+        workers=args.workers,
+        time_limit=args.time_limit,
+        memory_limit=args.memory_limit,
+        fallback_time_limit=args.fallback_time_limit,
+        integration_method='numeric' if args.numeric_only else 'symbolic',
+        simplify_policy=args.simplify,
+        strategies=args.strategies.split(',') if args.strategies else None,
+        strategy_mode=args.strategy_mode,
+        strategy_timeout=args.strategy_timeout,
+        incremental=not args.full,
+        pdf_jobs=args.pdf_jobs,
+        pdf_timeout=args.pdf_timeout,
+        latex_renderer=args.latex_renderer,
+        trace=bool(args.trace),
+        intermediate_format=args.intermediate_format,
+        result_store=None if args.no_store else ResultStore.DEFAULT_PATH,
+        deduplicate=not args.no_dedup
+    )
+    try:
+        if args.serve:
+            from server import serve
+            serve(orchestrator, port=args.port, socket_path=args.socket)
+        elif args.build:
+            summary = orchestrator.build(args.build, force=args.force)
+            if summary['failed']:
+                sys.exit(1)
+        elif args.stream:
+            orchestrator.stream_assignment(args.input)
+        else:
+            orchestrator.process_assignment(args.input)
+    finally:
+        orchestrator.close()
+        if args.trace:
+            orchestrator.write_trace(args.trace)
 
 if __name__ == '__main__':
     main()
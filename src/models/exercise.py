@@ -1,32 +1,47 @@
 #!/usr/bin/env python3
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) carry no per-instance __dict__; older
+# interpreters get regular dataclasses with the same interface
+SLOTS: Dict[str, bool] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Variable names, types and units repeat across every exercise of a bank
+_intern = sys.intern
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return _intern(value) if isinstance(value, str) else value
+
+@dataclass(**SLOTS)
 class IntegralLimit:
     """Represents integration limits"""
     lower: str
     upper: str
 
-@dataclass
+@dataclass(**SLOTS)
 class Integral:
     """Represents a single integral"""
     var: str
     limits: IntegralLimit
     order: int
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Integral':
-        return cls(
-            var=data['var'],
-            limits=IntegralLimit(
-                lower=data['limits']['lower'],
-                upper=data['limits']['upper']
-            ),
-            order=data['order']
-        )
+        limits = data['limits']
+        return cls(_intern(data['var']), IntegralLimit(limits['lower'], limits['upper']), data['order'])
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'var': self.var,
+            'limits': {
+                'lower': self.limits.lower,
+                'upper': self.limits.upper
+            },
+            'order': self.order
+        }
+
+@dataclass(**SLOTS)
 class Solution:
     """Represents exercise solution"""
     exact: Optional[str] = None
@@ -34,21 +49,76 @@ class Solution:
     quantity_type: Optional[str] = None
     units: Optional[str] = None
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Solution':
+        return cls(
+            data.get('exact'),
+            data.get('decimal'),
+            _intern_optional(data.get('quantity_type')),
+            _intern_optional(data.get('units'))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'exact': self.exact,
+            'decimal': self.decimal,
+            'quantity_type': self.quantity_type,
+            'units': self.units
+        }
+
+@dataclass(**SLOTS)
 class LaTeXContent:
     """LaTeX representations"""
     integral_setup: Optional[str] = None
     solution_steps: Optional[str] = None
     final_result: Optional[str] = None
+    renderer: Optional[str] = None      # 'sympy' when rendered from expression trees
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LaTeXContent':
+        return cls(
+            data.get('integral_setup'),
+            data.get('solution_steps'),
+            data.get('final_result'),
+            _intern_optional(data.get('renderer'))
+        )
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'integral_setup': self.integral_setup,
+            'solution_steps': self.solution_steps,
+            'final_result': self.final_result
+        }
+        if self.renderer:
+            result['renderer'] = self.renderer
+        return result
+
+@dataclass(**SLOTS)
 class ComputationDetails:
     """Computation process details"""
     intermediate_steps: Optional[List[str]] = None
     substitutions: Optional[Dict[str, str]] = None
     integration_method: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None      # milliseconds per stage
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ComputationDetails':
+        return cls(
+            data.get('intermediate_steps'),
+            data.get('substitutions'),
+            _intern_optional(data.get('integration_method')),
+            data.get('timings')
+        )
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'intermediate_steps': self.intermediate_steps,
+            'substitutions': self.substitutions,
+            'integration_method': self.integration_method,
+            'timings': self.timings
+        }
+
+@dataclass(**SLOTS)
 class Exercise:
     """Represents a complete exercise"""
     id: str
@@ -62,30 +132,37 @@ class Exercise:
     latex: Optional[LaTeXContent] = None
     computation_details: Optional[ComputationDetails] = None
     display_settings: Optional[Dict[str, Any]] = None
-    
+
+    # Parsed SymPy trees of the integrand and exact solution, kept for LaTeX rendering (never serialized)
+    function_expr: Optional[Any] = field(default=None, repr=False, compare=False)
+    exact_expr: Optional[Any] = field(default=None, repr=False, compare=False)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Exercise':
-        integrals = [Integral.from_dict(i) for i in data['integrals']]
-        
-        exercise = cls(
-            id=data['id'],
-            id_letter=data.get('id_letter'),
-            id_part=data.get('id_part'),
-            type=data['type'],
-            function=data['function'],
-            integrals=integrals
+        """Build an exercise from an input or intermediate JSON entry in one pass.
+
+        Nested values that need no conversion (display settings, timings) are
+        referenced, not copied.
+        """
+        get = data.get
+        solution = get('solution')
+        latex = get('latex')
+        computation_details = get('computation_details')
+
+        return cls(
+            data['id'],
+            get('id_letter'),
+            get('id_part'),
+            _intern(data['type']),
+            data['function'],
+            [Integral.from_dict(i) for i in data['integrals']],
+            _intern_optional(get('coordinate_system')),
+            Solution.from_dict(solution) if solution is not None else None,
+            LaTeXContent.from_dict(latex) if latex is not None else None,
+            ComputationDetails.from_dict(computation_details) if computation_details is not None else None,
+            get('display_settings')
         )
-        
-        # Load additional fields if present (for intermediate JSON)
-        if 'coordinate_system' in data:
-            exercise.coordinate_system = data['coordinate_system']
-        if 'solution' in data:
-            exercise.solution = Solution(**data['solution'])
-        if 'display_settings' in data:
-            exercise.display_settings = data['display_settings']
-            
-        return exercise
-    
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exercise to dictionary"""
         result = {
@@ -94,45 +171,18 @@ class Exercise:
             'id_part': self.id_part,
             'type': self.type,
             'function': self.function,
-            'integrals': [
-                {
-                    'var': i.var,
-                    'limits': {
-                        'lower': i.limits.lower,
-                        'upper': i.limits.upper
-                    },
-                    'order': i.order
-                }
-                for i in self.integrals
-            ]
+            'integrals': [integral.to_dict() for integral in self.integrals]
         }
-        
+
         if self.coordinate_system:
             result['coordinate_system'] = self.coordinate_system
-        
         if self.solution:
-            result['solution'] = {
-                'exact': self.solution.exact,
-                'decimal': self.solution.decimal,
-                'quantity_type': self.solution.quantity_type,
-                'units': self.solution.units
-            }
-        
+            result['solution'] = self.solution.to_dict()
         if self.latex:
-            result['latex'] = {
-                'integral_setup': self.latex.integral_setup,
-                'solution_steps': self.latex.solution_steps,
-                'final_result': self.latex.final_result
-            }
-        
+            result['latex'] = self.latex.to_dict()
         if self.computation_details:
-            result['computation_details'] = {
-                'intermediate_steps': self.computation_details.intermediate_steps,
-                'substitutions': self.computation_details.substitutions,
-                'integration_method': self.computation_details.integration_method
-            }
-        
+            result['computation_details'] = self.computation_details.to_dict()
         if self.display_settings:
             result['display_settings'] = self.display_settings
-            
-        return result
\ No newline at end of file
+
+        return result
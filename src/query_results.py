@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Query the result store (data/results.sqlite) without reading intermediate files.
+
+Examples:
+    python src/query_results.py --coordinate-system spherical --slower-than 5
+    python src/query_results.py --assignment C3_2025_T18_integrales_v1
+    python src/query_results.py --course "Calculo 3" --json
+    python src/query_results.py --stats
+    python src/query_results.py --sql "SELECT function, solve_ms FROM results WHERE exact IS NULL"
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from typing import Any, List, Tuple
+
+from utils.result_store import ResultStore
+
+COLUMNS = ('assignment', 'exercise', 'coordinate_system', 'function', 'exact', 'decimal',
+           'quantity_type', 'units', 'solve_ms', 'integration_method')
+
+def build_query(args: argparse.Namespace) -> Tuple[str, List[Any]]:
+    """SELECT over the results view for the filters given on the command line"""
+    conditions = []
+    parameters: List[Any] = []
+    if args.coordinate_system:
+        conditions.append("coordinate_system = ?")
+        parameters.append(args.coordinate_system)
+    if args.slower_than is not None:
+        conditions.append("solve_ms > ?")
+        parameters.append(args.slower_than * 1000)
+    if args.assignment:
+        conditions.append("assignment GLOB ?")
+        parameters.append(args.assignment)
+    if args.course:
+        conditions.append("course = ?")
+        parameters.append(args.course)
+    if args.method:
+        conditions.append("integration_method GLOB ?")
+        parameters.append(args.method)
+    if args.hash:
+        conditions.append("exercise_hash LIKE ?")
+        parameters.append(f"{args.hash}%")
+
+    sql = "SELECT * FROM results"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY solve_ms DESC" if args.slower_than is not None else " ORDER BY assignment, position"
+    if args.limit:
+        sql += f" LIMIT {int(args.limit)}"
+    return sql, parameters
+
+STATS_QUERY = """
+SELECT coordinate_system, COUNT(*) AS exercises, COUNT(DISTINCT exercise_hash) AS distinct_exercises,
+       ROUND(AVG(solve_ms), 1) AS avg_ms, ROUND(MAX(solve_ms), 1) AS max_ms
+FROM results GROUP BY coordinate_system ORDER BY exercises DESC
+"""
+
+def exercise_label(row: sqlite3.Row) -> str:
+    label = f"{row['exercise_id']}{row['id_letter'] or ''}"
+    if row['id_part']:
+        label += f".{row['id_part']}"
+    return label
+
+def print_table(rows: List[dict], columns: List[str]) -> None:
+    widths = {column: max([len(column)] + [len(format_value(row[column])) for row in rows]) for column in columns}
+    # Long formulas are cut so the table stays readable; --json prints them whole
+    widths = {column: min(width, 40) for column, width in widths.items()}
+    print("  ".join(f"{column:<{widths[column]}}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{format_value(row[column])[:widths[column]]:<{widths[column]}}" for column in columns))
+
+def format_value(value: Any) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1e4 else f"{value:.0f}"
+    return str(value)
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the SQLite result store of solved exercises')
+    parser.add_argument('--db', default=ResultStore.DEFAULT_PATH,
+                        help=f'Result store path (default: {ResultStore.DEFAULT_PATH})')
+    parser.add_argument('--coordinate-system', choices=['cartesian', 'polar', 'cylindrical', 'spherical'])
+    parser.add_argument('--slower-than', type=float, metavar='SECONDS',
+                        help='Only exercises whose solve took longer than this (slowest first)')
+    parser.add_argument('--assignment', help='Assignment base name, glob patterns allowed (e.g. "C3_2025_*")')
+    parser.add_argument('--course', help='Course name, as in metadata.course.name')
+    parser.add_argument('--method', help='Integration method, glob patterns allowed (e.g. "numeric_fallback:*")')
+    parser.add_argument('--hash', help='Exercise hash or a prefix of it')
+    parser.add_argument('--limit', type=int, help='Maximum number of rows')
+    parser.add_argument('--json', action='store_true', help='Print rows as JSON')
+    parser.add_argument('--stats', action='store_true', help='Exercise counts and solve times per coordinate system')
+    parser.add_argument('--sql', help='Run a read-only SQL query (tables: solutions, occurrences; view: results)')
+    args = parser.parse_args()
+
+    store = ResultStore(args.db, readonly=True)
+    try:
+        if args.sql:
+            rows = store.query(args.sql)
+        elif args.stats:
+            rows = store.query(STATS_QUERY)
+        else:
+            rows = store.query(*build_query(args))
+    except (FileNotFoundError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        store.close()
+
+    if args.sql or args.stats:
+        records = [dict(row) for row in rows]
+        columns = list(rows[0].keys()) if rows else []
+    else:
+        records = [
+            {'exercise': exercise_label(row), **dict(row), 'integrals': json.loads(row['integrals'])}
+            for row in rows
+        ]
+        columns = list(COLUMNS)
+
+    if args.json:
+        print(json.dumps(records, indent=2, ensure_ascii=False))
+        return
+    if not records:
+        print("No matching exercises")
+        return
+    print_table(records, columns)
+    print(f"\n{len(records)} row(s)")
+
+if __name__ == '__main__':
+    main()
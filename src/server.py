@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+import json
+import os
+import signal
+import socket
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    """HTTP API of the warm solver daemon.
+
+    GET  /health           -> status, uptime and cache statistics
+    POST /solve[?tex=1]    -> body is an assignment JSON; returns
+                              {"intermediate": ..., "tex": ...} (tex only when requested)
+
+    POST requests must be application/json and carry no Origin header, so
+    web pages cannot submit expressions to the local daemon.
+    """
+
+    server_version = 'MathSolver/1.0'
+
+    def do_GET(self):
+        if urlparse(self.path).path != '/health':
+            self._send_json(404, {'error': f"unknown endpoint '{self.path}'"})
+            return
+
+        self._send_json(200, self.server.health())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/solve':
+            self._send_json(404, {'error': f"unknown endpoint '{self.path}'"})
+            return
+
+        # Browsers send Origin on cross-site requests, and a page can only POST
+        # text/plain or form data without a preflight the server never answers
+        if self.headers.get('Origin') is not None:
+            self._send_json(403, {'error': 'cross-origin requests are not accepted'})
+            return
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json(415, {'error': "Content-Type must be 'application/json'"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            input_data = json.loads(self.rfile.read(length).decode('utf-8'))
+            if 'exercises' not in input_data or 'output_settings' not in input_data.get('metadata', {}):
+                raise ValueError("expected 'metadata.output_settings' and 'exercises'")
+        except (ValueError, AttributeError, TypeError) as e:
+            self._send_json(400, {'error': f"invalid assignment JSON: {e}"})
+            return
+
+        query = parse_qs(url.query)
+        include_tex = query.get('tex', ['0'])[0].lower() in ('1', 'true', 'yes')
+        source_name = query.get('name', ['assignment.json'])[0]
+
+        try:
+            status, response = 200, self.server.solve(input_data, source_name, include_tex)
+        except Exception as e:
+            status, response = 500, {'error': str(e)}
+        self._send_json(status, response)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        print(f"  [{self.log_date_time_string()}] {self.address_string()} {format % args}")
+
+class SolverServer(HTTPServer):
+    """Single-threaded HTTP server that keeps one orchestrator (and its caches) resident.
+
+    Requests are handled one at a time: the solver, its memo tables and the
+    SymPy cache are shared state, and parallelism is available per request
+    through the orchestrator's worker pool.
+    """
+
+    def __init__(self, orchestrator, address: Tuple[str, int]):
+        self.orchestrator = orchestrator
+        self.started = time.time()
+        self.requests_served = 0
+        super().__init__(address, SolverRequestHandler)
+
+    def solve(self, input_data: Dict[str, Any], source_name: str, include_tex: bool) -> Dict[str, Any]:
+        intermediate_data = self.orchestrator.solve_assignment(input_data, source_name)
+        response = {'intermediate': intermediate_data}
+        if include_tex:
+            response['tex'] = self.orchestrator.latex_generator.render(intermediate_data)
+        self.requests_served += 1
+        return response
+
+    def health(self) -> Dict[str, Any]:
+        health = {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started, 1),
+            'requests_served': self.requests_served
+        }
+        if self.orchestrator.solution_cache:
+            health['solution_cache'] = self.orchestrator.solution_cache.summary()
+        health['antiderivative_memo'] = self.orchestrator.integral_solver.memo.summary()
+        return health
+
+class UnixSolverServer(SolverServer):
+    """SolverServer listening on a Unix domain socket instead of TCP"""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        # Skip HTTPServer.server_bind, which resolves a TCP host name
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+def _stop_serving(signum, frame):
+    raise KeyboardInterrupt
+
+def serve(orchestrator, host: str = '127.0.0.1', port: int = 8765,
+          socket_path: Optional[str] = None) -> None:
+    """Warm up the orchestrator and serve requests until interrupted"""
+    print("Warming up solver...")
+    orchestrator.warm_up()
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixSolverServer(orchestrator, socket_path)
+        print(f"Math Solver daemon listening on unix:{socket_path}")
+    else:
+        server = SolverServer(orchestrator, (host, port))
+        print(f"Math Solver daemon listening on http://{host}:{server.server_port}")
+
+    # Shut down cleanly (removing the socket file) on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, _stop_serving)
+    signal.signal(signal.SIGINT, _stop_serving)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
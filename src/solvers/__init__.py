@@ -0,0 +1,2 @@
+# Bump when a change alters solver output, so builds and caches are refreshed
+SOLVER_VERSION = '1.4'
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import sympy as sp
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+def split_constant_factor(expr: sp.Expr) -> Tuple[sp.Expr, sp.Expr]:
+    """Separate numeric multiplicative factors from the rest: 6*r*sin(t) -> (6, r*sin(t))"""
+    if expr.is_number:
+        return expr, sp.Integer(1)
+
+    if expr.is_Mul:
+        constant_part = sp.Integer(1)
+        variable_part = sp.Integer(1)
+
+        for factor in expr.args:
+            if factor.is_number:
+                constant_part *= factor
+            else:
+                variable_part *= factor
+
+        return constant_part, variable_part
+
+    return sp.Integer(1), expr
+
+class AntiderivativeMemo:
+    """Memo table of per-stage antiderivatives and definite results, up to constant factors"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._antiderivatives: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._definite: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.stats = {
+            'definite_hits': 0,
+            'definite_misses': 0,
+            'antiderivative_hits': 0,
+            'antiderivative_misses': 0
+        }
+
+    def get_definite(self, integrand: sp.Expr, var: sp.Symbol, lower: sp.Expr,
+                     upper: sp.Expr) -> Optional[Tuple[sp.Expr, str]]:
+        """Return (value, strategy) for a previously integrated stage with the same limits"""
+        return self._lookup(self._definite, (integrand, var, lower, upper), 'definite')
+
+    def put_definite(self, integrand: sp.Expr, var: sp.Symbol, lower: sp.Expr, upper: sp.Expr,
+                     value: sp.Expr, strategy: str) -> None:
+        self._store(self._definite, (integrand, var, lower, upper), (value, strategy))
+
+    def get_antiderivative(self, integrand: sp.Expr, var: sp.Symbol) -> Optional[Tuple[sp.Expr, str]]:
+        """Return (antiderivative, strategy) for a previously integrated integrand"""
+        return self._lookup(self._antiderivatives, (integrand, var), 'antiderivative')
+
+    def put_antiderivative(self, integrand: sp.Expr, var: sp.Symbol, antiderivative: sp.Expr, strategy: str) -> None:
+        self._store(self._antiderivatives, (integrand, var), (antiderivative, strategy))
+
+    def _lookup(self, table: OrderedDict, key: Hashable, kind: str) -> Optional[Any]:
+        entry = table.get(key)
+        if entry is None:
+            self.stats[f'{kind}_misses'] += 1
+            return None
+
+        table.move_to_end(key)
+        self.stats[f'{kind}_hits'] += 1
+        return entry
+
+    def _store(self, table: OrderedDict, key: Hashable, entry: Any) -> None:
+        table[key] = entry
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+    @property
+    def lookups(self) -> int:
+        return self.stats['definite_hits'] + self.stats['definite_misses']
+
+    def hit_rates(self) -> Tuple[float, float]:
+        """Hit rates (0-1) of the definite and antiderivative tables"""
+        rates = []
+        for kind in ('definite', 'antiderivative'):
+            hits = self.stats[f'{kind}_hits']
+            total = hits + self.stats[f'{kind}_misses']
+            rates.append(hits / total if total else 0.0)
+        return rates[0], rates[1]
+
+    def summary(self) -> str:
+        """Human readable statistics line"""
+        definite_rate, antiderivative_rate = self.hit_rates()
+        return (f"definite {self.stats['definite_hits']}/"
+                f"{self.stats['definite_hits'] + self.stats['definite_misses']} hits "
+                f"({definite_rate * 100:.0f}%), antiderivative {self.stats['antiderivative_hits']}/"
+                f"{self.stats['antiderivative_hits'] + self.stats['antiderivative_misses']} hits "
+                f"({antiderivative_rate * 100:.0f}%)")
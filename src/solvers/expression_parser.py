@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import io
+import keyword
+import tokenize
+import sympy as sp
+import sympy.functions
+from functools import lru_cache
+from typing import Dict, Any, Optional
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
+
+def build_symbol_table() -> Dict[str, Any]:
+    """Symbols shared by every exercise, with the assumptions the solver relies on"""
+    return {
+        'x': sp.Symbol('x'),
+        'y': sp.Symbol('y'),
+        'z': sp.Symbol('z'),
+        'r': sp.Symbol('r', positive=True),
+        'theta': sp.Symbol('theta'),
+        'phi': sp.Symbol('phi'),
+        'rho': sp.Symbol('rho', positive=True),
+        'pi': sp.pi,
+        'e': sp.E
+    }
+
+class ExpressionParser:
+    """Parses expression strings once and returns the same SymPy tree for identical strings"""
+
+    # Standard parsing plus '^' as power, compiled once for every parse
+    TRANSFORMATIONS = standard_transformations + (convert_xor,)
+    
+    # parse_expr evaluates the transformed input with eval, so only names,
+    # numbers and operators are accepted
+    ALLOWED_TOKENS = (tokenize.NAME, tokenize.NUMBER, tokenize.OP,
+                      tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER)
+
+    def __init__(self, symbols: Optional[Dict[str, Any]] = None, cache_size: int = 4096):
+        self.symbols = symbols if symbols is not None else build_symbol_table()
+        self._global_dict = self._build_global_dict()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_uncached)
+    
+    @staticmethod
+    def _build_global_dict() -> Dict[str, Any]:
+        """Namespace for eval: SymPy's mathematical functions and constants, no builtins"""
+        namespace: Dict[str, Any] = {name: getattr(sympy.functions, name) for name in sympy.functions.__all__}
+        namespace.update({
+            # Emitted by the parser's transformations
+            'Symbol': sp.Symbol,
+            'Function': sp.Function,
+            'Integer': sp.Integer,
+            'Float': sp.Float,
+            'Rational': sp.Rational,
+            # Emitted when parsing with evaluate=False
+            'Add': sp.Add,
+            'Mul': sp.Mul,
+            'Pow': sp.Pow,
+            'Mod': sp.Mod,
+            'E': sp.E,
+            'pi': sp.pi,
+            'I': sp.I,
+            'oo': sp.oo,
+            'abs': sp.Abs,
+            'max': sp.Max,
+            'min': sp.Min,
+            # Without this key eval would insert the real builtins
+            '__builtins__': {}
+        })
+        return namespace
+
+    def parse(self, expr_str: str, evaluate: bool = True) -> sp.Expr:
+        """Parse an expression string, raising ValueError if it is not valid.
+
+        With evaluate=False the tree keeps the terms in the order they were
+        written, for display.
+        """
+        return self._parse_cached(expr_str.strip(), evaluate)
+
+    def _parse_uncached(self, expr_str: str, evaluate: bool) -> sp.Expr:
+        self._check_tokens(expr_str)
+        try:
+            return parse_expr(
+                expr_str,
+                local_dict=dict(self.symbols),
+                global_dict=self._global_dict,
+                transformations=self.TRANSFORMATIONS,
+                evaluate=evaluate
+            )
+        except MemoryError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Cannot parse expression '{expr_str}': {e}")
+
+    def _check_tokens(self, expr_str: str) -> None:
+        """Reject strings, keywords, attribute access and private names before eval sees them"""
+        try:
+            tokens = list(tokenize.generate_tokens(io.StringIO(expr_str).readline))
+        except (tokenize.TokenError, SyntaxError) as e:
+            raise ValueError(f"Cannot parse expression '{expr_str}': {e}")
+        
+        for token in tokens:
+            unsafe = (
+                token.type not in self.ALLOWED_TOKENS
+                or (token.type == tokenize.NAME and (token.string.startswith('_') or keyword.iskeyword(token.string)))
+                or (token.type == tokenize.OP and token.string in ('.', ';', ':', ':='))
+            )
+            if unsafe:
+                raise ValueError(f"Cannot parse expression '{expr_str}': '{token.string}' is not allowed")
+
+    def cache_info(self):
+        return self._parse_cached.cache_info()
+
+    def clear_cache(self) -> None:
+        self._parse_cached.cache_clear()
+
+_shared_parser: Optional[ExpressionParser] = None
+
+def get_shared_parser() -> ExpressionParser:
+    """Process-wide parser used by solving, quantity detection and LaTeX rendering"""
+    global _shared_parser
+    if _shared_parser is None:
+        _shared_parser = ExpressionParser()
+    return _shared_parser
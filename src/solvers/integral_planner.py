@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import sympy as sp
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from solvers.antiderivative_memo import split_constant_factor
+
+@dataclass
+class PlannedIntegral:
+    """A distinct integral of an assignment: the exercise solved for it and the exercises that reuse it"""
+    representative: int
+    coefficient: sp.Expr
+    # (exercise index, constant factor relative to the representative)
+    duplicates: List[Tuple[int, sp.Expr]] = field(default_factory=list)
+
+class IntegralPlanner:
+    """Finds exercises whose integrals are equal up to renaming the integration variables and a constant factor.
+
+    Like normalize_function, the constant factor of the integrand is split
+    off; the integration variables are replaced by positional symbols with
+    the same assumptions, so x*y over [0,1]x[0,2] and 3*u*v over the same
+    box are one integral. Each distinct integral is solved once and its
+    result is scaled for the others.
+    """
+
+    def __init__(self, solver):
+        # IntegralSolver whose parser, symbols and simplification policy are shared
+        self.solver = solver
+
+    def canonical_form(self, exercise_data: Dict[str, Any]) -> Optional[Tuple[Hashable, sp.Expr]]:
+        """(key, constant factor) of an exercise's integral, or None if it is left out of planning"""
+        try:
+            integrals = sorted(exercise_data['integrals'], key=lambda integral: integral['order'])
+            # Malformed exercises are solved on their own, so they fail with a per-exercise error
+            sources = [exercise_data['function']] + [
+                integral['limits'][bound] for integral in integrals for bound in ('lower', 'upper')
+            ]
+            if not all(isinstance(source, str) for source in sources):
+                return None
+            integrand = self.solver.parse_expression(exercise_data['function'])
+            bounds = [
+                (self.solver.parse_expression(integral['limits']['lower']),
+                 self.solver.parse_expression(integral['limits']['upper']))
+                for integral in integrals
+            ]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        variables = [self.solver.symbols.get(integral['var'], sp.Symbol(integral['var'])) for integral in integrals]
+        if len(set(variables)) != len(variables):
+            return None
+
+        # Inner to outer integration variables become _v1, _v2, ... keeping their assumptions
+        renaming = {
+            var: sp.Symbol(f'_v{stage}', **var.assumptions0)
+            for stage, var in enumerate(variables, start=1)
+        }
+        coefficient, base = split_constant_factor(integrand.xreplace(renaming))
+        if coefficient == 0:
+            return None
+
+        key = (base, tuple((lower.xreplace(renaming), upper.xreplace(renaming)) for lower, upper in bounds))
+        return key, coefficient
+
+    def plan(self, exercises: List[Dict[str, Any]]) -> List[PlannedIntegral]:
+        """Distinct integrals in order of first appearance.
+
+        An exercise joins an earlier one with the same canonical integral
+        only when the ratio of their factors is rational, so scaling never
+        turns an exact result into a floating-point one.
+        """
+        groups: Dict[Hashable, List[PlannedIntegral]] = {}
+        planned: List[PlannedIntegral] = []
+        for index, exercise_data in enumerate(exercises):
+            form = self.canonical_form(exercise_data)
+            if form is None:
+                planned.append(PlannedIntegral(index, sp.Integer(1)))
+                continue
+
+            key, coefficient = form
+            for candidate in groups.get(key, []):
+                factor = coefficient / candidate.coefficient
+                if factor.is_Rational:
+                    candidate.duplicates.append((index, factor))
+                    break
+            else:
+                entry = PlannedIntegral(index, coefficient)
+                groups.setdefault(key, []).append(entry)
+                planned.append(entry)
+        return planned
+
+    def scale(self, solution: Tuple[Optional[str], Optional[float], str],
+              factor: sp.Expr) -> Tuple[Optional[str], Optional[float], str]:
+        """The (exact, decimal, method) of the representative, multiplied by factor"""
+        exact, decimal, method = solution
+        if factor == 1:
+            return solution
+
+        if exact is not None:
+            value = self.solver.simplification.final(factor * self.solver.parse_expression(exact))
+            try:
+                decimal = float(value.evalf())
+            except (TypeError, ValueError):
+                decimal = None
+            return str(value), decimal, method
+
+        if decimal is not None:
+            decimal = float(factor) * decimal
+        return exact, decimal, method
@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
+import logging
 import sympy as sp
 from typing import List, Tuple, Optional, Dict, Any
 import re
 
 from models.exercise import Exercise
+from solvers import SOLVER_VERSION
+from utils.solution_cache import SolutionCache
+from solvers.simplification import SimplificationPolicy
+from solvers.integration_strategies import IntegrationStrategyEngine
+from solvers.expression_parser import ExpressionParser, get_shared_parser
+from solvers.antiderivative_memo import AntiderivativeMemo, split_constant_factor
+from solvers.latex_printer import LatexRenderer, get_shared_renderer
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
 
 class IntegralSolver:
     """Solves integrals with automatic coordinate system detection and improved quantity type detection"""
@@ -15,19 +26,33 @@ class IntegralSolver:
         'spherical': {'rho', 'theta', 'phi'}
     }
     
-    def __init__(self):
-        # Define common symbols
-        self.symbols = {
-            'x': sp.Symbol('x'),
-            'y': sp.Symbol('y'),
-            'z': sp.Symbol('z'),
-            'r': sp.Symbol('r', positive=True),
-            'theta': sp.Symbol('theta'),
-            'phi': sp.Symbol('phi'),
-            'rho': sp.Symbol('rho', positive=True),
-            'pi': sp.pi,
-            'e': sp.E
-        }
+    INTEGRATION_METHODS = ('symbolic', 'numeric')
+    
+    def __init__(self, cache: Optional[SolutionCache] = None, integration_method: str = 'symbolic',
+                 simplify_policy: str = 'tiered', strategy_engine: Optional[IntegrationStrategyEngine] = None,
+                 parser: Optional[ExpressionParser] = None, memo: Optional[AntiderivativeMemo] = None,
+                 renderer: Optional[LatexRenderer] = None):
+        if integration_method not in self.INTEGRATION_METHODS:
+            raise ValueError(f"Unknown integration method '{integration_method}'")
+        
+        # 'symbolic' gives exact + decimal, 'numeric' only a fast decimal approximation
+        self.integration_method = integration_method
+        self._numeric_integrator = None
+        self.simplification = SimplificationPolicy(simplify_policy)
+        self.strategy_engine = strategy_engine or IntegrationStrategyEngine()
+        
+        # Per-stage results shared by every exercise solved by this instance
+        self.memo = memo if memo is not None else AntiderivativeMemo()
+        
+        # Optional persistent cache of solved integrals
+        self.cache = cache
+        
+        # Shared, memoized parser; its symbol table defines the integration variables
+        self.parser = parser or get_shared_parser()
+        self.symbols = self.parser.symbols
+        
+        # Shared, cached LaTeX printer for rendering from expression trees
+        self.renderer = renderer or get_shared_renderer()
     
     def detect_coordinate_system(self, variables: List[str]) -> str:
         """Auto-detect coordinate system from variables"""
@@ -53,30 +78,14 @@ class IntegralSolver:
         
         # Parse the expression
         try:
-            expr = sp.sympify(func_str, locals=self.symbols)
+            expr = self.parser.parse(func_str)
             
-            # Extract non-constant factors
-            if expr.is_number:
-                return "1"
-            
-            # Handle products - separate constants from variables
-            if expr.is_Mul:
-                constant_part = 1
-                variable_part = 1
-                
-                for factor in expr.args:
-                    if factor.is_number:
-                        constant_part *= factor
-                    else:
-                        variable_part *= factor
-                
-                if variable_part == 1:
-                    return "1"
-                else:
-                    return str(variable_part)
+            # Separate constant factors from the variable part
+            _, variable_part = split_constant_factor(expr)
             
-            # If not a product, return as is (already normalized)
-            return str(expr)
+            if variable_part == 1:
+                return "1"
+            return str(variable_part)
             
         except Exception:
             # Fallback: manual normalization for simple cases
@@ -183,53 +192,259 @@ class IntegralSolver:
     
     def parse_expression(self, expr_str: str) -> sp.Expr:
         """Parse mathematical expression string to SymPy expression"""
-        # Replace common notation
-        expr_str = expr_str.replace('^', '**')
-        
-        # Parse with predefined symbols
+        return self.parser.parse(expr_str)
+    
+    def solution_cache_key(self, exercise: 'Exercise') -> Optional[str]:
+        """Build a content hash for the integrand, limits and SymPy version"""
         try:
-            return sp.sympify(expr_str, locals=self.symbols)
-        except Exception as e:
-            raise ValueError(f"Cannot parse expression '{expr_str}': {e}")
+            integrals = [
+                {
+                    'var': integral.var,
+                    'lower': sp.srepr(self.parse_expression(integral.limits.lower)),
+                    'upper': sp.srepr(self.parse_expression(integral.limits.upper)),
+                    'order': integral.order
+                }
+                for integral in sorted(exercise.integrals, key=lambda x: x.order)
+            ]
+            payload = {
+                'integrand': sp.srepr(self.parse_expression(exercise.function)),
+                'integrals': integrals,
+                'simplify_policy': self.simplification.name,
+                'strategies': self.strategy_engine.describe(),
+                'sympy_version': sp.__version__,
+                'solver_version': SOLVER_VERSION
+            }
+        except ValueError:
+            # Unparseable exercises are never cached
+            return None
+        
+        return SolutionCache.make_key(payload)
     
     def solve_integral(self, exercise: 'Exercise') -> Tuple[Optional[str], Optional[float]]:
         """Solve the integral and return exact and decimal solutions"""
+        exact_solution, decimal_solution, _ = self.solve(exercise)
+        return exact_solution, decimal_solution
+    
+    def solve(self, exercise: 'Exercise') -> Tuple[Optional[str], Optional[float], str]:
+        """Solve the integral and return exact and decimal solutions plus the integration method"""
+        if self.integration_method == 'numeric':
+            return None, self.solve_numeric(exercise), 'numeric'
+        
+        with span('cache_lookup'):
+            cached = self.cached_solution(exercise)
+        if cached is not None:
+            return cached
+        
+        exact_solution, decimal_solution, method = self.solve_symbolic(exercise)
+        self.store_solution(exercise, exact_solution, decimal_solution, method)
+        
+        return exact_solution, decimal_solution, method
+    
+    def cached_solution(self, exercise: 'Exercise') -> Optional[Tuple[Optional[str], Optional[float], str]]:
+        """Return the cached (exact, decimal, method) triple, or None on a miss"""
+        cache_key = self.solution_cache_key(exercise) if self.cache else None
+        if not cache_key:
+            return None
+        
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        return cached['exact'], cached['decimal'], cached.get('method', 'symbolic')
+    
+    def store_solution(self, exercise: 'Exercise', exact_solution: Optional[str],
+                       decimal_solution: Optional[float], method: str = 'symbolic') -> None:
+        """Store a successful solution in the cache"""
+        if not self.cache or exact_solution is None:
+            return
+        
+        cache_key = self.solution_cache_key(exercise)
+        if cache_key:
+            self.cache.put(cache_key, {
+                'exact': exact_solution,
+                'decimal': decimal_solution,
+                'method': method
+            })
+    
+    def solve_symbolic(self, exercise: 'Exercise') -> Tuple[Optional[str], Optional[float], str]:
+        """Integrate symbolically from the innermost to the outermost integral"""
         try:
-            # Parse the function
-            integrand = self.parse_expression(exercise.function)
-            
             # Sort integrals by order (inner to outer)
             sorted_integrals = sorted(exercise.integrals, key=lambda x: x.order)
             
+            # Parse the function and the limits
+            with span('parse'):
+                integrand = self.parse_expression(exercise.function)
+                limits = [
+                    (self.parse_expression(integral.limits.lower), self.parse_expression(integral.limits.upper))
+                    for integral in sorted_integrals
+                ]
+            exercise.function_expr = integrand
+            variables = [self.symbols.get(integral.var, sp.Symbol(integral.var)) for integral in sorted_integrals]
+            
+            # Constant limits and a product integrand: multiply independent 1-D integrals
+            factors = self.separable_factors(integrand, variables, limits)
+            if factors is not None:
+                return self._solve_separable(exercise, factors, variables, limits)
+            
             # Perform integration
             result = integrand
-            for integral in sorted_integrals:
-                var = self.symbols.get(integral.var, sp.Symbol(integral.var))
-                lower = self.parse_expression(integral.limits.lower)
-                upper = self.parse_expression(integral.limits.upper)
+            strategies_used = []
+            for stage, (integral, (lower, upper)) in enumerate(zip(sorted_integrals, limits)):
+                var = variables[stage]
                 
-                # Integrate
-                antiderivative = sp.integrate(result, var)
-                # Apply limits
-                result = antiderivative.subs(var, upper) - antiderivative.subs(var, lower)
+                # Integrate and apply limits (memoized, or first verified strategy)
+                with span(f'integrate:{stage + 1}', var=integral.var):
+                    result, strategy = self._integrate_stage(result, var, lower, upper)
+                strategies_used.append(strategy)
                 
-                # Simplify after each integration
-                result = sp.simplify(result)
+                # Simplify between stages according to the policy
+                if stage < len(sorted_integrals) - 1:
+                    with span('simplify'):
+                        result = self.simplification.between_stages(result)
+            
+            with span('simplify'):
+                result = self.simplification.final(result)
+            exercise.exact_expr = result
             
             # Get exact solution
             exact_solution = str(result)
             
             # Get decimal solution
+            with span('evalf'):
+                try:
+                    decimal_solution = float(result.evalf())
+                except (TypeError, ValueError):
+                    decimal_solution = None
+            
+            return exact_solution, decimal_solution, self._method_label(strategies_used)
+            
+        except MemoryError:
+            # Reported by the budget worker as a memory violation
+            raise
+        except Exception as e:
+            logger.warning("Error solving integral: %s", e)
+            return None, None, 'symbolic'
+    
+    def separable_factors(self, integrand: sp.Expr, variables: List[sp.Symbol],
+                          limits: List[Tuple[sp.Expr, sp.Expr]]) -> Optional[Tuple[sp.Expr, List[sp.Expr]]]:
+        """Split the integrand into (constant, [factor of each variable]), or None if it is not separable.
+        
+        The region must be a box (no limit depends on an integration
+        variable) and every factor of the integrand must depend on at most
+        one variable, after separatevars for factors such as exp(x + y).
+        """
+        if len(variables) < 2 or len(set(variables)) != len(variables):
+            return None
+        if any(bound.has(*variables) for bounds in limits for bound in bounds):
+            return None
+        
+        constant = sp.Integer(1)
+        parts = {var: sp.Integer(1) for var in variables}
+        for factor in sp.Mul.make_args(integrand):
+            present = [var for var in variables if factor.has(var)]
+            if len(present) > 1:
+                separated = sp.separatevars(factor, symbols=variables, dict=True)
+                if separated is None:
+                    return None
+                constant *= separated.pop('coeff')
+                for var, part in separated.items():
+                    parts[var] *= part
+            elif present:
+                parts[present[0]] *= factor
+            else:
+                constant *= factor
+        return constant, [parts[var] for var in variables]
+    
+    def _solve_separable(self, exercise: 'Exercise', factors: Tuple[sp.Expr, List[sp.Expr]],
+                         variables: List[sp.Symbol], limits: List[Tuple[sp.Expr, sp.Expr]]) -> Tuple[Optional[str], Optional[float], str]:
+        """Product of independent 1-D integrals, each memoized; a single simplify at the end"""
+        constant, parts = factors
+        result = constant
+        strategies_used = []
+        for stage, (part, var, (lower, upper)) in enumerate(zip(parts, variables, limits)):
+            with span(f'integrate:{stage + 1}', var=str(var)):
+                value, strategy = self._integrate_stage(part, var, lower, upper)
+            result *= value
+            strategies_used.append(strategy)
+        
+        with span('simplify'):
+            result = self.simplification.final(result)
+        exercise.exact_expr = result
+        
+        with span('evalf'):
             try:
                 decimal_solution = float(result.evalf())
-            except:
+            except (TypeError, ValueError):
                 decimal_solution = None
+        
+        return str(result), decimal_solution, self._method_label(strategies_used)
+    
+    def _integrate_stage(self, integrand: sp.Expr, var: sp.Symbol, lower: sp.Expr, upper: sp.Expr) -> Tuple[sp.Expr, str]:
+        """Definite integral of one stage, reusing memoized results up to a constant factor"""
+        coefficient, base = split_constant_factor(integrand)
+        
+        memoized = self.memo.get_definite(base, var, lower, upper)
+        if memoized is not None:
+            value, strategy = memoized
+            return coefficient * value, strategy
+        
+        memoized = self.memo.get_antiderivative(base, var)
+        if memoized is not None:
+            antiderivative, strategy = memoized
+            value = antiderivative.subs(var, upper) - antiderivative.subs(var, lower)
+            # The antiderivative was accepted for other limits; check these too
+            if self.strategy_engine.accepts(value, strategy, base, var, lower, upper):
+                self.memo.put_definite(base, var, lower, upper, value, strategy)
+                return coefficient * value, strategy
+        
+        value, strategy, antiderivative = self.strategy_engine.integrate(base, var, lower, upper)
+        if not strategy.endswith('(unverified)'):
+            if antiderivative is not None:
+                self.memo.put_antiderivative(base, var, antiderivative, strategy)
+            self.memo.put_definite(base, var, lower, upper, value, strategy)
+        
+        return coefficient * value, strategy
+    
+    @staticmethod
+    def _method_label(strategies_used: List[str]) -> str:
+        """Describe the winning strategies, innermost stage first"""
+        if not strategies_used:
+            return 'symbolic'
+        if len(set(strategies_used)) == 1:
+            return f"symbolic:{strategies_used[0]}"
+        return "symbolic:" + ",".join(strategies_used)
+    
+    @property
+    def numeric_integrator(self):
+        """Cubature engine, imported on first use since it needs NumPy"""
+        if self._numeric_integrator is None:
+            from solvers.numeric_integrator import NumericIntegrator
+            self._numeric_integrator = NumericIntegrator()
+        return self._numeric_integrator
+    
+    def solve_numeric(self, exercise: 'Exercise') -> Optional[float]:
+        """Approximate the integral with vectorized Gauss-Legendre cubature (no exact form)"""
+        try:
+            with span('parse'):
+                integrand = self.parse_expression(exercise.function)
+                
+                # Outer to inner, so each limit only depends on already fixed variables
+                levels = [
+                    (
+                        self.symbols.get(integral.var, sp.Symbol(integral.var)),
+                        self.parse_expression(integral.limits.lower),
+                        self.parse_expression(integral.limits.upper)
+                    )
+                    for integral in sorted(exercise.integrals, key=lambda x: -x.order)
+                ]
+            exercise.function_expr = integrand
             
-            return exact_solution, decimal_solution
+            with span('cubature'):
+                return self.numeric_integrator.integrate(integrand, levels)
             
         except Exception as e:
-            print(f"Error solving integral: {e}")
-            return None, None
+            logger.warning("Error in numeric integration: %s", e)
+            return None
     
     def generate_latex_integral(self, exercise: 'Exercise') -> str:
         """Generate LaTeX code for the integral setup"""
@@ -250,6 +465,35 @@ class IntegralSolver:
         
         return latex.strip()
     
+    def render_latex_from_trees(self, exercise: 'Exercise') -> Tuple[str, Optional[str]]:
+        """Render the integral setup and exact solution directly from SymPy trees.
+        
+        The integrand and limits are parsed unevaluated, so their terms keep the
+        order the exercise wrote them in. The exact solution uses the tree kept
+        by the solver; results that came from the solution cache (or a budget
+        worker) are parsed from their string form. Raises ValueError if the
+        integrand or a limit cannot be parsed.
+        """
+        setup = []
+        for integral in sorted(exercise.integrals, key=lambda x: -x.order):
+            lower = self.renderer.render_as_written(self.parser.parse(integral.limits.lower, evaluate=False))
+            upper = self.renderer.render_as_written(self.parser.parse(integral.limits.upper, evaluate=False))
+            setup.append(f"\\int_{{{lower}}}^{{{upper}}}")
+        integrand = self.parser.parse(exercise.function, evaluate=False)
+        setup.append(f"{self.renderer.render_as_written(integrand)} \\,")
+        for integral in sorted(exercise.integrals, key=lambda x: x.order):
+            var = self.symbols.get(integral.var, sp.Symbol(integral.var))
+            setup.append(f"d{self.renderer.render(var)}")
+        
+        exact_latex = None
+        if exercise.solution and exercise.solution.exact:
+            exact = exercise.exact_expr
+            if exact is None:
+                exact = self.parse_expression(exercise.solution.exact)
+            exact_latex = self.renderer.render(exact)
+        
+        return " ".join(setup), exact_latex
+    
     def determine_quantity_type(self, exercise: 'Exercise', base_unit: str = "u") -> Optional[str]:
         """Determine quantity type using the improved logic"""
         quantity_type, _ = self.determine_quantity_type_and_units(exercise, base_unit)
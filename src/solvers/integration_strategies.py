@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import mpmath
+import sympy as sp
+from sympy.integrals.heurisch import heurisch
+from sympy.integrals.manualintegrate import manualintegrate
+from typing import List, Tuple, Optional, Callable, Dict
+
+from utils.budget import run_with_budget, race_with_budget
+
+def _apply_limits(antiderivative: sp.Expr, var: sp.Symbol, lower: sp.Expr, upper: sp.Expr) -> Tuple[sp.Expr, sp.Expr]:
+    """Evaluate an antiderivative between two limits, keeping the antiderivative for reuse"""
+    if antiderivative is None:
+        raise ValueError("no antiderivative found")
+    return antiderivative.subs(var, upper) - antiderivative.subs(var, lower), antiderivative
+
+# Every strategy returns (definite value, antiderivative or None)
+
+def _antiderivative(integrand, var, lower, upper):
+    """Indefinite sp.integrate followed by substitution of the limits"""
+    return _apply_limits(sp.integrate(integrand, var), var, lower, upper)
+
+def _definite(integrand, var, lower, upper):
+    """sp.integrate with the limits, letting SymPy pick the method"""
+    return sp.integrate(integrand, (var, lower, upper)), None
+
+def _manual(integrand, var, lower, upper):
+    """Rule-based manualintegrate (textbook substitutions and parts)"""
+    return _apply_limits(manualintegrate(integrand, var), var, lower, upper)
+
+def _risch(integrand, var, lower, upper):
+    """Risch algorithm for elementary antiderivatives"""
+    return _apply_limits(sp.integrate(integrand, var, risch=True), var, lower, upper)
+
+def _meijerg(integrand, var, lower, upper):
+    """Definite integration through Meijer G-functions"""
+    return sp.integrate(integrand, (var, lower, upper), meijerg=True), None
+
+def _heurisch(integrand, var, lower, upper):
+    """Heuristic Risch-Norman antiderivative"""
+    return _apply_limits(heurisch(integrand, var), var, lower, upper)
+
+class IntegrationStrategyEngine:
+    """Integrates one stage with alternative SymPy strategies and keeps the first verified result"""
+
+    STRATEGIES: Dict[str, Callable] = {
+        'antiderivative': _antiderivative,
+        'definite': _definite,
+        'manual': _manual,
+        'risch': _risch,
+        'meijerg': _meijerg,
+        'heurisch': _heurisch
+    }
+    MODES = ('sequential', 'race')
+
+    # Strategies that are plain sp.integrate calls, used without verification in sequential mode
+    TRUSTED = ('antiderivative', 'definite')
+
+    # Functions whose integrands have kinks or jumps where quadrature needs a breakpoint
+    NONSMOOTH = (sp.Abs, sp.sign, sp.Heaviside, sp.Max, sp.Min, sp.Piecewise, sp.floor, sp.ceiling)
+
+    # Deterministic sample values for the free symbols during verification
+    SAMPLE_VALUES = (0.37, 0.61, 0.83, 1.13, 1.41)
+
+    def __init__(self, strategies: Optional[List[str]] = None, mode: str = 'sequential',
+                 timeout: Optional[float] = None):
+        strategies = list(strategies) if strategies else list(self.STRATEGIES)
+        unknown = [name for name in strategies if name not in self.STRATEGIES]
+        if unknown:
+            raise ValueError(f"Unknown integration strategies: {', '.join(unknown)}")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown strategy mode '{mode}'")
+
+        self.strategies = strategies
+        self.mode = mode
+        # Per-strategy limit in sequential mode, overall limit in race mode
+        self.timeout = timeout
+
+    def describe(self) -> Dict[str, object]:
+        """Configuration that can change the exact form of results (used in cache keys)"""
+        return {'strategies': self.strategies, 'mode': self.mode}
+
+    def integrate(self, integrand: sp.Expr, var: sp.Symbol, lower: sp.Expr,
+                  upper: sp.Expr) -> Tuple[sp.Expr, str, Optional[sp.Expr]]:
+        """Integrate one stage.
+
+        Returns the definite value, the name of the strategy that produced it and
+        the antiderivative it was computed from (None for definite-only strategies).
+        """
+        args = (integrand, var, lower, upper)
+        if self.mode == 'race' and len(self.strategies) > 1:
+            # The fastest result wins, so every strategy's result is checked
+            accept = lambda name, candidate: self.accepts(candidate[0], name, *args, check_trusted=True)
+            calls = [(name, self.STRATEGIES[name], args) for name in self.strategies]
+            winner, outcome = race_with_budget(calls, time_limit=self.timeout, accept=accept)
+            if winner is not None:
+                value, antiderivative = outcome.value
+                return value, winner, antiderivative
+            if outcome.status == 'memory':
+                raise MemoryError(outcome.message)
+            raise ValueError(f"no integration strategy succeeded for d{var} ({outcome.message})")
+
+        unverified = None
+        for name in self.strategies:
+            candidate = self._run_strategy(name, args)
+            if candidate is None:
+                continue
+            if self.accepts(candidate[0], name, *args):
+                return candidate[0], name, candidate[1]
+            if unverified is None and not self._is_unevaluated(candidate[0]):
+                unverified = (candidate[0], f"{name}(unverified)", None)
+
+        if unverified is not None:
+            return unverified
+        raise ValueError(f"no integration strategy succeeded for d{var}")
+
+    def accepts(self, candidate: sp.Expr, strategy: str, integrand: sp.Expr, var: sp.Symbol,
+                lower: sp.Expr, upper: sp.Expr, check_trusted: bool = False) -> bool:
+        """Whether a stage result from a strategy can be used.
+
+        Plain sp.integrate results are trusted as before unless check_trusted
+        is set; results of the fallback strategies must pass the numerical
+        check. A trusted result the check cannot evaluate is still accepted.
+        """
+        if candidate is None or self._is_unevaluated(candidate):
+            return False
+        if strategy in self.TRUSTED and not check_trusted:
+            return True
+        verdict = self.verify(candidate, integrand, var, lower, upper)
+        return verdict is True or (verdict is None and strategy in self.TRUSTED)
+
+    def _run_strategy(self, name: str, args: Tuple) -> Optional[Tuple[sp.Expr, Optional[sp.Expr]]]:
+        """Run a single strategy, inline or in a killable worker when a timeout is set"""
+        func = self.STRATEGIES[name]
+
+        if self.timeout is None:
+            try:
+                return func(*args)
+            except MemoryError:
+                # Propagate to the exercise budget instead of trying the next strategy
+                raise
+            except Exception:
+                return None
+
+        outcome = run_with_budget(func, args, time_limit=self.timeout)
+        if outcome.status == 'memory':
+            raise MemoryError(outcome.message)
+        return outcome.value if outcome.ok else None
+
+    @staticmethod
+    def _is_unevaluated(candidate: sp.Expr) -> bool:
+        return candidate.has(sp.Integral) or candidate.has(sp.nan, sp.zoo)
+
+    def verify(self, candidate: sp.Expr, integrand: sp.Expr, var: sp.Symbol,
+               lower: sp.Expr, upper: sp.Expr) -> Optional[bool]:
+        """Check a stage result against numerical quadrature at sample points.
+
+        Returns True if it matches, False if it does not, and None (unknown)
+        when no sample could be evaluated or a mismatch may come from a kink
+        the quadrature could not locate.
+        """
+        if candidate is None or self._is_unevaluated(candidate):
+            return False
+
+        free = sorted(
+            (integrand.free_symbols | lower.free_symbols | upper.free_symbols | candidate.free_symbols) - {var},
+            key=lambda s: s.name
+        )
+
+        evaluated = 0
+        for trial in range(2):
+            sample = {
+                symbol: self.SAMPLE_VALUES[(index + trial) % len(self.SAMPLE_VALUES)]
+                for index, symbol in enumerate(free)
+            }
+            try:
+                a = complex(lower.subs(sample).evalf()).real
+                b = complex(upper.subs(sample).evalf()).real
+                sampled = integrand.subs(sample)
+                breakpoints = self._breakpoints(sampled, var, a, b)
+                f = sp.lambdify(var, sampled, modules='mpmath')
+                expected = complex(mpmath.quad(f, [a] + (breakpoints or []) + [b]))
+                got = complex(candidate.subs(sample).evalf())
+            except MemoryError:
+                raise
+            except Exception:
+                # Not verifiable numerically at this sample (e.g. singular integrand)
+                continue
+            evaluated += 1
+
+            if abs(got - expected) > 1e-6 * max(1.0, abs(expected)):
+                # Without the kinks the quadrature itself may be wrong
+                return None if breakpoints is None else False
+
+        return True if evaluated else None
+
+    def _breakpoints(self, integrand: sp.Expr, var: sp.Symbol, a: float, b: float) -> Optional[List[float]]:
+        """Sorted points strictly between a and b where the integrand may have a kink or jump.
+
+        None when the integrand has non-smooth parts whose points cannot be
+        located (only polynomial arguments of Abs, sign, Heaviside, Max and
+        Min are solved).
+        """
+        low, high = min(a, b), max(a, b)
+        points = set()
+        for atom in integrand.atoms(*self.NONSMOOTH):
+            if not atom.has(var):
+                continue
+            if isinstance(atom, (sp.Abs, sp.sign, sp.Heaviside)):
+                switches = [atom.args[0]]
+            elif isinstance(atom, (sp.Max, sp.Min)):
+                switches = [p - q for index, p in enumerate(atom.args) for q in atom.args[index + 1:]]
+            else:
+                return None
+
+            for switch in switches:
+                if not switch.has(var):
+                    continue
+                if not switch.is_polynomial(var):
+                    return None
+                for root in sp.Poly(switch, var).nroots():
+                    root = complex(root)
+                    if abs(root.imag) < 1e-12 and low < root.real < high:
+                        points.add(root.real)
+        return sorted(points, reverse=a > b)
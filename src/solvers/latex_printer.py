@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import sympy as sp
+from functools import lru_cache
+from typing import Optional
+from sympy.printing.latex import LatexPrinter
+
+class SolverLatexPrinter(LatexPrinter):
+    """LatexPrinter in the style of the generated documents: \\dfrac, e^{}, \\sin(x) and implicit products.
+
+    Fractions are printed from the numerator and denominator of each product
+    rather than by patching LatexPrinter's \\frac output.
+    """
+
+    FUNCTION_OPEN = '{\\left('
+    FUNCTION_CLOSE = ' \\right)}'
+
+    def __init__(self, settings=None):
+        # asin -> \arcsin, as written in the input exercises
+        super().__init__({'inv_trig_style': 'full', **(settings or {})})
+
+    def _print_Mul(self, expr) -> str:
+        # Pow with a negative exponent is also printed through here
+        numerator, denominator = sp.fraction(expr, exact=True)
+        if denominator == 1:
+            return super()._print_Mul(expr)
+
+        sign = ''
+        if numerator.could_extract_minus_sign():
+            sign, numerator = '- ', -numerator
+        # Unevaluated trees (integral setups) keep the 1 of 1/2*y as a factor
+        numerator = sp.Mul(*[factor for factor in sp.Mul.make_args(numerator) if factor != 1], evaluate=False)
+        return f'{sign}\\dfrac{{{self._print(numerator)}}}{{{self._print(denominator)}}}'
+
+    def _print_Rational(self, expr) -> str:
+        if expr.q == 1:
+            return super()._print_Rational(expr)
+        sign = '- ' if expr.p < 0 else ''
+        return f'{sign}\\dfrac{{{abs(expr.p)}}}{{{expr.q}}}'
+
+    def _add_parens(self, s) -> str:
+        # (1 + x y)^{2}, not \\left(1 + x y\\right)^{2}
+        return f'({s})'
+
+    def _add_parens_lspace(self, s) -> str:
+        return f'({s})'
+
+    def _print_Function(self, expr, exp=None) -> str:
+        return self._plain_brackets(super()._print_Function(expr, exp))
+
+    def _print_log(self, expr, exp=None) -> str:
+        return self._plain_brackets(super()._print_log(expr, exp))
+
+    def _plain_brackets(self, text: str) -> str:
+        """\\sin{\\left(x \\right)} -> \\sin(x), \\log{\\left(x \\right)}^{2} -> \\log(x)^{2}"""
+        # Arguments are printed first, so the outermost bracket pair belongs to this function
+        opening = text.find(self.FUNCTION_OPEN)
+        closing = text.rfind(self.FUNCTION_CLOSE)
+        if opening == -1 or closing < opening:
+            return text
+        arguments = text[opening + len(self.FUNCTION_OPEN):closing]
+        return f'{text[:opening]}({arguments}){text[closing + len(self.FUNCTION_CLOSE):]}'
+
+class LatexRenderer:
+    """Renders SymPy trees with SolverLatexPrinter, reusing the LaTeX of identical trees"""
+
+    def __init__(self, cache_size: int = 4096):
+        self.printer = SolverLatexPrinter()
+        # Unevaluated trees print their terms in the order they were written
+        self.written_order_printer = SolverLatexPrinter({'order': 'none'})
+        self._render_cached = lru_cache(maxsize=cache_size)(self.printer.doprint)
+        self._render_written_cached = lru_cache(maxsize=cache_size)(self.written_order_printer.doprint)
+
+    def render(self, expr: sp.Basic) -> str:
+        return self._render_cached(expr)
+
+    def render_as_written(self, expr: sp.Basic) -> str:
+        """Render a tree parsed with evaluate=False, keeping the input's term order"""
+        return self._render_written_cached(expr)
+
+    def cache_info(self):
+        return self._render_cached.cache_info()
+
+    def clear_cache(self) -> None:
+        self._render_cached.cache_clear()
+        self._render_written_cached.cache_clear()
+
+_shared_renderer: Optional[LatexRenderer] = None
+
+def get_shared_renderer() -> LatexRenderer:
+    """Process-wide renderer, so every exercise shares one printer and its cache"""
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = LatexRenderer()
+    return _shared_renderer
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import sympy as sp
+
+TRIG_FUNCTIONS = (sp.sin, sp.cos, sp.tan, sp.cot, sp.sec, sp.csc)
+
+class SimplificationPolicy:
+    """Decides how results are simplified between and after nested integrations"""
+
+    # full:   sp.simplify after every integration stage (original behaviour)
+    # tiered: cheap canonicalization and trig folding between stages, one full simplify at the end
+    # final:  no work between stages, one full simplify at the end
+    POLICIES = ('full', 'tiered', 'final')
+
+    def __init__(self, name: str = 'tiered', size_budget: int = 400):
+        if name not in self.POLICIES:
+            raise ValueError(f"Unknown simplification policy '{name}'")
+
+        self.name = name
+        # Expressions with more operations than this skip the full simplify
+        self.size_budget = size_budget
+
+    def between_stages(self, expr: sp.Expr) -> sp.Expr:
+        """Simplify an intermediate result before it becomes the next integrand"""
+        if self.name == 'full':
+            return sp.simplify(expr)
+        if self.name == 'tiered':
+            return self.fold_trig(self.canonicalize(expr))
+        return expr
+
+    def final(self, expr: sp.Expr) -> sp.Expr:
+        """Simplify the result of the outermost integral"""
+        if self.name == 'full':
+            return sp.simplify(expr)
+        if sp.count_ops(expr) > self.size_budget:
+            return self.canonicalize(expr)
+        return sp.simplify(expr)
+
+    def canonicalize(self, expr: sp.Expr) -> sp.Expr:
+        """Cheap normal form: expand polynomials, cancel rational functions, distribute products"""
+        if expr.is_polynomial():
+            candidate = sp.expand(expr)
+        elif expr.is_rational_function():
+            candidate = sp.cancel(expr)
+        else:
+            # Distribute products and sums without rewriting powers or logs
+            candidate = sp.expand(expr, power_base=False, power_exp=False, log=False)
+
+        # Expansion can blow up (e.g. high powers of sums); keep the smaller form
+        if sp.count_ops(candidate) > max(self.size_budget, sp.count_ops(expr)):
+            return expr
+        return candidate
+
+    def fold_trig(self, expr: sp.Expr) -> sp.Expr:
+        """trigsimp on the terms that contain trig functions only (sin**2 + cos**2, double angles)"""
+        trig_terms = [term for term in sp.Add.make_args(expr) if term.has(*TRIG_FUNCTIONS)]
+        if not trig_terms:
+            return expr
+
+        trig_part = sp.Add(*trig_terms)
+        if sp.count_ops(trig_part) > self.size_budget:
+            return expr
+        other_terms = [term for term in sp.Add.make_args(expr) if not term.has(*TRIG_FUNCTIONS)]
+        candidate = sp.Add(*other_terms, sp.trigsimp(trig_part))
+
+        # Keep the folded form only when it is not larger
+        if sp.count_ops(candidate) > sp.count_ops(expr):
+            return expr
+        return candidate
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+import multiprocessing
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module
+    resource = None
+
+@dataclass
+class BudgetResult:
+    """Outcome of a call executed under a time/memory budget"""
+    status: str                 # 'ok', 'timeout', 'memory' or 'error'
+    value: Any = None
+    message: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+def _current_address_space() -> int:
+    """Virtual memory currently mapped by this process, in bytes"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[0])
+        return pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _budget_child(conn, func: Callable, args: Tuple, memory_limit_mb: Optional[float]) -> None:
+    """Entry point of the isolated worker process"""
+    if memory_limit_mb and resource is not None:
+        # The limit is measured on top of what the forked process already maps
+        limit = _current_address_space() + int(memory_limit_mb * 1024 * 1024)
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    try:
+        conn.send(('ok', func(*args)))
+    except MemoryError:
+        conn.send(('memory', f"memory limit of {memory_limit_mb:g} MB exceeded" if memory_limit_mb else "out of memory"))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+def budget_supported() -> bool:
+    """Budgets need fork() so the child inherits the loaded solver"""
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def run_with_budget(func: Callable, args: Tuple = (), time_limit: Optional[float] = None,
+                    memory_limit_mb: Optional[float] = None) -> BudgetResult:
+    """Run func(*args) in a killable child process with wall-clock and memory limits"""
+    start = time.time()
+
+    if not budget_supported():
+        # No isolation available: run inline without limits
+        try:
+            return BudgetResult('ok', func(*args), elapsed=time.time() - start)
+        except Exception as e:
+            return BudgetResult('error', message=str(e), elapsed=time.time() - start)
+
+    context = multiprocessing.get_context('fork')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_budget_child,
+        args=(child_conn, func, args, memory_limit_mb),
+        daemon=True
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        if parent_conn.poll(time_limit):
+            try:
+                status, payload = parent_conn.recv()
+            except EOFError:
+                # The child died without reporting, e.g. killed while allocating
+                status, payload = 'memory', "worker terminated unexpectedly (likely memory limit)"
+        else:
+            status, payload = 'timeout', f"time limit of {time_limit:g}s exceeded"
+    finally:
+        parent_conn.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    elapsed = time.time() - start
+    if status == 'ok':
+        return BudgetResult('ok', payload, elapsed=elapsed)
+    return BudgetResult(status, message=payload, elapsed=elapsed)
+
+def race_with_budget(calls: List[Tuple[str, Callable, Tuple]], time_limit: Optional[float] = None,
+                     memory_limit_mb: Optional[float] = None,
+                     accept: Optional[Callable[[str, Any], bool]] = None) -> Tuple[Optional[str], BudgetResult]:
+    """Run several calls concurrently and return the first accepted result.
+
+    Each call is a (name, func, args) tuple running in its own killable child;
+    accept(name, value) decides whether a result wins.
+    Remaining children are killed as soon as a result is accepted or the time
+    limit expires. Returns (None, result) when nothing was accepted.
+    """
+    start = time.time()
+
+    if not budget_supported():
+        # Without fork, fall back to trying the calls one after another
+        for name, func, args in calls:
+            try:
+                value = func(*args)
+            except Exception:
+                continue
+            if accept is None or accept(name, value):
+                return name, BudgetResult('ok', value, elapsed=time.time() - start)
+        return None, BudgetResult('error', message="no call produced an accepted result",
+                                  elapsed=time.time() - start)
+
+    context = multiprocessing.get_context('fork')
+    running = {}
+    for name, func, args in calls:
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_budget_child,
+            args=(child_conn, func, args, memory_limit_mb),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        running[parent_conn] = (name, process)
+
+    winner = None
+    outcome = None
+    out_of_memory = False
+    try:
+        while running and winner is None:
+            remaining = None
+            if time_limit is not None:
+                remaining = time_limit - (time.time() - start)
+                if remaining <= 0:
+                    break
+
+            for conn in wait(list(running), timeout=remaining):
+                name, process = running.pop(conn)
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    status, payload = 'memory', "worker terminated unexpectedly"
+                conn.close()
+                process.join()
+
+                out_of_memory = out_of_memory or status == 'memory'
+                if status == 'ok' and (accept is None or accept(name, payload)):
+                    winner = name
+                    outcome = BudgetResult('ok', payload, elapsed=time.time() - start)
+                    break
+    finally:
+        for conn, (name, process) in running.items():
+            conn.close()
+            if process.is_alive():
+                process.kill()
+        for conn, (name, process) in running.items():
+            process.join()
+
+    if winner is not None:
+        return winner, outcome
+
+    if running:
+        status, message = 'timeout', f"time limit of {time_limit:g}s exceeded"
+    elif out_of_memory:
+        status, message = 'memory', f"memory limit of {memory_limit_mb:g} MB exceeded" if memory_limit_mb else "out of memory"
+    else:
+        status, message = 'error', "no call produced an accepted result"
+    return None, BudgetResult(status, message=message, elapsed=time.time() - start)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from utils.file_handler import FileHandler
+from utils.json_stream import IntermediateJSONWriter, JSONObjectStream
+
+# Layout of a binary intermediate file:
+#
+#   MAGIC
+#   exercise records     <u32 length><compact UTF-8 JSON>, in exercise order
+#   metadata record      written last, once processing_info is known
+#   index                <u64 offset> of every exercise record
+#   TRAILER              metadata offset, index offset, exercise count, MAGIC
+#
+# Each record is the exercise (or metadata) object of the JSON schema, so the
+# conversion in either direction is lossless.
+MAGIC = b'MSREC\x00\x01\n'
+RECORD_HEADER = struct.Struct('<I')
+TRAILER = struct.Struct('<QQQ8s')
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class BinaryIntermediateWriter:
+    """Writes a binary intermediate file exercise by exercise.
+
+    Same interface as IntermediateJSONWriter; the metadata goes after the
+    exercises, so no temporary exercise file is needed.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._partial_path = f"{filepath}.part"
+        self._file = open(self._partial_path, 'wb')
+        self._file.write(MAGIC)
+        self._offsets: List[int] = []
+        self.count = 0
+
+    def add_exercise(self, exercise: Dict[str, Any]) -> None:
+        self._offsets.append(self._file.tell())
+        self._write_record(exercise)
+        self.count += 1
+
+    def close(self, metadata: Dict[str, Any]) -> None:
+        """Write the metadata, index and trailer, then move the file into place"""
+        try:
+            metadata_offset = self._file.tell()
+            self._write_record(metadata)
+            index_offset = self._file.tell()
+            self._file.write(struct.pack(f'<{self.count}Q', *self._offsets))
+            self._file.write(TRAILER.pack(metadata_offset, index_offset, self.count, MAGIC))
+            self._file.close()
+            os.replace(self._partial_path, self.filepath)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._partial_path):
+            os.remove(self._partial_path)
+
+    def _write_record(self, value: Any) -> None:
+        payload = _encode(value)
+        self._file.write(RECORD_HEADER.pack(len(payload)))
+        self._file.write(payload)
+
+class BinaryIntermediateReader:
+    """Random-access reader for a binary intermediate file.
+
+    Opening reads only the trailer and index; the metadata and each exercise
+    are decoded when accessed, so one exercise of a large bank can be read
+    without parsing the others.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._file: BinaryIO = open(filepath, 'rb')
+        try:
+            self._read_index()
+        except BaseException:
+            self._file.close()
+            raise
+        self._metadata: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> 'BinaryIntermediateReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._read_record(self._offsets[index])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for offset in self._offsets:
+            yield self._read_record(offset)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = self._read_record(self._metadata_offset)
+        return self._metadata
+
+    def load(self) -> Dict[str, Any]:
+        """The whole intermediate data, as FileHandler.load_json returns it for the JSON file"""
+        return {'metadata': self.metadata, 'exercises': list(self)}
+
+    def _read_index(self) -> None:
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a binary intermediate file: {self.filepath}")
+        try:
+            self._file.seek(-TRAILER.size, os.SEEK_END)
+            metadata_offset, index_offset, count, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        except (OSError, struct.error):
+            magic = None
+        if magic != MAGIC:
+            raise ValueError(f"Truncated binary intermediate file: {self.filepath}")
+
+        self._file.seek(index_offset)
+        index = self._file.read(8 * count)
+        if len(index) != 8 * count:
+            raise ValueError(f"Truncated binary intermediate file: {self.filepath}")
+        self._offsets = struct.unpack(f'<{count}Q', index)
+        self._metadata_offset = metadata_offset
+
+    def _read_record(self, offset: int) -> Any:
+        self._file.seek(offset)
+        header = self._file.read(RECORD_HEADER.size)
+        length = RECORD_HEADER.unpack(header)[0] if len(header) == RECORD_HEADER.size else -1
+        payload = self._file.read(max(length, 0))
+        if length < 0 or len(payload) != length:
+            raise ValueError(f"Truncated record at offset {offset} in {self.filepath}")
+        return json.loads(payload.decode('utf-8'))
+
+class JSONIntermediateFormat:
+    """Pretty-printed intermediate JSON, as documented in docs/DATA_FORMATS.md"""
+
+    name = 'json'
+    extension = 'json'
+    label = 'JSON'
+
+    def save(self, data: Dict[str, Any], filepath: str) -> None:
+        FileHandler.save_json(data, filepath)
+
+    def load(self, filepath: str) -> Dict[str, Any]:
+        return FileHandler.load_json(filepath)
+
+    def load_metadata(self, filepath: str) -> Dict[str, Any]:
+        return self.load(filepath)['metadata']
+
+    def iter_exercises(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        return JSONObjectStream(filepath).iter_array('exercises')
+
+    def writer(self, filepath: str) -> IntermediateJSONWriter:
+        return IntermediateJSONWriter(filepath)
+
+class BinaryIntermediateFormat:
+    """Length-prefixed records with an exercise index, read lazily or by index"""
+
+    name = 'binary'
+    extension = 'msr'
+    label = 'records'
+
+    def save(self, data: Dict[str, Any], filepath: str) -> None:
+        writer = BinaryIntermediateWriter(filepath)
+        try:
+            for exercise in data['exercises']:
+                writer.add_exercise(exercise)
+            writer.close(data['metadata'])
+        except BaseException:
+            writer.discard()
+            raise
+
+    def load(self, filepath: str) -> Dict[str, Any]:
+        with BinaryIntermediateReader(filepath) as reader:
+            return reader.load()
+
+    def load_metadata(self, filepath: str) -> Dict[str, Any]:
+        with BinaryIntermediateReader(filepath) as reader:
+            return reader.metadata
+
+    def iter_exercises(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        with BinaryIntermediateReader(filepath) as reader:
+            yield from reader
+
+    def writer(self, filepath: str) -> BinaryIntermediateWriter:
+        return BinaryIntermediateWriter(filepath)
+
+INTERMEDIATE_FORMATS = {
+    'json': JSONIntermediateFormat(),
+    'binary': BinaryIntermediateFormat()
+}
+
+def get_intermediate_format(name: str):
+    if name not in INTERMEDIATE_FORMATS:
+        raise ValueError(f"Unknown intermediate format '{name}'")
+    return INTERMEDIATE_FORMATS[name]
+
+def detect_intermediate_format(filepath: str):
+    """Format of an existing intermediate file, from its first bytes"""
+    with open(filepath, 'rb') as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    return INTERMEDIATE_FORMATS['binary' if is_binary else 'json']
+
+def format_for_extension(filepath: str):
+    """Format of an intermediate file to be written, from its extension"""
+    suffix = Path(filepath).suffix.lstrip('.')
+    for intermediate_format in INTERMEDIATE_FORMATS.values():
+        if intermediate_format.extension == suffix:
+            return intermediate_format
+    raise ValueError(f"Unknown intermediate file extension '.{suffix}' (use .json or .msr)")
+
+def convert_intermediate(source: str, target: str) -> int:
+    """Convert between the JSON and binary intermediate formats, one exercise at a time.
+
+    The formats follow the extensions; converting JSON written by the solver
+    to binary and back reproduces it byte for byte. Returns the number of
+    exercises converted.
+    """
+    source_format = detect_intermediate_format(source)
+    target_format = format_for_extension(target)
+
+    writer = target_format.writer(target)
+    try:
+        for exercise in source_format.iter_exercises(source):
+            writer.add_exercise(exercise)
+        writer.close(source_format.load_metadata(source))
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.count
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+class JSONObjectStream:
+    """Incremental reader for a top-level JSON object with one large array member.
+
+    Values are decoded one at a time with json.JSONDecoder.raw_decode over a
+    bounded text buffer, so an assignment with tens of thousands of exercises
+    is never held in memory at once.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    WHITESPACE = ' \t\n\r'
+
+    def __init__(self, filepath: str, chunk_size: int = CHUNK_SIZE):
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def read_members(self, array_key: str) -> Dict[str, Any]:
+        """Every top-level member except array_key, whose elements are skipped"""
+        members = {}
+        for key, value in self._iter_members(array_key):
+            if key != array_key:
+                members[key] = value
+        return members
+
+    def iter_array(self, array_key: str) -> Iterator[Any]:
+        """Elements of the top-level array array_key, one at a time"""
+        for key, value in self._iter_members(array_key, stream_array=True):
+            if key == array_key:
+                yield from value
+                return
+
+    def _iter_members(self, array_key: str, stream_array: bool = False) -> Iterator[Tuple[str, Any]]:
+        with open(self.filepath, 'r', encoding='utf-8') as f:
+            self._file = f
+            self._buffer = ''
+            self._pos = 0
+            self._eof = False
+
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                key = self._decode_value()
+                if not isinstance(key, str):
+                    raise ValueError(f"Invalid JSON in {self.filepath}: expected an object key")
+                self._expect(':')
+
+                if key == array_key and self._peek() == '[':
+                    elements = self._iter_elements()
+                    if stream_array:
+                        yield key, elements
+                        return
+                    for _ in elements:
+                        pass
+                    yield key, None
+                else:
+                    yield key, self._decode_value()
+
+                if self._next_char() == '}':
+                    return
+                self._pos -= 1
+                self._expect(',')
+
+    def _iter_elements(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode_value()
+            separator = self._next_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Invalid JSON in {self.filepath}: expected ',' or ']' in array")
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already consumed"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError(f"Invalid JSON in {self.filepath}: unexpected end of file")
+
+    def _next_char(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, expected: str) -> None:
+        char = self._next_char()
+        if char != expected:
+            raise ValueError(f"Invalid JSON in {self.filepath}: expected '{expected}', found '{char}'")
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Most likely the value continues in the next chunk
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid JSON in {self.filepath}: {e}")
+
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+class IntermediateJSONWriter:
+    """Writes an intermediate JSON incrementally, exercise by exercise.
+
+    Exercises are appended to a temporary file as they are produced; close()
+    writes the metadata (known only at the end) followed by the exercises.
+    The result is byte-for-byte what FileHandler.save_json writes.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        directory = os.path.dirname(os.path.abspath(filepath))
+        fd, self._exercises_path = tempfile.mkstemp(prefix='.exercises-', suffix='.part', dir=directory)
+        self._exercises = os.fdopen(fd, 'w', encoding='utf-8')
+        self.count = 0
+
+    def add_exercise(self, exercise: Dict[str, Any]) -> None:
+        text = json.dumps(exercise, indent=2, ensure_ascii=False)
+        if self.count:
+            self._exercises.write(',\n')
+        self._exercises.write('    ' + text.replace('\n', '\n    '))
+        self.count += 1
+
+    def close(self, metadata: Dict[str, Any]) -> None:
+        """Write the final file atomically and remove the temporary exercise file"""
+        self._exercises.close()
+        head = json.dumps({'metadata': metadata}, indent=2, ensure_ascii=False)[:-2]
+        partial_path = f"{self.filepath}.part"
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as out:
+                out.write(head + ',\n  "exercises": [')
+                if self.count:
+                    out.write('\n')
+                    with open(self._exercises_path, 'r', encoding='utf-8') as exercises:
+                        shutil.copyfileobj(exercises, out)
+                    out.write('\n  ')
+                out.write(']\n}')
+            os.replace(partial_path, self.filepath)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        if not self._exercises.closed:
+            self._exercises.close()
+        for path in (self._exercises_path, f"{self.filepath}.part"):
+            if os.path.exists(path):
+                os.remove(path)
+
+class JSONContentHash:
+    """Hash of an assignment fed one part at a time, independent of formatting and key order"""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+
+    def update(self, value: Any) -> None:
+        canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=True)
+        self._hash.update(canonical.encode('utf-8'))
+        self._hash.update(b'\n')
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+def assignment_content_hash(metadata: Dict[str, Any], exercises: Optional[Any] = None) -> JSONContentHash:
+    """Start a content hash with the assignment metadata and optionally its exercises"""
+    content_hash = JSONContentHash()
+    content_hash.update(metadata)
+    for exercise in exercises or ():
+        content_hash.update(exercise)
+    return content_hash
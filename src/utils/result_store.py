@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# solutions: one row per canonical exercise (integrand, limits, solver version
+# and settings), shared by every assignment that contains it.
+# occurrences: where each solution appears, with the assignment-specific units.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    exercise_hash      TEXT PRIMARY KEY,
+    function           TEXT NOT NULL,
+    integrals          TEXT NOT NULL,
+    coordinate_system  TEXT,
+    exact              TEXT,
+    decimal            REAL,
+    integration_method TEXT,
+    solve_ms           REAL,
+    solver_version     TEXT NOT NULL,
+    solved_at          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_by_shape ON solutions (coordinate_system, solve_ms);
+
+CREATE TABLE IF NOT EXISTS occurrences (
+    assignment    TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    course        TEXT,
+    exercise_id   TEXT NOT NULL,
+    id_letter     TEXT,
+    id_part       INTEGER,
+    exercise_hash TEXT NOT NULL,
+    quantity_type TEXT,
+    units         TEXT,
+    recorded_at   TEXT NOT NULL,
+    PRIMARY KEY (assignment, position)
+);
+CREATE INDEX IF NOT EXISTS occurrences_by_hash ON occurrences (exercise_hash);
+CREATE INDEX IF NOT EXISTS occurrences_by_course ON occurrences (course);
+
+CREATE VIEW IF NOT EXISTS results AS
+SELECT o.assignment, o.course, o.position, o.exercise_id, o.id_letter, o.id_part,
+       o.exercise_hash, s.function, s.integrals, s.coordinate_system,
+       s.exact, s.decimal, o.quantity_type, o.units,
+       s.integration_method, s.solve_ms, s.solver_version, o.recorded_at
+FROM occurrences o JOIN solutions s ON s.exercise_hash = o.exercise_hash;
+"""
+
+# Re-recording a solution keeps the longest solve observed, so a later cache
+# hit does not hide how expensive the exercise is; a failed retry never
+# replaces an exact result
+UPSERT_SOLUTION = """
+INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (exercise_hash) DO UPDATE SET
+    coordinate_system = excluded.coordinate_system,
+    exact = excluded.exact,
+    decimal = excluded.decimal,
+    integration_method = excluded.integration_method,
+    solve_ms = MAX(COALESCE(solutions.solve_ms, 0), COALESCE(excluded.solve_ms, 0)),
+    solved_at = excluded.solved_at
+WHERE excluded.exact IS NOT NULL OR solutions.exact IS NULL
+"""
+
+INSERT_OCCURRENCE = "INSERT OR REPLACE INTO occurrences VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+class ResultStore:
+    """Embedded SQLite record of every solved exercise, indexed by exercise hash, assignment and course.
+
+    The solver consults it before solving; the `results` view answers
+    queries across assignments without reading intermediate files.
+    """
+
+    DEFAULT_PATH = 'data/results.sqlite'
+
+    def __init__(self, path: str = DEFAULT_PATH, solver_version: str = '', readonly: bool = False):
+        self.path = path
+        self.solver_version = solver_version
+        self.readonly = readonly
+        self.stats = {'hits': 0, 'misses': 0, 'recorded': 0}
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # The async API solves on a separate thread while results are recorded
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema on first use"""
+        if self._connection is None and self.readonly:
+            # Queries never create or modify the database
+            if not Path(self.path).exists():
+                raise FileNotFoundError(f"Result store not found: {self.path}")
+            self._connection = sqlite3.connect(f"{Path(self.path).resolve().as_uri()}?mode=ro", uri=True)
+            self._connection.row_factory = sqlite3.Row
+
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+
+            # Pool workers read while the main process writes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get_solution(self, exercise_hash: str) -> Optional[Tuple[Optional[str], Optional[float], str]]:
+        """The stored (exact, decimal, method) triple, or None when there is no reusable result.
+
+        Failed solves and budget fallbacks are not reused, so they are retried.
+        """
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT exact, decimal, integration_method FROM solutions WHERE exercise_hash = ?",
+                    (exercise_hash,)
+                ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        method = row['integration_method'] if row else None
+        reusable = row is not None and (
+            row['exact'] is not None or (method == 'numeric' and row['decimal'] is not None)
+        )
+        if not reusable:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return row['exact'], row['decimal'], method
+
+    def record(self, metadata: Dict[str, Any], exercises: Iterable[Tuple[int, str, Dict[str, Any]]],
+               replace: bool = True) -> int:
+        """Record the processed exercises of an assignment.
+
+        exercises yields (position, exercise hash, processed exercise).
+        With replace, earlier occurrences of the assignment are dropped first,
+        so removed exercises disappear. Exercises that failed outright are
+        skipped. Returns the number recorded (0 if the database is unavailable).
+        """
+        assignment = metadata['file_info']['base_name']
+        course = metadata.get('course', {}).get('name')
+        now = datetime.now().isoformat(timespec='seconds')
+
+        solutions = []
+        occurrences = []
+        for position, exercise_hash, exercise in exercises:
+            details = exercise.get('computation_details') or {}
+            if details.get('integration_method') is None:
+                continue
+            solution = exercise.get('solution') or {}
+            solve_ms = (details.get('timings') or {}).get('solve')
+            solutions.append((
+                exercise_hash, exercise['function'], json.dumps(exercise['integrals'], ensure_ascii=False),
+                exercise.get('coordinate_system'), solution.get('exact'), solution.get('decimal'),
+                details['integration_method'], solve_ms, self.solver_version, now
+            ))
+            occurrences.append((
+                assignment, position, course, exercise['id'], exercise.get('id_letter'), exercise.get('id_part'),
+                exercise_hash, solution.get('quantity_type'), solution.get('units'), now
+            ))
+
+        # A locked or unwritable database never fails the assignment itself
+        try:
+            with self._lock, self.connection:
+                if replace:
+                    self.connection.execute("DELETE FROM occurrences WHERE assignment = ?", (assignment,))
+                self.connection.executemany(UPSERT_SOLUTION, solutions)
+                self.connection.executemany(INSERT_OCCURRENCE, occurrences)
+        except sqlite3.Error as e:
+            logger.warning("Could not record results in %s: %s", self.path, e)
+            return 0
+
+        self.stats['recorded'] += len(occurrences)
+        return len(occurrences)
+
+    def query(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def summary(self) -> str:
+        """Human readable statistics line"""
+        return f"{self.stats['hits']} reused, {self.stats['recorded']} recorded"
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
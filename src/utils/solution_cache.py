@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+class SolutionCache:
+    """Persistent content-addressed cache for solved integrals with LRU eviction"""
+
+    def __init__(self, cache_dir: str = 'data/cache/solutions', max_entries: int = 5000,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+        # Entry count and size are scanned lazily on the first write
+        self._entry_count: Optional[int] = None
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Hash a JSON-serializable payload into a stable cache key"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            self.stats['misses'] += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.stats['hits'] += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry atomically and evict old entries if the cache is full"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        existed = path.exists()
+        previous_size = path.stat().st_size if existed else 0
+
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+
+        # Write to a temporary file first so concurrent readers never see partial JSON
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.stats['writes'] += 1
+
+        self._scan_if_needed()
+        if not existed:
+            self._entry_count += 1
+        self._total_bytes += len(data) - previous_size
+
+        if self._entry_count > self.max_entries or self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> int:
+        """Remove every cached entry and return how many were deleted"""
+        removed = 0
+        for path in self._list_entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+
+        self._entry_count = 0
+        self._total_bytes = 0
+        return removed
+
+    @property
+    def lookups(self) -> int:
+        return self.stats['hits'] + self.stats['misses']
+
+    def summary(self) -> str:
+        """Human readable statistics line"""
+        lookups = self.lookups
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups else 0.0
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses "
+                f"({hit_rate:.0f}% hit rate), {self.stats['writes']} writes, "
+                f"{self.stats['evictions']} evictions")
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _list_entries(self) -> List[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob('*.json'))
+
+    def _scan_if_needed(self) -> None:
+        if self._entry_count is not None:
+            return
+
+        entries = self._list_entries()
+        self._entry_count = len(entries)
+        self._total_bytes = 0
+        for path in entries:
+            try:
+                self._total_bytes += path.stat().st_size
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its bounds"""
+        entries = []
+        for path in self._list_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest access time first
+        entries.sort(key=lambda item: item[0])
+
+        count = len(entries)
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+            self.stats['evictions'] += 1
+
+        self._entry_count = count
+        self._total_bytes = total
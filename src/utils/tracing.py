@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+class SpanRecorder:
+    """Timed spans of one unit of work: an exercise or a whole assignment"""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    def add(self, name: str, start: float, duration: float, args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a span; start is wall-clock (epoch) seconds so spans of several processes line up"""
+        self.spans.append({
+            'name': name,
+            'start': start,
+            'duration': duration,
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': args or {}
+        })
+
+    def timings(self) -> Dict[str, float]:
+        """Milliseconds per stage, summed over repeated spans of the same name"""
+        totals: Dict[str, float] = {}
+        for recorded in self.spans:
+            totals[recorded['name']] = totals.get(recorded['name'], 0.0) + recorded['duration'] * 1000
+        return {name: round(total, 3) for name, total in totals.items()}
+
+_local = threading.local()
+
+@contextmanager
+def recording(recorder: SpanRecorder) -> Iterator[SpanRecorder]:
+    """Send the spans opened by this thread to recorder until the block exits"""
+    previous = getattr(_local, 'recorder', None)
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+
+@contextmanager
+def span(name: str, **args) -> Iterator[None]:
+    """Time a stage; a no-op unless the current thread is recording"""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        yield
+        return
+
+    start = time.time()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, start, time.perf_counter() - started, args)
+
+class TraceWriter:
+    """Collects spans from every exercise and assignment and writes Chrome trace-event JSON.
+
+    The file opens in chrome://tracing and https://ui.perfetto.dev; each worker
+    process and thread gets its own track.
+    """
+
+    # Thread ids of named tracks, well above real native thread ids' usual range
+    TRACK_BASE = 1 << 40
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._tracks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, spans: List[Dict[str, Any]]) -> None:
+        events = [
+            {
+                'name': recorded['name'],
+                'cat': 'math-solver',
+                'ph': 'X',
+                'ts': round(recorded['start'] * 1e6, 3),
+                'dur': round(recorded['duration'] * 1e6, 3),
+                'pid': recorded['pid'],
+                'tid': recorded['tid'],
+                'args': recorded['args']
+            }
+            for recorded in spans
+        ]
+        with self._lock:
+            self._events.extend(events)
+
+    def add_span(self, name: str, start: float, duration: float, track: str, **args) -> None:
+        """Span measured outside a recorder (e.g. a pdflatex job), shown on its own named track"""
+        with self._lock:
+            tid = self._tracks.setdefault(track, self.TRACK_BASE + len(self._tracks))
+        self.add([{
+            'name': name, 'start': start, 'duration': duration,
+            'pid': os.getpid(), 'tid': tid, 'args': args
+        }])
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def write(self, path: str) -> None:
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event['ts'])
+            tracks = dict(self._tracks)
+
+        # Name the processes (main and pool workers) and the named tracks
+        metadata = []
+        main_pid = os.getpid()
+        for pid in sorted({event['pid'] for event in events}):
+            metadata.append({
+                'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                'args': {'name': 'math-solver' if pid == main_pid else f'worker {pid}'}
+            })
+        for track, tid in tracks.items():
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': main_pid, 'tid': tid, 'args': {'name': track}})
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The sources use absolute imports from src/ (python src/main.py)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from models.exercise import Exercise
+
+BUNDLED_ASSIGNMENT = 'C3_2025_T16_3_integrales.json'
+
+@pytest.fixture(autouse=True)
+def isolated_workdir(tmp_path, monkeypatch):
+    """Orchestrators create data/ directories relative to the working directory"""
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def make_exercise_data():
+    """Factory of input exercise dicts; integrals are (var, lower, upper), innermost first"""
+    def make(function, *integrals, exercise_id='1'):
+        return {
+            'id': exercise_id,
+            'type': 'integral',
+            'function': function,
+            'integrals': [
+                {'var': var, 'limits': {'lower': lower, 'upper': upper}, 'order': order}
+                for order, (var, lower, upper) in enumerate(integrals, start=1)
+            ]
+        }
+    return make
+
+@pytest.fixture
+def make_exercise(make_exercise_data):
+    """Like make_exercise_data, but returns the Exercise model"""
+    return lambda *args, **kwargs: Exercise.from_dict(make_exercise_data(*args, **kwargs))
+
+@pytest.fixture
+def load_assignment():
+    """Factory of bundled input assignments, optionally cut to their first exercises"""
+    def load(name=BUNDLED_ASSIGNMENT, count=None):
+        assignment = json.loads((REPO_ROOT / 'data/input' / name).read_text(encoding='utf-8'))
+        if count is not None:
+            assignment['exercises'] = assignment['exercises'][:count]
+        return assignment
+    return load
+
+@pytest.fixture
+def write_assignment(tmp_path):
+    """Write an assignment to a file in the test's directory and return its path"""
+    def write(assignment, name='assignment.json'):
+        path = tmp_path / name
+        path.write_text(json.dumps(assignment), encoding='utf-8')
+        return path
+    return write
+
+FAKE_PDFLATEX = '''#!{python}
+"""Stand-in for pdflatex: records each run and writes <name>.pdf and <name>.log"""
+import os, sys, time
+tex = sys.argv[-1]
+base = os.path.splitext(tex)[0]
+with open(os.environ['FAKE_PDFLATEX_RUNS'], 'a') as runs:
+    runs.write(f"{{tex}} start {{time.time()}}\\n")
+time.sleep(float(os.environ.get('FAKE_PDFLATEX_SECONDS', '0')))
+source = open(tex).read()
+first_run = not os.path.exists(base + '.aux')
+open(base + '.aux', 'w').close()
+with open(base + '.log', 'w') as log:
+    log.write('Rerun to get cross-references right' if first_run and 'RERUN' in source else 'Output written')
+with open(base + '.pdf', 'w') as pdf:
+    pdf.write('%PDF-1.4 ' + source)
+with open(os.environ['FAKE_PDFLATEX_RUNS'], 'a') as runs:
+    runs.write(f"{{tex}} end {{time.time()}}\\n")
+'''
+
+@pytest.fixture
+def fake_pdflatex(tmp_path, monkeypatch):
+    """Put a fake pdflatex first on PATH; returns a function listing its (tex, event, time) records"""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    executable = bin_dir / 'pdflatex'
+    executable.write_text(FAKE_PDFLATEX.format(python=sys.executable), encoding='utf-8')
+    executable.chmod(0o755)
+    runs_path = tmp_path / 'pdflatex-runs.txt'
+    runs_path.touch()
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('FAKE_PDFLATEX_RUNS', str(runs_path))
+
+    def runs():
+        records = [line.split(' ') for line in runs_path.read_text().splitlines()]
+        return [(tex, event, float(when)) for tex, event, when in records]
+    return runs
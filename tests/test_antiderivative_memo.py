@@ -0,0 +1,34 @@
+import sympy as sp
+
+from models.exercise import Exercise
+from solvers.antiderivative_memo import AntiderivativeMemo, split_constant_factor
+from solvers.integral_solver import IntegralSolver
+
+def test_split_constant_factor():
+    r, t = sp.symbols('r t')
+    assert split_constant_factor(6 * r * sp.sin(t)) == (6, r * sp.sin(t))
+    assert split_constant_factor(sp.pi / 2) == (sp.pi / 2, 1)
+
+def test_memoized_stages_are_scaled_per_exercise(make_exercise):
+    solver = IntegralSolver(memo=AntiderivativeMemo())
+    assert solver.solve_symbolic(make_exercise('x*y', ('y', '0', '2'), ('x', '0', '1')))[0] == '1'
+    # Same inner stage up to the constant factor, then another upper limit of y
+    assert solver.solve_symbolic(make_exercise('3*x*y', ('y', '0', '2'), ('x', '0', '1')))[0] == '3'
+    assert solver.solve_symbolic(make_exercise('x*y', ('y', '0', 'x'), ('x', '0', '1')))[0] == '1/8'
+    assert solver.memo.stats['definite_hits'] >= 1
+
+def test_shared_memo_matches_fresh_solves(load_assignment):
+    assignment = load_assignment('C3_2025_T18_3_integrales.json')
+    shared = IntegralSolver(memo=AntiderivativeMemo())
+    for data in assignment['exercises']:
+        exercise = Exercise.from_dict(data)
+        fresh = IntegralSolver(memo=AntiderivativeMemo()).solve_symbolic(exercise)
+        assert shared.solve_symbolic(exercise)[:2] == fresh[:2], data['id']
+
+def test_memo_is_bounded():
+    memo = AntiderivativeMemo(max_entries=2)
+    x = sp.Symbol('x')
+    for power in range(3):
+        memo.put_antiderivative(x**power, x, x**(power + 1) / (power + 1), 'antiderivative')
+    assert memo.get_antiderivative(x**0, x) is None
+    assert memo.get_antiderivative(x**2, x) == (x**3 / 3, 'antiderivative')
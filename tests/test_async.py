@@ -0,0 +1,17 @@
+import asyncio
+
+from main import MathSolverOrchestrator
+
+def test_async_processing_reports_through_callback_only(load_assignment, write_assignment, capsys):
+    input_path = write_assignment(load_assignment(count=2))
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None)
+    messages = []
+
+    async def run():
+        return [exercise async for exercise in orchestrator.process_assignment_async(
+            str(input_path), lambda completed, total, message: messages.append(message))]
+
+    solved = asyncio.run(run())
+    assert len(solved) == 2
+    assert capsys.readouterr().out == ''
+    assert any(message.startswith('LaTeX file generated successfully') for message in messages)
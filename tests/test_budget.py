@@ -0,0 +1,58 @@
+import time
+
+import pytest
+import sympy as sp
+
+from main import MathSolverOrchestrator
+from models.exercise import Exercise
+from solvers.integration_strategies import IntegrationStrategyEngine
+from utils.budget import budget_supported, run_with_budget
+
+pytestmark = pytest.mark.skipif(not budget_supported(), reason="budgets need fork()")
+
+EXERCISE = {
+    'id': '1', 'type': 'integral', 'function': 'x*y',
+    'integrals': [
+        {'var': 'y', 'limits': {'lower': '0', 'upper': '1'}, 'order': 1},
+        {'var': 'x', 'limits': {'lower': '0', 'upper': '2'}, 'order': 2}
+    ]
+}
+
+def allocate(*args):
+    return bytearray(2 * 1024 ** 3)
+
+def sleep(*args):
+    time.sleep(10)
+
+def test_run_with_budget_reports_violations():
+    assert run_with_budget(allocate, memory_limit_mb=64).status == 'memory'
+    assert run_with_budget(sleep, time_limit=0.2).status == 'timeout'
+    assert run_with_budget(sum, ([1, 2],), time_limit=5).value == 3
+
+def out_of_memory(*args):
+    raise MemoryError
+
+def test_memory_error_without_a_memory_limit():
+    outcome = run_with_budget(out_of_memory, time_limit=5)
+    assert (outcome.status, outcome.message) == ('memory', 'out of memory')
+
+def test_strategy_engine_propagates_memory_error(monkeypatch):
+    monkeypatch.setitem(IntegrationStrategyEngine.STRATEGIES, 'antiderivative', out_of_memory)
+    engine = IntegrationStrategyEngine(['antiderivative', 'definite'])
+    x = sp.Symbol('x')
+    with pytest.raises(MemoryError):
+        engine.integrate(x, x, sp.Integer(0), sp.Integer(1))
+
+@pytest.mark.parametrize('limits, reason', [
+    ({'memory_limit': 64}, 'memory'),
+    ({'time_limit': 0.2}, 'timeout'),
+])
+def test_budget_violation_falls_back_to_numeric(limits, reason):
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, **limits)
+    solver = orchestrator.integral_solver
+    solver.solve_symbolic = allocate if reason == 'memory' else sleep
+
+    exact, decimal, method = orchestrator._solve_exercise(Exercise.from_dict(EXERCISE))
+    assert exact is None
+    assert method == f'numeric_fallback:{reason}'
+    assert decimal == pytest.approx(1.0)
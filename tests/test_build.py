@@ -0,0 +1,43 @@
+import pytest
+
+from main import MathSolverOrchestrator
+
+@pytest.fixture
+def sources(tmp_path, load_assignment, write_assignment):
+    """Two small assignments in tmp_path/inputs: name -> (path, assignment)"""
+    (tmp_path / 'inputs').mkdir()
+    written = {}
+    for name in ('C3_2025_T16_3_integrales.json', 'C3_2025_T18_3_integrales.json'):
+        assignment = load_assignment(name, count=2)
+        written[name] = (write_assignment(assignment, f'inputs/{name}'), assignment)
+    return written
+
+def _build(tmp_path, **options):
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, **options)
+    try:
+        return orchestrator.build([str(tmp_path / 'inputs')])
+    finally:
+        orchestrator.close()
+
+def _summary(built, up_to_date):
+    return {'built': built, 'up_to_date': up_to_date, 'failed': 0, 'pdf_failed': 0}
+
+def test_build_skips_unchanged_assignments(tmp_path, sources, write_assignment):
+    assert _build(tmp_path) == _summary(2, 0)
+    assert _build(tmp_path) == _summary(0, 2)
+
+    # Editing one input rebuilds only that assignment
+    path, assignment = sources['C3_2025_T16_3_integrales.json']
+    assignment['exercises'][0]['function'] = 'x*y'
+    write_assignment(assignment, f'inputs/{path.name}')
+    assert _build(tmp_path) == _summary(1, 1)
+
+    # Solver settings are part of the stamp
+    assert _build(tmp_path, simplify_policy='full') == _summary(2, 0)
+
+def test_missing_output_is_rebuilt(tmp_path, sources):
+    assert _build(tmp_path) == _summary(2, 0)
+    orchestrator = MathSolverOrchestrator(result_store=None)
+    _, tex_path = orchestrator._output_paths(sources['C3_2025_T18_3_integrales.json'][1]['metadata'])
+    (tmp_path / tex_path).unlink()
+    assert _build(tmp_path) == _summary(1, 1)
@@ -0,0 +1,27 @@
+import pytest
+
+from main import MathSolverOrchestrator
+from models.exercise import Exercise
+
+def test_intermediate_exercises_round_trip(load_assignment):
+    intermediate = MathSolverOrchestrator(use_cache=False, result_store=None).solve_assignment(load_assignment(count=4))
+    for entry in intermediate['exercises']:
+        assert Exercise.from_dict(entry).to_dict() == entry
+
+def test_models_are_slotted(make_exercise):
+    exercise = make_exercise('x*y', ('x', '0', '1'), ('y', '0', '2'))
+    for model in (exercise, exercise.integrals[0], exercise.integrals[0].limits):
+        assert not hasattr(model, '__dict__')
+    with pytest.raises(AttributeError):
+        exercise.undeclared = True
+
+def test_repeated_strings_are_shared(make_exercise_data):
+    def parsed():
+        # Strings built at runtime, as json.loads returns them: equal but not identical
+        data = make_exercise_data('x*y', (''.join(['th', 'eta']), '0', '1'))
+        data['type'] = ''.join(['inte', 'gral'])
+        return Exercise.from_dict(data)
+
+    first, second = parsed(), parsed()
+    assert first.integrals[0].var is second.integrals[0].var
+    assert first.type is second.type
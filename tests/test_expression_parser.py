@@ -0,0 +1,33 @@
+import pytest
+import sympy as sp
+
+from solvers.expression_parser import ExpressionParser
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+def test_parses_exercise_syntax(parser):
+    x, y = parser.symbols['x'], parser.symbols['y']
+    assert parser.parse('x**2 + 3*y^2') == x**2 + 3*y**2
+    assert parser.parse('1/2*y') == y / 2
+    assert parser.parse('6*exp(x + 2*y)') == 6 * sp.exp(x + 2 * y)
+    assert parser.parse('e*pi') == sp.E * sp.pi
+    assert parser.parse('abs(x) + max(x, y)') == sp.Abs(x) + sp.Max(x, y)
+
+@pytest.mark.parametrize('expression', [
+    "__import__('os').system('echo unsafe') + x",
+    "x.__class__",
+    "(1).__class__.__mro__",
+    "lambda: 1",
+    "'text'",
+    "[c for c in x]",
+])
+def test_rejects_code_injection(parser, expression):
+    with pytest.raises(ValueError):
+        parser.parse(expression)
+
+def test_eval_namespace_has_no_builtins(parser):
+    assert parser._global_dict['__builtins__'] == {}
+    assert 'eval' not in parser._global_dict
+    assert 'open' not in parser._global_dict
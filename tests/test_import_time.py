@@ -0,0 +1,15 @@
+import sys
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / 'benchmarks'))
+from check_import_time import BUDGET_MS, HEAVY_MODULES, measure_imports
+
+def test_importing_main_defers_heavy_modules():
+    timings = measure_imports()
+    assert sorted(name for name in timings if name.split('.')[0] in HEAVY_MODULES) == []
+
+def test_importing_main_stays_within_budget():
+    # Best of three fresh interpreters, so one slow run on a busy machine does not fail the budget
+    total_ms = min(measure_imports()['main'] for _ in range(3)) / 1000
+    assert total_ms <= BUDGET_MS, f"import main took {total_ms:.1f}ms (budget {BUDGET_MS:g}ms)"
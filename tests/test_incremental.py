@@ -0,0 +1,59 @@
+from main import MathSolverOrchestrator
+from solvers.integral_solver import IntegralSolver
+
+def _previous(*exercises):
+    return {
+        'metadata': {'file_info': {'exercise_hashes': [f'h{i}' for i in range(len(exercises))]}},
+        'exercises': list(exercises)
+    }
+
+def _processed(exact, decimal, method):
+    return {'solution': {'exact': exact, 'decimal': decimal},
+            'computation_details': {'integration_method': method}}
+
+def test_reusable_exercises_follow_result_store_rule():
+    previous = _previous(
+        _processed('50/3', 16.67, 'symbolic:antiderivative'),
+        _processed(None, 1.5, 'numeric'),
+        _processed(None, 1.5, 'numeric_fallback:timeout'),
+        _processed(None, None, 'symbolic:antiderivative'),
+        _processed(None, None, None),
+    )
+    assert set(MathSolverOrchestrator._reusable_exercises(previous)) == {'h0', 'h1'}
+
+def test_reusable_exercises_need_matching_hashes():
+    previous = _previous(_processed('1', 1.0, 'symbolic:antiderivative'))
+    previous['exercises'].append(_processed('2', 2.0, 'symbolic:antiderivative'))
+    assert MathSolverOrchestrator._reusable_exercises(previous) == {}
+
+def _build(input_path, incremental=True):
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, incremental=incremental)
+    orchestrator._run_assignment(str(input_path))
+    orchestrator.close()
+    return orchestrator
+
+def _outputs(orchestrator, metadata):
+    intermediate_path, tex_path = orchestrator._output_paths(metadata)
+    exercises = orchestrator.intermediate_format.load(intermediate_path)['exercises']
+    for exercise in exercises:
+        exercise['computation_details'].pop('timings')
+    with open(tex_path, encoding='utf-8') as f:
+        return exercises, f.read()
+
+def test_incremental_build_solves_only_the_changed_exercise(load_assignment, write_assignment, monkeypatch):
+    assignment = load_assignment(count=4)
+    input_path = write_assignment(assignment)
+    _build(input_path)
+
+    assignment['exercises'][1]['integrals'][0]['limits']['upper'] = '1'
+    write_assignment(assignment)
+    solved = []
+    solve = IntegralSolver.solve
+    monkeypatch.setattr(IntegralSolver, 'solve', lambda self, exercise: solved.append(exercise.id) or solve(self, exercise))
+    incremental = _outputs(_build(input_path), assignment['metadata'])
+    assert solved == [assignment['exercises'][1]['id']]
+
+    # The carried-over exercises give the same intermediate data and document as a full run
+    full = _outputs(_build(input_path, incremental=False), assignment['metadata'])
+    assert len(solved) == 5
+    assert incremental == full
@@ -0,0 +1,54 @@
+import pytest
+import sympy as sp
+
+from main import MathSolverOrchestrator
+from solvers.integral_planner import IntegralPlanner
+from solvers.integral_solver import IntegralSolver
+
+@pytest.fixture
+def planner():
+    return IntegralPlanner(IntegralSolver())
+
+def test_plan_groups_renamed_and_scaled_integrals(planner, make_exercise_data):
+    exercises = [
+        make_exercise_data('x*y', ('x', '0', '1'), ('y', '0', '2')),
+        make_exercise_data('3*theta*z', ('theta', '0', '1'), ('z', '0', '2')),
+        make_exercise_data('x*y', ('x', '0', '1'), ('y', '0', '3')),
+        make_exercise_data('pi*x*y', ('x', '0', '1'), ('y', '0', '2')),
+        # r is positive, so it is not interchangeable with x
+        make_exercise_data('r*y', ('r', '0', '1'), ('y', '0', '2')),
+    ]
+    plan = planner.plan(exercises)
+    assert [entry.representative for entry in plan] == [0, 2, 3, 4]
+    assert plan[0].duplicates == [(1, 3)]
+
+def test_scaled_result_matches_direct_solve(planner, make_exercise_data, make_exercise):
+    solver = planner.solver
+    base_args = ('x*y**2', ('x', '0', '1'), ('y', '0', '2'))
+    scaled_args = ('5*x*y**2/2', ('x', '0', '1'), ('y', '0', '2'))
+    (entry,) = planner.plan([make_exercise_data(*base_args), make_exercise_data(*scaled_args)])
+    index, factor = entry.duplicates[0]
+    direct = solver.solve_symbolic(make_exercise(*scaled_args))
+    exact, decimal, _ = planner.scale(solver.solve_symbolic(make_exercise(*base_args)), factor)
+    assert sp.simplify(sp.sympify(exact) - sp.sympify(direct[0])) == 0
+    assert decimal == pytest.approx(direct[1])
+
+def test_deduplicate_is_part_of_the_settings_hash():
+    with_dedup = MathSolverOrchestrator(result_store=None)
+    without_dedup = MathSolverOrchestrator(result_store=None, deduplicate=False)
+    assert with_dedup._settings_hash() != without_dedup._settings_hash()
+
+def test_malformed_exercise_fails_on_its_own(make_exercise_data, load_assignment):
+    assignment = load_assignment(count=0)
+    assignment['exercises'] = [
+        make_exercise_data('x*y', ('x', '0', '1'), ('y', '0', '2'), exercise_id='1'),
+        make_exercise_data(None, ('x', '0', '1'), ('y', '0', '2'), exercise_id='2'),
+        make_exercise_data('2*x*y', ('x', '0', '1'), ('y', '0', '2'), exercise_id='3'),
+    ]
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None)
+    assert orchestrator.integral_planner.canonical_form(assignment['exercises'][1]) is None
+
+    result = orchestrator.solve_assignment(assignment)
+    errors = result['metadata']['processing_info']['errors']
+    assert len(errors) == 1 and 'exercise 2' in errors[0]
+    assert [exercise['solution']['exact'] for exercise in result['exercises']] == ['1', None, '2']
@@ -0,0 +1,36 @@
+import pytest
+import sympy as sp
+
+from solvers.integration_strategies import IntegrationStrategyEngine
+
+x, y = sp.symbols('x y')
+ZERO, ONE = sp.Integer(0), sp.Integer(1)
+
+@pytest.fixture
+def engine():
+    return IntegrationStrategyEngine()
+
+def test_verify_matches_quadrature(engine):
+    assert engine.verify(sp.Rational(1, 2), x, x, ZERO, ONE) is True
+    assert engine.verify(ONE, x, x, ZERO, ONE) is False
+
+def test_verify_splits_at_kinks(engine):
+    assert engine.verify(ONE, sp.Abs(x), x, -ONE, ONE) is True
+    assert engine.verify((y**2 + (1 - y)**2) / 2, sp.Abs(x - y), x, ZERO, ONE) is True
+    assert engine.verify(ONE / 2, sp.Abs(x - y), x, ZERO, ONE) is False
+
+def test_verify_is_unknown_when_nothing_can_be_evaluated(engine):
+    assert engine.verify(sp.Integer(3), sp.Function('f')(x), x, ZERO, ONE) is None
+
+def test_trusted_strategies_skip_verification(engine, monkeypatch):
+    def fail(*args):
+        raise AssertionError("verification should not run")
+    monkeypatch.setattr(engine, 'verify', fail)
+    assert engine.integrate(x * y, x, ZERO, ONE) == (y / 2, 'antiderivative', x**2 * y / 2)
+
+def test_fallback_strategies_are_verified(monkeypatch):
+    def wrong(integrand, var, lower, upper):
+        return sp.Integer(7), None
+    monkeypatch.setitem(IntegrationStrategyEngine.STRATEGIES, 'manual', wrong)
+    engine = IntegrationStrategyEngine(['manual', 'definite'])
+    assert engine.integrate(x, x, ZERO, ONE)[:2] == (sp.Rational(1, 2), 'definite')
@@ -0,0 +1,36 @@
+import pytest
+
+from main import MathSolverOrchestrator
+from utils.intermediate_format import BinaryIntermediateReader, JSONIntermediateFormat, convert_intermediate
+
+@pytest.fixture
+def intermediate_data(load_assignment):
+    return MathSolverOrchestrator(use_cache=False, result_store=None).solve_assignment(load_assignment(count=4))
+
+def test_binary_round_trip_is_byte_identical(intermediate_data, tmp_path):
+    source = tmp_path / 'assignment.json'
+    JSONIntermediateFormat().save(intermediate_data, str(source))
+
+    assert convert_intermediate(str(source), str(tmp_path / 'assignment.msr')) == 4
+    assert convert_intermediate(str(tmp_path / 'assignment.msr'), str(tmp_path / 'copy.json')) == 4
+    assert (tmp_path / 'copy.json').read_bytes() == source.read_bytes()
+
+def test_binary_reader_random_access(intermediate_data, tmp_path):
+    source = tmp_path / 'assignment.json'
+    JSONIntermediateFormat().save(intermediate_data, str(source))
+    convert_intermediate(str(source), str(tmp_path / 'assignment.msr'))
+
+    with BinaryIntermediateReader(str(tmp_path / 'assignment.msr')) as reader:
+        assert len(reader) == 4
+        assert reader[2] == intermediate_data['exercises'][2]
+        assert reader.metadata == intermediate_data['metadata']
+
+def test_truncated_file_is_rejected(intermediate_data, tmp_path):
+    source = tmp_path / 'assignment.json'
+    JSONIntermediateFormat().save(intermediate_data, str(source))
+    binary = tmp_path / 'assignment.msr'
+    convert_intermediate(str(source), str(binary))
+    binary.write_bytes(binary.read_bytes()[:-10])
+
+    with pytest.raises(ValueError):
+        BinaryIntermediateReader(str(binary))
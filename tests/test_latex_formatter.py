@@ -0,0 +1,27 @@
+import pytest
+
+from generators.latex_formatter import LaTeXFormatter
+
+@pytest.fixture
+def formatter():
+    return LaTeXFormatter()
+
+@pytest.mark.parametrize('exact, expected', [
+    ('x/2/3', '\\dfrac{x}{2 \\cdot 3}'),
+    ('a/(x + 1)/2', '\\dfrac{a}{(x + 1) \\cdot 2}'),
+    ('(x + 1)/2', '\\dfrac{x + 1}{2}'),
+    ('-pi/4 + 3*pi**2/8', '-\\dfrac{\\pi}{4} + \\dfrac{3\\pi^{2}}{8}'),
+    ('theta*r', '\\theta r'),
+    ('pi*x', '\\pi x'),
+    ('r*sin(theta)', 'r\\sin(\\theta)'),
+    ('(x + 1)*(y + 2)', '(x + 1)(y + 2)'),
+    ('2*(x + 1)', '2(x + 1)'),
+    ('2*3', '2 \\cdot 3'),
+    ('3*exp(2)', '3e^{2}'),
+])
+def test_format_exact_solution(formatter, exact, expected):
+    assert formatter._format_exact_solution(exact) == expected
+
+def test_integral_setup_keeps_commands_apart(formatter):
+    setup = '\\int_{0}^{2*pi} theta*r \\, dtheta'
+    assert formatter.clean_integral_setup(setup) == '\\int_{0}^{2\\pi} \\theta r \\, d\\theta'
@@ -0,0 +1,47 @@
+import copy
+import os
+
+import pytest
+
+from generators.latex_generator import LaTeXGenerator
+from generators.pdf_compiler import compile_tex
+from main import MathSolverOrchestrator
+
+@pytest.fixture
+def intermediate_data(load_assignment):
+    return MathSolverOrchestrator(use_cache=False, result_store=None).solve_assignment(load_assignment(count=4))
+
+def test_fragments_are_reused_for_unchanged_exercises(intermediate_data):
+    generator = LaTeXGenerator()
+    document = generator.render(intermediate_data)
+    assert generator.fragment_stats == {'hits': 0, 'misses': 4}
+
+    changed = copy.deepcopy(intermediate_data)
+    changed['exercises'][1]['solution']['exact'] = '42'
+    assert generator.render(intermediate_data) == document
+    assert generator.render(changed) != document
+    assert generator.fragment_stats == {'hits': 7, 'misses': 5}
+    assert LaTeXGenerator().render(intermediate_data) == document
+
+def test_unchanged_tex_file_is_not_rewritten(intermediate_data, tmp_path):
+    tex_path = tmp_path / 'assignment.tex'
+    messages = []
+    LaTeXGenerator().generate_latex(intermediate_data, str(tex_path), log=messages.append)
+    os.utime(tex_path, (0, 0))
+    LaTeXGenerator().generate_latex(intermediate_data, str(tex_path), log=messages.append)
+    assert tex_path.stat().st_mtime == 0
+    assert messages[-1] == f"  LaTeX file unchanged: {tex_path}"
+
+def test_pdflatex_is_skipped_while_the_stamp_matches(tmp_path, fake_pdflatex):
+    tex_path = tmp_path / 'assignment.tex'
+    tex_path.write_text('\\documentclass{article}', encoding='utf-8')
+    assert compile_tex(str(tex_path)).status == 'compiled'
+    assert compile_tex(str(tex_path)).status == 'up_to_date'
+    assert [event for _, event, _ in fake_pdflatex()].count('start') == 1
+
+    # A changed .tex, or a deleted PDF, compiles again
+    tex_path.write_text('\\documentclass{book}', encoding='utf-8')
+    assert compile_tex(str(tex_path)).status == 'compiled'
+    (tmp_path / 'assignment.pdf').unlink()
+    assert compile_tex(str(tex_path)).status == 'compiled'
+    assert (tmp_path / 'assignment.pdf').read_text() == '%PDF-1.4 \\documentclass{book}'
@@ -0,0 +1,32 @@
+import pytest
+import sympy as sp
+
+from solvers.expression_parser import ExpressionParser
+from solvers.latex_printer import LatexRenderer
+
+@pytest.fixture
+def renderer():
+    return LatexRenderer()
+
+@pytest.mark.parametrize('expr, expected', [
+    (sp.Rational(-3, 2), '- \\dfrac{3}{2}'),
+    (1 / sp.Symbol('x'), '\\dfrac{1}{x}'),
+    (-sp.pi / 4, '- \\dfrac{\\pi}{4}'),
+    (sp.exp(-sp.Symbol('x')), 'e^{- x}'),
+    ((1 + sp.Symbol('x')) ** 2, '(x + 1)^{2}'),
+])
+def test_render(renderer, expr, expected):
+    assert renderer.render(expr) == expected
+
+@pytest.mark.parametrize('source, expected', [
+    ('6 - 2*x - 3*y', '6 - 2 x - 3 y'),
+    ('1 + x*y', '1 + x y'),
+    ('1/2*y', '\\dfrac{y}{2}'),
+])
+def test_render_as_written_keeps_term_order(renderer, source, expected):
+    expr = ExpressionParser().parse(source, evaluate=False)
+    assert renderer.render_as_written(expr) == expected
+
+def test_no_plain_frac(renderer):
+    x, y = sp.symbols('x y')
+    assert '\\frac' not in renderer.render(x / (y + 1) + sp.Rational(1, 3))
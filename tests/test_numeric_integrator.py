@@ -0,0 +1,34 @@
+import math
+
+import pytest
+import sympy as sp
+
+from models.exercise import Exercise
+from solvers.integral_solver import IntegralSolver
+from solvers.numeric_integrator import NumericIntegrator
+
+x, y, z = sp.symbols('x y z')
+
+@pytest.mark.parametrize('integrand, levels, expected', [
+    (x**2 + 3*y**2, [(x, 0, 2), (y, 1, 2)], sp.Rational(50, 3)),
+    # Inner limits depending on outer variables
+    (x*y, [(x, 0, 1), (y, 0, x)], sp.Rational(1, 8)),
+    (z**2 * sp.sin(y), [(x, 0, 2*sp.pi), (y, 0, sp.pi), (z, 0, 1)], 4*sp.pi/3),
+    (sp.exp(-x), [(x, 0, 1)], 1 - sp.exp(-1)),
+])
+def test_cubature_matches_exact_value(integrand, levels, expected):
+    value = NumericIntegrator().integrate(integrand, [(var, sp.sympify(lower), sp.sympify(upper))
+                                                      for var, lower, upper in levels])
+    assert value == pytest.approx(float(expected), rel=1e-10)
+
+def test_non_finite_result_is_none():
+    assert NumericIntegrator().integrate(sp.nan * x, [(x, 0, 1)]) is None
+
+def test_numeric_mode_agrees_with_symbolic_on_bundled_exercises(load_assignment):
+    assignment = load_assignment()
+    numeric = IntegralSolver(integration_method='numeric')
+    symbolic = IntegralSolver()
+    for data in assignment['exercises']:
+        exercise = Exercise.from_dict(data)
+        _, expected, _ = symbolic.solve_symbolic(exercise)
+        assert math.isclose(numeric.solve_numeric(exercise), expected, rel_tol=1e-6), data['id']
@@ -0,0 +1,41 @@
+from generators.pdf_compiler import PDFCompiler, compile_tex
+from main import MathSolverOrchestrator
+
+def _write_tex(tmp_path, name, content='\\documentclass{article}'):
+    tex_path = tmp_path / f'{name}.tex'
+    tex_path.write_text(content, encoding='utf-8')
+    return str(tex_path)
+
+def test_jobs_run_concurrently_and_report_in_submission_order(tmp_path, fake_pdflatex, monkeypatch):
+    monkeypatch.setenv('FAKE_PDFLATEX_SECONDS', '0.3')
+    tex_paths = [_write_tex(tmp_path, name) for name in ('a', 'b', 'c')]
+    compiler = PDFCompiler(max_jobs=3)
+    try:
+        for tex_path in tex_paths:
+            compiler.submit(tex_path)
+        reports = compiler.wait()
+    finally:
+        compiler.close()
+
+    assert [report.tex_path for report in reports] == tex_paths
+    assert all(report.status == 'compiled' for report in reports)
+    # Every job started before the first one finished
+    events = sorted(fake_pdflatex(), key=lambda record: record[2])
+    assert [event for _, event, _ in events[:3]] == ['start'] * 3
+
+def test_reruns_only_while_the_log_asks(tmp_path, fake_pdflatex):
+    assert compile_tex(_write_tex(tmp_path, 'plain')).runs == 1
+    assert compile_tex(_write_tex(tmp_path, 'refs', '\\ref{RERUN}')).runs == 2
+
+def test_build_compiles_every_assignment(tmp_path, fake_pdflatex, load_assignment, write_assignment):
+    (tmp_path / 'inputs').mkdir()
+    for name in ('C3_2025_T16_3_integrales.json', 'C3_2025_T18_3_integrales.json'):
+        write_assignment(load_assignment(name, count=1), f'inputs/{name}')
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, pdf_jobs=2)
+    try:
+        summary = orchestrator.build([str(tmp_path / 'inputs')])
+    finally:
+        orchestrator.close()
+
+    assert summary == {'built': 2, 'up_to_date': 0, 'failed': 0, 'pdf_failed': 0}
+    assert len(list((tmp_path / 'data' / 'output').glob('*.pdf'))) == 2
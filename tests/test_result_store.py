@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+from main import MathSolverOrchestrator
+
+def test_malformed_exercises_with_the_store_enabled(make_exercise_data, load_assignment):
+    assignment = load_assignment(count=0)
+    missing_limits = make_exercise_data('x', ('x', '0', '1'), exercise_id='2')
+    del missing_limits['integrals'][0]['limits']
+    assignment['exercises'] = [
+        make_exercise_data('x*y', ('x', '0', '1'), ('y', '0', '2'), exercise_id='1'),
+        missing_limits,
+        make_exercise_data(None, ('x', '0', '1'), exercise_id='3'),
+    ]
+
+    # The second run looks the exercises up in the store before solving
+    for _ in range(2):
+        orchestrator = MathSolverOrchestrator()
+        result = orchestrator.solve_assignment(assignment)
+        orchestrator.close()
+        assert len(result['metadata']['processing_info']['errors']) == 2
+        assert [exercise['solution']['exact'] for exercise in result['exercises']] == ['1', None, None]
+    assert orchestrator.result_store.stats['hits'] == 1
+
+def _query(*args):
+    result = subprocess.run([sys.executable, str(REPO_ROOT / 'src' / 'query_results.py'), *args],
+                            capture_output=True, text=True)
+    return result.returncode, result.stdout
+
+def test_recorded_results_round_trip_through_the_query_cli(load_assignment, write_assignment):
+    assignment = load_assignment(count=4)
+    orchestrator = MathSolverOrchestrator(use_cache=False)
+    try:
+        orchestrator._run_assignment(str(write_assignment(assignment)))
+        intermediate_path, _ = orchestrator._output_paths(assignment['metadata'])
+        intermediate = orchestrator.intermediate_format.load(intermediate_path)
+    finally:
+        orchestrator.close()
+
+    base_name = intermediate['metadata']['file_info']['base_name']
+    returncode, output = _query('--assignment', base_name, '--json')
+    assert returncode == 0
+    rows = json.loads(output)
+    assert [(row['exercise'], row['exact'], row['decimal'], row['coordinate_system']) for row in rows] == [
+        (exercise['id'], exercise['solution']['exact'], exercise['solution']['decimal'], exercise['coordinate_system'])
+        for exercise in intermediate['exercises']
+    ]
+    assert rows[0]['integrals'] == intermediate['exercises'][0]['integrals']
+
+    returncode, output = _query('--stats', '--json')
+    assert sum(row['exercises'] for row in json.loads(output)) == 4
+
+    # The CLI opens the store read-only
+    returncode, output = _query('--sql', 'DELETE FROM solutions')
+    assert returncode == 1 and output.startswith('Error:')
+    assert len(json.loads(_query('--json')[1])) == 4
+
+    # Rebuilding the assignment replaces its rows, so removed exercises disappear
+    assignment['exercises'] = assignment['exercises'][:2]
+    orchestrator = MathSolverOrchestrator(use_cache=False)
+    try:
+        orchestrator._run_assignment(str(write_assignment(assignment)))
+    finally:
+        orchestrator.close()
+    assert len(json.loads(_query('--assignment', base_name, '--json')[1])) == 2
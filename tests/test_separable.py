@@ -0,0 +1,33 @@
+import pytest
+import sympy as sp
+
+from solvers.integral_solver import IntegralSolver
+
+x, y, z = sp.symbols('x y z')
+BOX = [(sp.Integer(0), sp.Integer(1)), (sp.Integer(0), sp.Integer(2))]
+
+@pytest.fixture
+def solver():
+    return IntegralSolver()
+
+def test_product_of_single_variable_factors(solver):
+    assert solver.separable_factors(6 * x * y**2, [x, y], BOX) == (6, [x, y**2])
+
+def test_factor_of_several_variables_is_separated(solver):
+    assert solver.separable_factors(3 * sp.exp(x + y), [x, y], BOX) == (3, [sp.exp(x), sp.exp(y)])
+
+@pytest.mark.parametrize('integrand, limits', [
+    (sp.sin(x * y), BOX),
+    (x + y, BOX),
+    # Not a box: the upper limit of y depends on x
+    (x * y, [(sp.Integer(0), x), (sp.Integer(0), sp.Integer(1))]),
+])
+def test_not_separable(solver, integrand, limits):
+    assert solver.separable_factors(integrand, [x, y], limits) is None
+
+def test_separable_result_matches_nested_integration(solver, make_exercise):
+    exercise = make_exercise('x*exp(y)*cos(z)', ('x', '0', '1'), ('y', '0', '2'), ('z', '0', 'pi/2'))
+    exact, decimal, _ = solver.solve_symbolic(exercise)
+    expected = sp.integrate(x * sp.exp(y) * sp.cos(z), (x, 0, 1), (y, 0, 2), (z, 0, sp.pi / 2))
+    assert sp.simplify(sp.sympify(exact) - expected) == 0
+    assert decimal == pytest.approx(float(expected))
@@ -0,0 +1,51 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from server import SolverRequestHandler, SolverServer
+
+class RecordingOrchestrator:
+    """Stands in for MathSolverOrchestrator; records the assignments it is asked to solve"""
+
+    def __init__(self):
+        self.solved = []
+
+    def solve_assignment(self, input_data, source_name):
+        self.solved.append(source_name)
+        return {'metadata': {}, 'exercises': []}
+
+@pytest.fixture
+def daemon(monkeypatch):
+    monkeypatch.setattr(SolverRequestHandler, 'log_message', lambda *args: None)
+    orchestrator = RecordingOrchestrator()
+    server = SolverServer(orchestrator, ('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, orchestrator
+    server.shutdown()
+    server.server_close()
+
+ASSIGNMENT = json.dumps({'metadata': {'output_settings': {}}, 'exercises': []}).encode('utf-8')
+
+def post(server, headers):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}/solve", data=ASSIGNMENT,
+                                     headers=headers, method='POST')
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def test_accepts_json(daemon):
+    server, orchestrator = daemon
+    assert post(server, {'Content-Type': 'application/json; charset=utf-8'}) == 200
+    assert orchestrator.solved == ['assignment.json']
+
+def test_rejects_simple_cross_site_posts(daemon):
+    server, orchestrator = daemon
+    assert post(server, {'Content-Type': 'text/plain'}) == 415
+    assert post(server, {'Content-Type': 'application/json', 'Origin': 'https://example.com'}) == 403
+    assert orchestrator.solved == []
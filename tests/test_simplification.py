@@ -0,0 +1,24 @@
+import pytest
+import sympy as sp
+
+from solvers.simplification import SimplificationPolicy
+
+x, t = sp.symbols('x theta')
+
+def test_tiered_folds_trig_identities_between_stages():
+    policy = SimplificationPolicy('tiered')
+    stage = sp.cos(t)**2 / 2 + sp.sin(t)**2 / 2 + x
+    assert policy.between_stages(stage) == x + sp.Rational(1, 2)
+    assert policy.between_stages(2 * sp.sin(t) * sp.cos(t)) == sp.sin(2 * t)
+
+def test_tiered_canonicalizes_polynomials():
+    policy = SimplificationPolicy('tiered')
+    assert policy.between_stages((x + 1)**2) == x**2 + 2 * x + 1
+
+def test_final_policy_leaves_stages_alone():
+    stage = sp.cos(t)**2 + sp.sin(t)**2
+    assert SimplificationPolicy('final').between_stages(stage) == stage
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        SimplificationPolicy('aggressive')
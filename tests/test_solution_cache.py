@@ -0,0 +1,24 @@
+from solvers.integral_solver import IntegralSolver
+from utils.solution_cache import SolutionCache
+
+def test_cache_key_ignores_formatting_but_not_content(make_exercise):
+    solver = IntegralSolver()
+    key = solver.solution_cache_key(make_exercise('x**2 + 1', ('x', '0', '1')))
+    assert solver.solution_cache_key(make_exercise('1 + x ** 2', ('x', '0', '1'))) == key
+    assert solver.solution_cache_key(make_exercise('x**2 + 1', ('x', '0', '2'))) != key
+    full = IntegralSolver(simplify_policy='full')
+    assert full.solution_cache_key(make_exercise('x**2 + 1', ('x', '0', '1'))) != key
+
+def test_cached_solution_round_trip(tmp_path, make_exercise):
+    solver = IntegralSolver(cache=SolutionCache(str(tmp_path / 'cache')))
+    exercise = make_exercise('x**2 + 1', ('x', '0', '1'))
+    assert solver.solve(exercise) == solver.solve(exercise)
+    assert solver.cache.stats['hits'] == 1
+    assert solver.cached_solution(exercise)[0] == '4/3'
+
+def test_eviction_keeps_the_cache_bounded(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache'), max_entries=2)
+    for index in range(3):
+        cache.put(SolutionCache.make_key({'index': index}), {'exact': str(index)})
+    assert len(list((tmp_path / 'cache').glob('*.json'))) == 2
+    assert cache.stats['evictions'] == 1
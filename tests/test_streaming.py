@@ -0,0 +1,17 @@
+from main import MathSolverOrchestrator
+
+def test_streamed_metadata_records_exercise_hashes(load_assignment, write_assignment):
+    assignment = load_assignment(count=2)
+    input_path = write_assignment(assignment)
+
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None)
+    orchestrator.stream_assignment(str(input_path))
+
+    intermediate_path, _ = orchestrator._output_paths(assignment['metadata'])
+    streamed = orchestrator.intermediate_format.load(intermediate_path)
+    settings = assignment['metadata']['output_settings']
+    assert streamed['metadata']['file_info']['exercise_hashes'] == [
+        orchestrator._exercise_hash(exercise, settings) for exercise in assignment['exercises']
+    ]
+    # A following incremental build can reuse every streamed exercise
+    assert len(orchestrator._reusable_exercises(streamed)) == 2
@@ -0,0 +1,38 @@
+import json
+
+from main import MathSolverOrchestrator
+from utils.tracing import SpanRecorder, recording, span
+
+def test_spans_are_recorded_only_while_recording():
+    with span('ignored'):
+        pass
+    recorder = SpanRecorder()
+    with recording(recorder):
+        for _ in range(2):
+            with span('parse', source='x'):
+                pass
+    assert [recorded['name'] for recorded in recorder.spans] == ['parse', 'parse']
+    assert recorder.spans[0]['args'] == {'source': 'x'}
+    assert set(recorder.timings()) == {'parse'}
+
+def test_trace_file_has_stage_events_of_every_process(load_assignment, write_assignment, tmp_path):
+    input_path = write_assignment(load_assignment(count=4))
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, workers=2, trace=True)
+    try:
+        orchestrator._run_assignment(str(input_path))
+    finally:
+        orchestrator.close()
+    orchestrator.write_trace(str(tmp_path / 'trace.json'))
+
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    spans = [event for event in events if event['ph'] == 'X']
+    names = {event['name'] for event in spans}
+    assert {'assignment', 'solve', 'parse', 'integrate:1', 'latex_document'} <= names
+
+    # Exercise stages run on the workers, each named as a process of its own
+    assignment = next(event for event in spans if event['name'] == 'assignment')
+    worker_pids = {event['pid'] for event in spans if event['name'] == 'integrate:1'}
+    assert assignment['pid'] not in worker_pids
+    process_names = {event['pid']: event['args']['name'] for event in events if event['name'] == 'process_name'}
+    assert all(process_names[pid] == f'worker {pid}' for pid in worker_pids)
+    assert all(assignment['ts'] <= event['ts'] <= assignment['ts'] + assignment['dur'] for event in spans)
@@ -0,0 +1,16 @@
+from main import MathSolverOrchestrator
+
+def _solve(assignment, workers):
+    orchestrator = MathSolverOrchestrator(use_cache=False, result_store=None, workers=workers)
+    try:
+        exercises = orchestrator.solve_assignment(assignment)['exercises']
+        assert (orchestrator._executor is not None) == (workers > 1)
+    finally:
+        orchestrator.close()
+    for exercise in exercises:
+        exercise['computation_details'].pop('timings')
+    return exercises
+
+def test_worker_pool_matches_serial_output(load_assignment):
+    assignment = load_assignment(count=6)
+    assert _solve(assignment, workers=2) == _solve(assignment, workers=1)